@@ -0,0 +1,170 @@
+"""
+ByteTrack adapters of ObjectTracker with hundreds of products per frame:
+
+- previous dict adapter (per-detection loops, per-row tensor conversions)
+- ObjectTracker.update (dict API, bulk conversions, ids by source index)
+- ObjectTracker.track (columnar sv.Detections in and out)
+
+ByteTrack runs once per detection count and its outputs are replayed to
+every adapter, so the timings are the adapter overhead alone.
+
+Run from the project root:
+    python -m benchmarks.bench_tracker_adapters --detections 100 300 600
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import supervision as sv
+
+from src.tracker import ObjectTracker
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+
+class LoopObjectTracker(ObjectTracker):
+    """
+    ObjectTracker.update before the columnar path.
+    """
+    def update(self, detections):
+        if detections is None or len(detections) == 0:
+            return self.last_tracks
+
+        xyxy = []
+        confidences = []
+        class_ids = []
+
+        for det in detections:
+            bbox = det.get("bbox")
+            conf = det.get("confidence")
+
+            if bbox is None or conf is None:
+                continue
+
+            if len(bbox) != 4:
+                continue
+
+            xyxy.append(bbox)
+            confidences.append(conf)
+            class_ids.append(0)
+
+        if len(xyxy) == 0:
+            return self.last_tracks
+
+        detections_sv = sv.Detections(
+            xyxy=np.array(xyxy, dtype=np.float32),
+            confidence=np.array(confidences, dtype=np.float32),
+            class_id=np.array(class_ids, dtype=np.int32),
+        )
+
+        tracked = self.tracker.update_with_detections(detections_sv)
+
+        tracks = []
+        for i in range(len(tracked)):
+            tracks.append({
+                "track_id": int(tracked.tracker_id[i]),
+                "bbox": tracked.xyxy[i].astype(int).tolist(),
+                "confidence": float(tracked.confidence[i]),
+                "label": "cup",
+            })
+        self.last_tracks = tracks
+
+        return tracks
+
+
+class ReplayByteTrack:
+    """
+    Returns recorded ByteTrack outputs in order.
+    """
+    def __init__(self, outputs):
+        self.outputs = iter(outputs)
+
+    def update_with_detections(self, detections):
+        return next(self.outputs)
+
+
+def make_frames(count, frames, seed=0):
+    rng = np.random.default_rng(seed)
+    origin = rng.uniform(0, 1800, (count, 2))
+    size = rng.uniform(30, 80, (count, 2))
+
+    result = []
+    for _ in range(frames):
+        top_left = origin + rng.normal(0, 1.0, (count, 2))
+        xyxy = np.hstack([top_left, top_left + size]).astype(np.float32)
+        confidence = rng.uniform(0.2, 0.95, count).astype(np.float32)
+        result.append((xyxy, confidence))
+    return result
+
+
+def as_dicts(xyxy, confidence):
+    return [
+        {"bbox": tuple(box), "confidence": conf, "label": "cup"}
+        for box, conf in zip(xyxy.astype(int).tolist(), confidence.tolist())
+    ]
+
+
+def record_tracks(frames):
+    tracker = ObjectTracker()
+    outputs = [
+        tracker.track(sv.Detections(xyxy=xyxy, confidence=confidence, class_id=np.zeros(len(xyxy), dtype=int)))
+        for xyxy, confidence in frames
+    ]
+    return outputs
+
+
+def run_dicts(tracker_cls, frames, outputs):
+    tracker = tracker_cls()
+    tracker.tracker = ReplayByteTrack(outputs)
+    elapsed = 0.0
+    results = []
+
+    for xyxy, confidence in frames:
+        detections = as_dicts(xyxy, confidence)
+
+        started = time.perf_counter()
+        results.append(tracker.update(detections))
+        elapsed += time.perf_counter() - started
+
+    return elapsed / len(frames) * 1e6, results
+
+
+def run_columnar(frames, outputs):
+    tracker = ObjectTracker()
+    tracker.tracker = ReplayByteTrack(outputs)
+    elapsed = 0.0
+
+    for xyxy, confidence in frames:
+        started = time.perf_counter()
+        tracker.track(sv.Detections(xyxy=xyxy, confidence=confidence, class_id=np.zeros(len(xyxy), dtype=int)))
+        elapsed += time.perf_counter() - started
+
+    return elapsed / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ObjectTracker dict vs columnar ByteTrack adapters")
+    parser.add_argument("--detections", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    print("adapter overhead per frame (ByteTrack excluded)")
+    print(f"{'objects':>7} | {'loop us':>8} | {'update us':>9} | {'track us':>8} | {'same tracks':>11}")
+
+    for count in args.detections:
+        frames = make_frames(count, args.frames)
+        outputs = record_tracks(frames)
+
+        loop_us, loop_tracks = run_dicts(LoopObjectTracker, frames, outputs)
+        update_us, update_tracks = run_dicts(ObjectTracker, frames, outputs)
+        track_us = run_columnar(frames, outputs)
+
+        print(
+            f"{count:>7} | {loop_us:>8.0f} | {update_us:>9.0f} | {track_us:>8.0f} | "
+            f"{str(loop_tracks == update_tracks):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
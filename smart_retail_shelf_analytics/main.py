@@ -153,6 +153,7 @@ def main():
     monitor_config = config["monitor"]
     shelf_model_config = config["shelf_model"]
     logging_config = config["logging"]
+    stream_config = config.get("stream", {})
 
     mode = config["mode"]
     ALLOWED_LABELS = detector_config["allowed_labels"]
@@ -160,7 +161,13 @@ def main():
     DETECTION_STRIDE = detector_config["detection_stride"]
 
 
-    detector = YOLODetector()
+    detector = YOLODetector(
+        conf_threshold=CONF_THRESHOLD,
+        allowed_labels=ALLOWED_LABELS,
+        backend=detector_config.get("backend", "torch"),
+        imgsz=detector_config.get("imgsz", 640),
+        threads=detector_config.get("threads"),
+    )
     tracker = ObjectTracker(**tracker_config)
     stabilizer = TrackStabilizer(**stabilizer_config)
     monitor = ShelfMonitor(**monitor_config)
@@ -172,13 +179,13 @@ def main():
 
     if mode == "live":
         print("Running in Live Mode")
-        stream = VideoStream(source=0)
+        stream = VideoStream(source=0, **stream_config)
     elif mode == "offline":
         video_path = config.get("video")
         if video_path is None:
             raise ValueError("Offline mode requires --video path")
         print(f"Running Offline Mode: {video_path}")
-        stream = VideoStream(source=video_path)
+        stream = VideoStream(source=video_path, **stream_config)
 
     frame_id = 0
     prev_time = time.time()
@@ -199,18 +206,13 @@ def main():
             time.sleep(1 / 30)
         if detect_this_frame:
             t0 = time.time()
-            detections = detector.detect(frame)
+            # confidence / label filtering happens inside the detector
+            detections = detector.detect_columnar(frame)
             t1 = time.time()
             detection_time = t1 - t0
 
-            filtered_detections = [
-                d for d in detections
-                if d["confidence"] >= CONF_THRESHOLD
-                and d["label"] in ALLOWED_LABELS
-            ]
-
             t0 = time.time()
-            tracked_objects = tracker.update(filtered_detections)
+            tracked_objects = tracker.update_detections(detections)
             detect_this_frame = True
             t1 = time.time()
             tracker_time = t1 - t0
@@ -271,6 +273,9 @@ def main():
         if cv2.waitKey(1) & 0xFF == ord("q"):
             break
 
+    if stream.threaded:
+        print(f"[STREAM] {stream.stats()}")
+
     stream.release()
     cv2.destroyAllWindows()
 
@@ -1,26 +1,64 @@
-from ultralytics import YOLO
+import numpy as np
+import supervision as sv
+from src.inference_backend import load_backend
 
 class YOLODetector:
-    def __init__(self, model_path="yolov8n.pt", conf_threshold=0.4):
-        self.model = YOLO(model_path)
+    def __init__(self,
+                 model_path="yolov8n.pt",
+                 conf_threshold=0.4,
+                 allowed_labels=None,
+                 backend="torch",
+                 imgsz=640,
+                 threads=None):
+        self.model = load_backend(model_path, backend=backend, imgsz=imgsz, threads=threads)
         self.conf_threshold=conf_threshold
 
-    def detect(self, frame):
-        results = self.model(frame, verbose=False)[0]
+        # class names by id, and the ids to keep, resolved once
+        names = self.model.names
+        self.class_names = np.array([names[i] for i in range(len(names))])
+        self.allowed_class_ids = None
+        if allowed_labels is not None:
+            allowed_labels = set(allowed_labels)
+            self.allowed_class_ids = np.array(
+                [i for i, name in names.items() if name in allowed_labels],
+                dtype=int,
+            )
+
+    def detect_columnar(self, frame):
+        """
+        Detections of one frame as an sv.Detections batch (xyxy /
+        confidence / class_id arrays, data["class_name"]). The backend hands
+        back all boxes as one array, filtered here with array masks.
+        """
+        # columns: x1 y1 x2 y2 [track id] conf cls
+        data = self.model(frame)[0]
+        confidence = data[:, -2]
+        class_id = data[:, -1].astype(int)
+
+        keep = confidence >= self.conf_threshold
+        if self.allowed_class_ids is not None:
+            keep &= np.isin(class_id, self.allowed_class_ids)
 
-        detections = []
-        for box in results.boxes:
-            conf = float(box.conf[0])
-            if conf < self.conf_threshold:
-                continue
+        detections = sv.Detections(
+            xyxy=data[keep, :4].astype(np.float32),
+            confidence=confidence[keep].astype(np.float32),
+            class_id=class_id[keep],
+        )
+        detections.data["class_name"] = self.class_names[detections.class_id]
+        return detections
 
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            cls_id = int(box.cls[0])
-            label = self.model.names[cls_id]
+    def detect(self, frame):
+        detections = self.detect_columnar(frame)
 
-            detections.append({
-                "bbox": (x1, y1, x2, y2),
+        return [
+            {
+                "bbox": tuple(bbox),
                 "label": label,
                 "confidence": conf,
-            })
-        return detections
+            }
+            for bbox, label, conf in zip(
+                detections.xyxy.astype(int).tolist(),
+                detections.data["class_name"].tolist(),
+                detections.confidence.tolist(),
+            )
+        ]
@@ -0,0 +1,214 @@
+import abc
+import ast
+import os
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+from ultralytics import YOLO
+
+BACKENDS = ("torch", "onnx", "openvino")
+
+
+def letterbox(img, size, pad_value=114):
+    h, w = img.shape[:2]
+    scale = min(size / h, size / w)
+
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (size - new_w) // 2
+    pad_y = (size - new_h) // 2
+
+    canvas = np.full((size, size, 3), pad_value, dtype=img.dtype)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+
+    return canvas, scale, pad_x, pad_y
+
+
+def export_model(model_path, backend, imgsz):
+    """
+    Exports .pt weights to a fixed-shape (batch 1, imgsz x imgsz) ONNX file
+    or OpenVINO IR directory next to the weights. An existing export for
+    the same size is reused; paths that are not .pt are returned as is.
+    """
+    model_path = Path(model_path)
+    if model_path.suffix != ".pt":
+        return model_path
+
+    if backend == "onnx":
+        target = model_path.with_name(f"{model_path.stem}_{imgsz}.onnx")
+    else:
+        target = model_path.with_name(f"{model_path.stem}_{imgsz}_openvino_model")
+
+    if not target.exists():
+        exported = YOLO(model_path, task="detect").export(
+            format=backend,
+            imgsz=imgsz,
+            batch=1,
+            dynamic=False,
+            verbose=False,
+        )
+        os.replace(exported, target)
+
+    return target
+
+
+class TorchBackend:
+    """
+    ultralytics.YOLO on .pt weights (PyTorch eager).
+    """
+    def __init__(self, model_path, imgsz=640, threads=None):
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+
+        self.model = YOLO(model_path, task="detect")
+        self.names = self.model.names
+        self.imgsz = imgsz
+
+    def __call__(self, images, imgsz=None):
+        kwargs = {} if imgsz is None else {"imgsz": imgsz}
+        results = self.model(images, verbose=False, **kwargs)
+
+        # columns: x1 y1 x2 y2 conf cls, one device -> host copy per image
+        return [result.boxes.data.cpu().numpy() for result in results]
+
+
+class ExportedBackend(abc.ABC):
+    """
+    Pre / post-processing shared by the exported graphs: a fixed
+    (1, 3, imgsz, imgsz) input and the raw (1, 4 + classes, anchors)
+    output, decoded with the ultralytics predict defaults.
+    """
+    conf = 0.25
+    iou = 0.7
+    max_det = 300
+
+    def __call__(self, images, imgsz=None):
+        # the input shape is fixed at export time, imgsz is only accepted
+        # for call compatibility with TorchBackend
+        if isinstance(images, np.ndarray):
+            images = [images]
+        return [self._detect(image) for image in images]
+
+    @abc.abstractmethod
+    def _run(self, blob):
+        """
+        Runs the graph on one (1, 3, imgsz, imgsz) blob, returns its raw output.
+        """
+
+    def _detect(self, image):
+        canvas, scale, pad_x, pad_y = letterbox(image, self.imgsz)
+        # BGR HWC -> RGB NCHW; the runtimes take a C-contiguous input, the
+        # conversion to float32 makes that copy
+        blob = np.ascontiguousarray(canvas[..., ::-1].transpose(2, 0, 1)[None], dtype=np.float32)
+        blob /= 255.0
+
+        output = self._run(blob)[0].T
+        scores = output[:, 4:]
+        cls = scores.argmax(axis=1)
+        conf = scores[np.arange(len(cls)), cls]
+
+        keep = conf >= self.conf
+        if not keep.any():
+            return np.empty((0, 6), dtype=np.float32)
+
+        cx, cy, w, h = output[keep, :4].T
+        conf = conf[keep]
+        cls = cls[keep]
+
+        xywh = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+        idx = np.asarray(cv2.dnn.NMSBoxesBatched(xywh, conf, cls, self.conf, self.iou, top_k=self.max_det), dtype=int)
+
+        xyxy = xywh[idx].copy()
+        xyxy[:, 2:] += xyxy[:, :2]
+
+        # letterbox -> image coordinates
+        xyxy -= (pad_x, pad_y, pad_x, pad_y)
+        xyxy /= scale
+        height, width = image.shape[:2]
+        xyxy = np.clip(xyxy, 0, (width, height, width, height))
+
+        return np.column_stack([xyxy, conf[idx], cls[idx]]).astype(np.float32)
+
+
+class OnnxBackend(ExportedBackend):
+    """
+    ONNX Runtime CPU session on an exported .onnx model.
+    """
+    def __init__(self, model_path, threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.imgsz = model_input.shape[2]
+
+        names = self.session.get_modelmeta().custom_metadata_map["names"]
+        self.names = ast.literal_eval(names)
+
+    def _run(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVinoBackend(ExportedBackend):
+    """
+    OpenVINO CPU model compiled from an exported IR directory.
+    """
+    def __init__(self, model_path, threads=None):
+        import openvino as ov
+
+        model_dir = Path(model_path)
+        core = ov.Core()
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if threads:
+            config["INFERENCE_NUM_THREADS"] = threads
+
+        self.compiled = core.compile_model(core.read_model(next(model_dir.glob("*.xml"))), "CPU", config)
+        self.request = self.compiled.create_infer_request()
+        self.imgsz = self.compiled.input(0).shape[2]
+
+        with open(model_dir / "metadata.yaml") as f:
+            self.names = yaml.safe_load(f)["names"]
+
+    def _run(self, blob):
+        return self.request.infer({0: blob})[self.compiled.output(0)]
+
+
+def load_backend(model_path, backend="torch", imgsz=640, threads=None, warmup=2):
+    """
+    Loads a detection model on the given backend ("torch", "onnx" or
+    "openvino") and runs warmup forward passes, so the first real frame
+    does not pay lazy initialisation. .pt weights are exported for the
+    onnx / openvino backends on first use.
+
+    All backends are called with an image or a list of images and return
+    one (N, 6) float32 array per image: x1 y1 x2 y2 conf cls.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    if backend == "torch":
+        model = TorchBackend(model_path, imgsz=imgsz, threads=threads)
+    elif backend == "onnx":
+        model = OnnxBackend(export_model(model_path, backend, imgsz), threads=threads)
+    else:
+        model = OpenVinoBackend(export_model(model_path, backend, imgsz), threads=threads)
+
+    blank = np.zeros((model.imgsz, model.imgsz, 3), dtype=np.uint8)
+    started = time.perf_counter()
+    for _ in range(warmup):
+        model(blank)
+    model.warmup_ms = (time.perf_counter() - started) * 1000
+
+    return model
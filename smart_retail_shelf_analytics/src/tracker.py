@@ -1,6 +1,22 @@
+import dataclasses
+from itertools import chain
+
 import supervision as sv
 import numpy as np
 
+
+def boxes_array(boxes):
+    # one flat pass instead of np.array over a list of tuples
+    return np.fromiter(chain.from_iterable(boxes), dtype=np.float32, count=4 * len(boxes)).reshape(-1, 4)
+
+
+def empty_tracks():
+    tracks = sv.Detections.empty()
+    tracks.tracker_id = np.empty(0, dtype=int)
+    tracks.data["source_index"] = np.empty(0, dtype=int)
+    return tracks
+
+
 class ObjectTracker:
     def __init__(self,
                  conf_threshold=0.4,
@@ -18,7 +34,30 @@ class ObjectTracker:
             frame_rate=30,
         )
         self.last_tracks = []
-    
+
+    def track(self, detections):
+        """
+        detections: sv.Detections batch (xyxy / confidence / class_id arrays)
+        returns: the tracked subset with tracker_id set; data["source_index"]
+            is each row's index in the input batch (ByteTrack may drop or
+            reorder detections)
+        """
+        if len(detections) == 0:
+            # nothing indexes into an empty batch; update() keeps the last
+            # tracks for its dict callers
+            return empty_tracks()
+
+        detections = dataclasses.replace(
+            detections,
+            data={**detections.data, "source_index": np.arange(len(detections))},
+        )
+
+        tracked = self.tracker.update_with_detections(detections)
+        if len(tracked) == 0:
+            tracked = empty_tracks()
+
+        return tracked
+
     def update(self, detections):
         """
         detections: list of dicts from YOLODetector
@@ -26,51 +65,64 @@ class ObjectTracker:
         """
         if detections is None or len(detections) == 0:
             return self.last_tracks
-        
-        xyxy = []
-        confidences = []
-        class_ids = []
-
-        for det in detections:
-            bbox = det.get("bbox")
-            conf = det.get("confidence")
-            
-            if bbox is None or conf is None:
-                continue
-
-            if len(bbox) != 4:
-                continue
-
-            xyxy.append(bbox)
-            confidences.append(conf)
-            class_ids.append(0) # works only with single class
-        
-        if len(xyxy) == 0:
+
+        valid = [
+            det for det in detections
+            if det.get("bbox") is not None
+            and det.get("confidence") is not None
+            and len(det["bbox"]) == 4
+        ]
+
+        if len(valid) == 0:
             return self.last_tracks
-        
-        xyxy = np.array(xyxy, dtype=np.float32)
-        confidences = np.array(confidences, dtype=np.float32)
-        class_ids = np.array(class_ids, dtype=np.int32)
 
         detections_sv = sv.Detections(
-            xyxy=xyxy,
-            confidence=confidences,
-            class_id=class_ids,
+            xyxy=boxes_array([det["bbox"] for det in valid]),
+            confidence=np.array([det["confidence"] for det in valid], dtype=np.float32),
+            class_id=np.zeros(len(valid), dtype=np.int32), # works only with single class
         )
-        
-        tracked = self.tracker.update_with_detections(detections_sv)
-
-        tracks = []
-        for i in range(len(tracked)):
-            tracks.append({
-                "track_id": int(tracked.tracker_id[i]),
-                "bbox": tracked.xyxy[i].astype(int).tolist(),
-                "confidence": float(tracked.confidence[i]),
-                "label": "cup",
-            })
+
+        tracks = self.to_dicts(self.track(detections_sv), labels=[det.get("label", "cup") for det in valid])
         self.last_tracks = tracks
 
         return tracks
+
+    def update_detections(self, detections):
+        """
+        detections: sv.Detections batch from YOLODetector.detect_columnar
+        returns: list of tracked objects with IDs, as update()
+        """
+        if len(detections) == 0:
+            return self.last_tracks
+
+        labels = detections.data.get("class_name")
+        tracks = self.to_dicts(self.track(detections), labels=None if labels is None else labels.tolist())
+        self.last_tracks = tracks
+
+        return tracks
+
+    @staticmethod
+    def to_dicts(tracked, labels=None):
+        """
+        Track dicts for a tracked batch, converted in bulk. labels are
+        looked up by source index (defaults to "cup").
+        """
+        source_index = tracked.data["source_index"].tolist()
+
+        return [
+            {
+                "track_id": track_id,
+                "bbox": bbox,
+                "confidence": confidence,
+                "label": labels[index] if labels is not None else "cup",
+            }
+            for track_id, bbox, confidence, index in zip(
+                tracked.tracker_id.tolist(),
+                tracked.xyxy.astype(int).tolist(),
+                tracked.confidence.tolist(),
+                source_index,
+            )
+        ]
     
     def predict(self):
         """
@@ -1,28 +1,190 @@
 import cv2
+import time
+import threading
+import numpy as np
+from collections import deque
 
 class VideoStream:
-    def __init__(self, source=0):
+    def __init__(self,
+                 source=0,
+                 threaded=False,
+                 buffer_size=4,
+                 policy="latest",
+                 stale_after_sec=0.1):
         """
         Unified video source.
 
         source:
             0          -> webcam
             "file.mp4" -> video file
+
+        threaded:
+            decode on a background thread into a preallocated ring of
+            buffer_size frames instead of on the caller's thread
+
+        policy (threaded only):
+            "latest" -> read() returns the newest frame, older undelivered
+                        frames are dropped
+            "every"  -> read() returns frames in order, the oldest
+                        undelivered frame is dropped when the ring is full
+                        (file sources block instead)
+
+        A frame returned by a threaded read() stays valid until the next read().
         """
+        if policy not in ("latest", "every"):
+            raise ValueError(f"Unknown frame policy: {policy}")
+
+        if threaded and buffer_size < 2:
+            raise ValueError("Threaded capture needs buffer_size >= 2")
+
         self.cap = cv2.VideoCapture(source)
 
         if not self.cap.isOpened():
             raise RuntimeError(f"Cannot open video source: {source}")
         
         self.is_file = isinstance(source, str)
-    
+
+        self.threaded = threaded
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.stale_after_sec = stale_after_sec
+
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.frames_stale = 0
+
+        if self.threaded:
+            self._start_capture()
+
+    def _start_capture(self):
+        self._slots = None
+        self._free = deque()
+        self._ready = deque()
+        self._held = None
+        self._stopped = False
+        self._cond = threading.Condition()
+
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def _allocate(self, frame):
+        ring = np.empty((self.buffer_size,) + frame.shape, dtype=frame.dtype)
+        self._slots = [ring[i] for i in range(self.buffer_size)]
+        self._free.extend(range(self.buffer_size))
+
+    def _acquire_slot(self):
+        with self._cond:
+            while not self._free:
+                if self._stopped:
+                    return None
+
+                if self.policy == "every" and self.is_file:
+                    self._cond.wait()
+                    continue
+
+                slot, _ = self._ready.popleft()
+                self._free.append(slot)
+                self.frames_dropped += 1
+
+            return self._free.popleft()
+
+    def _capture_loop(self):
+        while not self._stopped:
+            if self._slots is None:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                self._allocate(frame)
+                slot = self._acquire_slot()
+                if slot is None:
+                    break
+
+                self._slots[slot][...] = frame
+            else:
+                slot = self._acquire_slot()
+                if slot is None:
+                    break
+
+                target = self._slots[slot]
+                ret, frame = self.cap.read(target)
+                if not ret:
+                    with self._cond:
+                        self._free.append(slot)
+                    break
+
+                if frame is not target:
+                    target[...] = frame
+
+            with self._cond:
+                self._ready.append((slot, time.time()))
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+        # only this thread reads the capture, so it releases it as well;
+        # release() cannot free it under a read blocked on a stalled source
+        self.cap.release()
+
+    def _read_threaded(self):
+        with self._cond:
+            while not self._ready and not self._stopped:
+                self._cond.wait()
+
+            if not self._ready:
+                return False, None
+
+            if self.policy == "latest":
+                while len(self._ready) > 1:
+                    slot, _ = self._ready.popleft()
+                    self._free.append(slot)
+                    self.frames_dropped += 1
+
+            slot, captured_at = self._ready.popleft()
+
+            if self._held is not None:
+                self._free.append(self._held)
+            self._held = slot
+
+            self.frames_delivered += 1
+            if time.time() - captured_at > self.stale_after_sec:
+                self.frames_stale += 1
+
+            self._cond.notify_all()
+
+        return True, self._slots[slot]
+
     def read(self):
+        if self.threaded:
+            return self._read_threaded()
+
         ret, frame = self.cap.read()
 
         if not ret and self.is_file:
             return False, None
         
         return ret, frame
-    
+
+    def stats(self):
+        return {
+            "captured": self.frames_captured,
+            "delivered": self.frames_delivered,
+            "dropped": self.frames_dropped,
+            "stale": self.frames_stale,
+        }
+
     def release(self):
-        self.cap.release()
\ No newline at end of file
+        if self.threaded:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+            self._thread.join(timeout=1.0)
+            if self._thread.is_alive():
+                print("[VideoStream] capture thread still blocked in read, capture is released when it returns")
+            return
+
+        self.cap.release()
+
@@ -1,17 +1,29 @@
 import time
+import math
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from src.parking_session.session_manager import SessionManager
 from src.parking_session.gate_controller import GateController
-from typing import Dict
-from src.db.database import SessionLocal, get_db
-from src.db.models import ParkingSessionDB
-
-app = FastAPI(title="Parking API")
+from typing import Dict, List
+from src.db.database import async_engine
+from src.db.migrations import migrate
 
 session_manager = SessionManager()
 gate_controller = GateController()
 
+
+@asynccontextmanager
+async def lifespan(app):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(migrate)
+    await session_manager.load()
+    yield
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Parking API", lifespan=lifespan)
+
 class PaymentRequest(BaseModel):
     plate: str
 
@@ -21,35 +33,29 @@ class ExitRequest(BaseModel):
 
 
 @app.get("/sessions/active")
-def get_sessions():
-    with get_db() as db:
-        sessions = db.query(ParkingSessionDB).filter_by(status="ACTIVE").all()
-        return [s.plate for s in sessions]
+async def get_sessions():
+    return await session_manager.active_plates()
+
+
+@app.get("/sessions/fees")
+async def get_session_fees():
+    return await session_manager.active_fees(time.time())
 
 
 @app.get("/sessions/{plate}")
-def get_session(plate: str):
-    with get_db() as db:
-        session = db.query(ParkingSessionDB).filter_by(plate=plate, status="ACTIVE").first()
+async def get_session(plate: str):
+    session = await session_manager.get_active_session(plate)
 
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        now = time.time()
-        
-        if session.amount_due > 0:
-            fee = session.amount_due
-        else:
-            fee = session_manager.billing.calculate_fee(
-                session.entry_time,
-                now,
-            )
-        return {"plate": plate, "amount_due": fee}
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    fee = session_manager.quote_fees([session], time.time())[0]
+    return {"plate": plate, "amount_due": fee}
 
 
 @app.post("/payment")
-def make_payment(request: PaymentRequest):
-    result = session_manager.handle_event({
+async def make_payment(request: PaymentRequest):
+    result = await session_manager.handle_event({
         "type": "payment_confirmed",
         "plate": request.plate,
         "time": time.time(),
@@ -61,9 +67,9 @@ def make_payment(request: PaymentRequest):
 
 
 @app.post("/exit")
-def try_exit(request: ExitRequest):
+async def try_exit(request: ExitRequest):
     plate = request.plate
-    result = session_manager.handle_event({
+    result = await session_manager.handle_event({
         "type": "vehicle_exit_detected",
         "plate": plate,
         "time": time.time(),
@@ -78,14 +84,13 @@ def try_exit(request: ExitRequest):
     }
 
 @app.post("/event")
-def ingest_event(event: Dict):
+async def ingest_event(event: Dict):
     try:
         plate = event.get("plate")
         if not plate:
             raise HTTPException(status_code=400, detail="Plate missing")
         
-        matched_plate = session_manager._find_matching_plate(plate) or plate
-        result = session_manager.handle_event(event)
+        result = await session_manager.handle_event(event)
         if event["type"] == "vehicle_exit_detected":
             decision = gate_controller.process_exit(result)
             return {
@@ -97,3 +102,61 @@ def ingest_event(event: Dict):
         print(f"[ERROR] {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+EVENT_TYPES = ("vehicle_entered", "vehicle_exit_detected", "payment_confirmed")
+
+
+def validate_event(event):
+    if not event.get("plate"):
+        return "Plate missing"
+    if not isinstance(event["plate"], str):
+        return "Plate must be a string"
+    if "type" not in event:
+        return "Type missing"
+    if event["type"] not in EVENT_TYPES:
+        return f"Unknown event type: {event['type']!r}"
+    if event["type"] in ("vehicle_entered", "vehicle_exit_detected"):
+        if "time" not in event:
+            return "Time missing"
+        timestamp = event["time"]
+        if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)) or not math.isfinite(timestamp):
+            return "Time must be a number"
+    return None
+
+
+@app.post("/events/batch")
+async def ingest_events(events: List[Dict]):
+    """
+    Ordered batch of events applied in one db transaction.
+    Returns one entry per event, in order; an invalid or failing event gets
+    an {"error": ...} entry and does not affect the others.
+    """
+    errors = [validate_event(event) for event in events]
+    valid = [event for event, error in zip(events, errors) if error is None]
+
+    try:
+        results = iter(await session_manager.handle_events(valid, isolate_errors=True))
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    response = []
+
+    for event, error in zip(events, errors):
+        if error is not None:
+            response.append({"error": error})
+            continue
+
+        result = next(results)
+        if isinstance(result, dict) and "error" in result:
+            response.append(result)
+            continue
+
+        entry = {"event_result": result}
+
+        if event["type"] == "vehicle_exit_detected":
+            entry["gate_decision"] = gate_controller.process_exit(result)
+
+        response.append(entry)
+
+    return {"results": response}
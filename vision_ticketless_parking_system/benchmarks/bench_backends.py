@@ -0,0 +1,119 @@
+"""
+Detector latency per inference backend (torch / onnx / openvino) on CPU:
+
+- export: one-off .pt -> fixed-shape ONNX / OpenVINO IR (0 when reused)
+- cold start: model load + first frame without warm-up
+- warm-up: the forward passes load_backend runs at startup
+- p50 / p90 per-frame latency once warm, and boxes per frame
+
+Each backend is timed in a fresh process, so lazy initialisation of one
+runtime does not leak into the cold start of the next.
+
+Run from the project root:
+    python -m benchmarks.bench_backends --model models/yolov8n.pt --threads 4
+    python -m benchmarks.bench_backends --model models/plate_detector/best.pt --imgsz 640 --video <clip>
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from src.inference_backend import BACKENDS, export_model, load_backend
+
+
+def load_frames(video, count, seed=0):
+    if video is None:
+        rng = np.random.default_rng(seed)
+        return [rng.integers(0, 255, size=(1080, 1920, 3), dtype=np.uint8) for _ in range(count)]
+
+    capture = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < count:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def measure(args):
+    """
+    Runs in the child process, returns the timings of one backend.
+    """
+    frames = load_frames(args.video, args.frames)
+
+    started = time.perf_counter()
+    if args.backend != "torch":
+        export_model(args.model, args.backend, args.imgsz)
+    export_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    model = load_backend(args.model, backend=args.backend, imgsz=args.imgsz, threads=args.threads, warmup=0)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    model(frames[0])
+    first_ms = (time.perf_counter() - started) * 1000
+
+    warm = load_backend(args.model, backend=args.backend, imgsz=args.imgsz, threads=args.threads)
+
+    latencies = []
+    boxes = 0
+    for frame in frames:
+        started = time.perf_counter()
+        result = warm(frame)[0]
+        latencies.append((time.perf_counter() - started) * 1000)
+        boxes += len(result)
+
+    return {
+        "export_s": export_s,
+        "load_ms": load_ms,
+        "first_ms": first_ms,
+        "warmup_ms": warm.warmup_ms,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p90_ms": float(np.percentile(latencies, 90)),
+        "boxes": boxes / len(frames),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Detector latency and cold start per inference backend")
+    parser.add_argument("--model", default="models/yolov8n.pt")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--video", default=None, help="clip to read frames from (default: random frames)")
+    parser.add_argument("--backend", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.backend is not None:
+        print(json.dumps(measure(args)))
+        return
+
+    print(f"model {args.model}, imgsz {args.imgsz}, threads {args.threads or 'default'}")
+    print(f"{'backend':>8} | {'export s':>8} | {'cold start ms':>13} | {'warm-up ms':>10} | "
+          f"{'p50 ms':>7} | {'p90 ms':>7} | {'boxes':>5}")
+
+    for backend in args.backends:
+        command = [sys.executable, "-m", "benchmarks.bench_backends", "--backend", backend] + sys.argv[1:]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+
+        print(
+            f"{backend:>8} | {r['export_s']:>8.1f} | {r['load_ms'] + r['first_ms']:>13.0f} | "
+            f"{r['warmup_ms']:>10.0f} | {r['p50_ms']:>7.1f} | {r['p90_ms']:>7.1f} | {r['boxes']:>5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
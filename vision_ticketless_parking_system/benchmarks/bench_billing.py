@@ -0,0 +1,123 @@
+"""
+Fee quotes for many active sessions: per-session calculate_fee() loop vs
+the vectorized BillingEngine.calculate_fees() over arrays.
+
+Uses a tariff with time-of-day bands, a daily cap and a free first
+period. Both are checked against a reference that walks the stay period
+by period. --timezone uses an IANA zone instead of a fixed offset, so the
+per-fee UTC offset lookup (DST) is part of the timing.
+
+Run from the project root:
+    python -m benchmarks.bench_billing --sessions 100000
+"""
+import argparse
+import math
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.parking_session.billing_engine import BillingEngine, Tariff, TariffBand, DAY_MIN
+
+
+def make_tariff(timezone=None):
+    return Tariff(
+        price_per_period=3.0,
+        period_minutes=30,
+        bands=[
+            TariffBand("07:00", "10:00", 6.0),
+            TariffBand("10:00", "18:00", 4.5),
+            TariffBand("22:00", "06:00", 1.25),
+        ],
+        daily_cap=60.0,
+        first_period_free=True,
+        utc_offset_sec=3600 if timezone is None else None,
+        timezone=timezone,
+    )
+
+
+def reference_fee(tariff, entry_time, now):
+    """
+    Period-by-period walk, independent of the compiled tables.
+    """
+    period_sec = tariff.period_minutes * 60
+    periods = max(1, math.ceil((now - entry_time) / period_sec))
+    periods_per_day = DAY_MIN // tariff.period_minutes
+    cap = math.inf if tariff.daily_cap is None else tariff.daily_cap
+
+    def price_at(minute):
+        price = tariff.price_per_period
+        for band in tariff.bands:
+            start = int(band.start[:2]) * 60 + int(band.start[3:])
+            end = int(band.end[:2]) * 60 + int(band.end[3:])
+            inside = start <= minute < end if start < end else (minute >= start or minute < end)
+            if inside:
+                price = band.price_per_period
+        return price
+
+    if tariff.timezone is None:
+        offset = tariff.utc_offset_sec
+    else:
+        offset = datetime.fromtimestamp(entry_time, ZoneInfo(tariff.timezone)).utcoffset().total_seconds()
+
+    entry_minute = math.floor((entry_time + offset) / 60)
+    total = 0.0
+    day_sum = 0.0
+
+    for k in range(periods):
+        if k and k % periods_per_day == 0:
+            total += min(cap, day_sum)
+            day_sum = 0.0
+        if k == 0 and tariff.first_period_free:
+            continue
+        day_sum += price_at((entry_minute + k * tariff.period_minutes) % DAY_MIN)
+
+    return round(total + min(cap, day_sum), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized fee calculation")
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--max-stay-hours", type=float, default=72)
+    parser.add_argument("--check", type=int, default=2000, help="sessions checked against the reference walk")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--timezone", default=None, help='IANA zone for the bands, e.g. "Europe/Berlin"')
+    args = parser.parse_args()
+
+    tariff = make_tariff(args.timezone)
+    billing = BillingEngine(tariff=tariff)
+
+    rng = np.random.default_rng(0)
+    now = time.time()
+    # mostly short stays, some multi-day ones
+    stays = np.minimum(rng.exponential(3 * 3600, args.sessions), args.max_stay_hours * 3600)
+    entry_times = now - stays
+
+    t0 = time.perf_counter()
+    scalar = np.array([billing.calculate_fee(e, now) for e in entry_times.tolist()])
+    scalar_sec = time.perf_counter() - t0
+
+    vector_sec = math.inf
+    for _ in range(args.repeats):
+        t0 = time.perf_counter()
+        vector = billing.calculate_fees(entry_times, now)
+        vector_sec = min(vector_sec, time.perf_counter() - t0)
+
+    sample = entry_times[:args.check].tolist()
+    reference = np.array([reference_fee(tariff, e, now) for e in sample])
+
+    print(f"sessions={args.sessions} tariff: 3 bands, daily cap {tariff.daily_cap}, first period free")
+    print(f"{'method':>10} | {'time ms':>8} | {'sessions/s':>12}")
+    print(f"{'scalar':>10} | {scalar_sec * 1000:>8.1f} | {args.sessions / scalar_sec:>12,.0f}")
+    print(f"{'vectorized':>10} | {vector_sec * 1000:>8.1f} | {args.sessions / vector_sec:>12,.0f}")
+    print(f"speedup x{scalar_sec / vector_sec:.1f}")
+
+    print(f"scalar vs vectorized mismatches: {int(np.sum(scalar != vector))}")
+    print(f"reference mismatches (first {len(sample)}): "
+          f"scalar={int(np.sum(scalar[:len(sample)] != reference))} "
+          f"vectorized={int(np.sum(vector[:len(sample)] != reference))}")
+
+
+if __name__ == "__main__":
+    main()
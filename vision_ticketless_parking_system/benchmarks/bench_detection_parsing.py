@@ -0,0 +1,114 @@
+"""
+Parsing of YOLO results on crowded frames (hundreds of boxes):
+
+- previous per-box loop (float(box.conf[0]), int(box.cls[0]),
+  map(int, box.xyxy[0]) for every box)
+- columnar: one boxes.data -> NumPy copy (as TorchBackend) +
+  src.detections.to_detections (mask filters)
+- to_detections + to_dicts (the dict API as used by VehicleDetector.detect)
+
+The model is not run: results are ultralytics Boxes built from random
+tensors with COCO class ids, so only the parsing cost is measured.
+
+Run from the project root:
+    python -m benchmarks.bench_detection_parsing --boxes 50 200 500
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Boxes
+
+from src.detections import class_ids, class_name_table, to_detections, to_dicts
+
+# COCO ids 0..79; the vehicle classes sit at 2, 3, 5, 7
+NAMES = {i: f"class_{i}" for i in range(80)}
+NAMES.update({2: "car", 3: "motorcycle", 5: "bus", 7: "truck"})
+VEHICLE_CLASSES = {"car", "bus", "truck", "motorcycle"}
+CONF_THRESHOLD = 0.4
+
+
+def loop_parse(result, names, conf_threshold, vehicle_classes):
+    """
+    VehicleDetector._parse before the columnar path.
+    """
+    vehicles = []
+
+    for box in result.boxes:
+        conf = float(box.conf[0])
+        if conf < conf_threshold:
+            continue
+
+        cls_id = int(box.cls[0])
+        label = names[cls_id]
+
+        if label in vehicle_classes:
+            x1, y1, x2, y2 = map(int, box.xyxy[0])
+            vehicles.append({
+                "bbox": (x1, y1, x2, y2),
+                "label": label,
+                "confidence": conf,
+            })
+    return vehicles
+
+
+def host_boxes(result):
+    return result.boxes.data.cpu().numpy()
+
+
+def make_result(count, seed=0):
+    rng = np.random.default_rng(seed)
+    top_left = rng.uniform(0, 3600, (count, 2))
+    size = rng.uniform(40, 300, (count, 2))
+    confidence = rng.uniform(0.1, 0.95, (count, 1))
+    # crowded car park: mostly vehicles, some other classes
+    cls = rng.choice([2, 2, 2, 3, 5, 7, 0, 9], (count, 1))
+
+    data = np.hstack([top_left, top_left + size, confidence, cls]).astype(np.float32)
+    return SimpleNamespace(boxes=Boxes(torch.from_numpy(data), orig_shape=(2160, 3840)))
+
+
+def timed(fn, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        out = fn()
+    return (time.perf_counter() - started) / repeats * 1e6, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-box loop vs columnar YOLO result parsing")
+    parser.add_argument("--boxes", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    keep_ids = class_ids(NAMES, VEHICLE_CLASSES)
+    names = class_name_table(NAMES)
+
+    print("parse time per frame")
+    print(f"{'boxes':>5} | {'loop us':>8} | {'columnar us':>11} | {'dicts us':>8} | {'kept':>5} | {'same':>5}")
+
+    for count in args.boxes:
+        result = make_result(count)
+
+        loop_us, loop_out = timed(
+            lambda: loop_parse(result, NAMES, CONF_THRESHOLD, VEHICLE_CLASSES), args.repeats
+        )
+        columnar_us, _ = timed(
+            lambda: to_detections(host_boxes(result), CONF_THRESHOLD, keep_class_ids=keep_ids, class_names=names),
+            args.repeats,
+        )
+        dicts_us, dicts_out = timed(
+            lambda: to_dicts(to_detections(host_boxes(result), CONF_THRESHOLD, keep_class_ids=keep_ids, class_names=names)),
+            args.repeats,
+        )
+
+        print(
+            f"{count:>5} | {loop_us:>8.0f} | {columnar_us:>11.0f} | {dicts_us:>8.0f} | "
+            f"{len(loop_out):>5} | {str(loop_out == dicts_out):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
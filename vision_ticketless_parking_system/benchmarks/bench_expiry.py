@@ -0,0 +1,165 @@
+"""
+Per-frame expiry of FrameProcessor.track_memory and PlateIdentityManager
+identities: previous full scans vs the last-seen ordered expiry.
+
+Thousands of tracks are alive at once; every frame some of them are
+seen, a few end and are replaced by new ones. Both variants replay the
+same schedule, and only the expiry step of each frame is timed. The
+surviving tracks / identities are compared at the end.
+
+Run from the project root:
+    python -m benchmarks.bench_expiry --tracks 1000 5000 10000 --frames 500
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy as np
+
+from src.pipeline.frame_processor import FrameProcessor
+from src.pipeline.plate_identity_manager import PlateIdentityManager
+from src.plate_text_stabilizer import PlateTextStabilizer
+
+
+class ScanTracks:
+    """
+    track_memory expiry as FrameProcessor did it before: every frame walks
+    all remembered tracks.
+    """
+    def __init__(self, max_missing_frames):
+        self.max_missing_frames = max_missing_frames
+        self.frame_count = 0
+        self.track_memory = {}
+
+    def touch_track(self, track_id):
+        memory = self.track_memory.get(track_id)
+        if memory is None:
+            memory = {"stable_text": None, "last_ocr_frame": 0}
+        memory["last_seen_frame"] = self.frame_count
+        self.track_memory[track_id] = memory
+
+    def expire_tracks(self):
+        for tid in list(self.track_memory.keys()):
+            last_seen = self.track_memory[tid]["last_seen_frame"]
+
+            if self.frame_count - last_seen > self.max_missing_frames:
+                del self.track_memory[tid]
+
+
+class ScanIdentities(PlateIdentityManager):
+    """
+    PlateIdentityManager.cleanup as before: walks every identity, then
+    rebuilds track_to_identity.
+    """
+    def cleanup(self, frame_count):
+        to_delete = []
+
+        for identity_id, data in self.identities.items():
+            if frame_count - data["last_seen_frame"] > self.ttl:
+                to_delete.append(identity_id)
+
+        for identity_id in to_delete:
+            print(f"[IDENTITY REMOVED] id={identity_id}")
+            del self.identities[identity_id]
+            del self.last_seen_order[identity_id]
+
+        self.track_to_identity = {
+            tid: iid for tid, iid in self.track_to_identity.items()
+            if iid in self.identities
+        }
+
+
+def make_schedule(tracks, frames, seen_ratio, churn, seed=0):
+    """
+    Per frame: the ids of the tracks seen in that frame.
+    """
+    rng = random.Random(seed)
+    alive = list(range(tracks))
+    next_id = tracks
+    schedule = []
+
+    for _ in range(frames):
+        for _ in range(churn):
+            alive[rng.randrange(tracks)] = next_id
+            next_id += 1
+        schedule.append(rng.sample(alive, int(tracks * seen_ratio)))
+
+    return schedule
+
+
+def seed_identity(manager, track_id, frame_count):
+    # what match_or_create does for a new plate, without the matching scan
+    identity_id = manager.next_id
+    manager.next_id += 1
+    text = f"PL{track_id:07d}"
+    manager.identities[identity_id] = {
+        "text": text,
+        "last_seen_frame": frame_count,
+        "track_ids": {track_id},
+    }
+    manager.index.add(identity_id, text)
+    manager.last_seen_order[identity_id] = None
+    manager.track_to_identity[track_id] = identity_id
+
+
+def replay(schedule, tracks, identities):
+    expiry_us = []
+
+    for frame_count, seen in enumerate(schedule, start=1):
+        tracks.frame_count = frame_count
+
+        for track_id in seen:
+            tracks.touch_track(track_id)
+            if track_id in identities.track_to_identity:
+                identities.match_or_create(track_id, None, frame_count)
+            else:
+                seed_identity(identities, track_id, frame_count)
+
+        started = time.perf_counter()
+        tracks.expire_tracks()
+        identities.cleanup(frame_count)
+        expiry_us.append((time.perf_counter() - started) * 1e6)
+
+    return np.array(expiry_us)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track / identity expiry: full scan vs last-seen order")
+    parser.add_argument("--tracks", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--seen-ratio", type=float, default=0.2, help="share of alive tracks seen per frame")
+    parser.add_argument("--churn", type=int, default=10, help="tracks replaced per frame")
+    args = parser.parse_args()
+
+    print(f"{'tracks':>6} | {'remembered':>10} | {'scan us/frame':>13} | {'ordered us/frame':>16} | "
+          f"{'speedup':>7} | {'same state':>10}")
+
+    for tracks in args.tracks:
+        schedule = make_schedule(tracks, args.frames, args.seen_ratio, args.churn)
+
+        ordered_tracks = FrameProcessor(None, None, None, None, PlateTextStabilizer(), None)
+        ordered_identities = PlateIdentityManager()
+
+        scan_tracks = ScanTracks(ordered_tracks.MAX_MISSING_FRAMES)
+        scan_identities = ScanIdentities()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            scan_us = replay(schedule, scan_tracks, scan_identities)
+            ordered_us = replay(schedule, ordered_tracks, ordered_identities)
+
+        same = (
+            set(scan_tracks.track_memory) == set(ordered_tracks.track_memory)
+            and scan_identities.identities.keys() == ordered_identities.identities.keys()
+            and scan_identities.track_to_identity == ordered_identities.track_to_identity
+        )
+
+        print(
+            f"{tracks:>6} | {len(ordered_tracks.track_memory):>10} | {scan_us.mean():>13.1f} | "
+            f"{ordered_us.mean():>16.1f} | {scan_us.mean() / ordered_us.mean():>6.1f}x | {str(same):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
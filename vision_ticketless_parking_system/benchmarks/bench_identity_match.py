@@ -0,0 +1,126 @@
+"""
+PlateIdentityManager.match_or_create for unbound tracks: previous linear
+scan over all identities vs IdentityIndex candidates + exact scoring.
+
+Identities are realistic plates (shared region prefixes). Queries mix
+exact re-reads, one-character OCR errors, truncated / extended readings
+and unseen plates. Both variants must return the same identity for
+every query.
+
+Run from the project root:
+    python -m benchmarks.bench_identity_match --identities 10 100 1000 10000
+"""
+import argparse
+import contextlib
+import io
+import random
+import string
+import time
+
+from src.pipeline.plate_identity_manager import PlateIdentityManager
+
+PREFIXES = ["GD", "GA", "GDA", "WA", "WI", "KR", "PO", "WR", "DW", "LU"]
+ALNUM = string.ascii_uppercase + string.digits
+
+
+def random_plate(rng):
+    prefix = rng.choice(PREFIXES)
+    return prefix + "".join(rng.choice(ALNUM) for _ in range(7 - len(prefix) + rng.choice([0, 0, 1])))
+
+
+def make_query(rng, plates):
+    roll = rng.random()
+    if roll < 0.25:
+        return rng.choice(plates)
+    if roll < 0.55:
+        plate = list(rng.choice(plates))
+        plate[rng.randrange(len(plate))] = rng.choice(ALNUM)
+        return "".join(plate)
+    if roll < 0.65:
+        plate = rng.choice(plates)
+        return plate[:-1] if rng.random() < 0.5 else plate + rng.choice(ALNUM)
+    return random_plate(rng)
+
+
+def scan_best(manager, text):
+    """
+    The matching loop of match_or_create before the index.
+    """
+    best_id = None
+    best_score = 0
+
+    for identity_id, data in manager.identities.items():
+        score = manager._similarity(text, data["text"])
+
+        if score > best_score and score >= manager.similarity_threshold:
+            best_score = score
+            best_id = identity_id
+
+    return best_id
+
+
+def indexed_best(manager, text):
+    best_id = None
+    best_score = 0
+
+    for identity_id in sorted(manager.index.candidates(text)):
+        score = manager._similarity(text, manager.identities[identity_id]["text"])
+
+        if score > best_score and score >= manager.similarity_threshold:
+            best_score = score
+            best_id = identity_id
+
+    return best_id
+
+
+def build_manager(rng, count):
+    manager = PlateIdentityManager()
+    plates = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(manager.identities) < count:
+            plate = random_plate(rng)
+            manager.match_or_create(f"t{len(plates)}", plate, 0)
+            plates.append(plate)
+
+    return manager, plates
+
+
+def time_queries(fn, manager, queries):
+    started = time.perf_counter()
+    results = [fn(manager, q) for q in queries]
+    return (time.perf_counter() - started) / len(queries) * 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Identity matching: linear scan vs IdentityIndex")
+    parser.add_argument("--identities", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'identities':>10} | {'scan us':>9} | {'index us':>9} | {'speedup':>7} | "
+          f"{'matched':>7} | {'mismatches':>10}")
+
+    for count in args.identities:
+        rng = random.Random(count)
+        manager, plates = build_manager(rng, count)
+        queries = [make_query(rng, plates) for _ in range(args.queries)]
+
+        # one warm-up pass builds the lazily created block layouts
+        for q in queries[:50]:
+            indexed_best(manager, q)
+
+        scan_us, expected = time_queries(scan_best, manager, queries)
+        index_us, actual = time_queries(indexed_best, manager, queries)
+
+        mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+        matched = sum(1 for a in expected if a is not None)
+
+        print(
+            f"{count:>10} | {scan_us:>9.1f} | {index_us:>9.1f} | {scan_us / index_us:>6.1f}x | "
+            f"{matched:>7} | {mismatches:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+MotionGate on a simulated entry lane: static scene with sensor noise and
+slow lighting drift, vehicles that drive in, wait at the barrier and
+leave. Vehicle detection is assumed to see a vehicle whenever one is
+in the frame (fed back through on_detections).
+
+Reports per traffic level:
+- skipped: fraction of frames without detection
+- missed: frames with a vehicle in view that were skipped
+- wake delay: frames from a vehicle entering the view to the first
+  detected frame (mean / max)
+- gate cost per frame
+
+Run from the project root:
+    python -m benchmarks.bench_motion_gate --vehicles-per-1k 0 2 10 30
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from src.pipeline.motion_gate import MotionGate
+
+WIDTH, HEIGHT = 1280, 720
+VEHICLE_W, VEHICLE_H = 420, 260
+SPEED = 24              # px per frame
+WAIT_FRAMES = 60        # standing at the barrier
+
+
+def make_scenes(seed, variants=8):
+    """
+    The empty lane with a few sensor-noise variants.
+    """
+    rng = np.random.default_rng(seed)
+    # blocky texture: road, kerb, markings
+    coarse = rng.integers(60, 160, size=(HEIGHT // 40, WIDTH // 40, 1))
+    scene = np.repeat(np.repeat(coarse, 40, axis=0), 40, axis=1)
+
+    scenes = []
+    for _ in range(variants):
+        noise = rng.normal(0, 3, size=(HEIGHT, WIDTH, 1))
+        scenes.append(np.clip(scene + noise, 0, 255).astype(np.uint8).repeat(3, axis=2))
+    return scenes
+
+
+def vehicle_positions():
+    """
+    x of the vehicle's left edge per frame of one passage, from entering
+    on the left to leaving on the right.
+    """
+    barrier = (WIDTH - VEHICLE_W) // 2
+    arrive = list(range(-VEHICLE_W + SPEED, barrier, SPEED))
+    leave = list(range(barrier, WIDTH, SPEED))
+    return arrive + [barrier] * WAIT_FRAMES + leave
+
+
+def make_schedule(frames, vehicles_per_1k, rng):
+    """
+    Per frame the x of the vehicle in view, or None.
+    """
+    schedule = [None] * frames
+    passage = vehicle_positions()
+    count = int(frames * vehicles_per_1k / 1000)
+
+    starts = np.sort(rng.choice(frames - len(passage), size=count, replace=False)) if count else []
+    free_from = 0
+    for start in starts:
+        start = max(int(start), free_from)
+        for i, x in enumerate(passage):
+            if start + i < frames:
+                schedule[start + i] = x
+        free_from = start + len(passage) + 1
+
+    return schedule
+
+
+def render(scenes, x, frame_idx):
+    # sensor noise and slow lighting drift
+    drift = 20 * np.sin(frame_idx / 2000 * 2 * np.pi)
+    frame = cv2.convertScaleAbs(scenes[frame_idx % len(scenes)], alpha=1.0, beta=drift)
+
+    if x is not None:
+        x1, x2 = max(0, x), min(WIDTH, x + VEHICLE_W)
+        y1 = (HEIGHT - VEHICLE_H) // 2
+        if x2 > x1:
+            frame[y1:y1 + VEHICLE_H, x1:x2] = (30, 30, 200)
+
+    return frame
+
+
+def run(frames, vehicles_per_1k, seed):
+    rng = np.random.default_rng(seed)
+    scenes = make_scenes(seed)
+    schedule = make_schedule(frames, vehicles_per_1k, rng)
+
+    gate = MotionGate()
+    elapsed = 0.0
+    missed = 0
+    delays = []
+    waiting_since = None
+
+    for i, x in enumerate(schedule):
+        frame = render(scenes, x, i)
+        in_view = x is not None
+
+        started = time.perf_counter()
+        detect = gate.should_detect(frame)
+        elapsed += time.perf_counter() - started
+
+        if in_view and (i == 0 or schedule[i - 1] is None):
+            waiting_since = i
+
+        if detect:
+            gate.on_detections(1 if in_view else 0)
+            if waiting_since is not None:
+                delays.append(i - waiting_since)
+                waiting_since = None
+        elif in_view:
+            missed += 1
+
+    return {
+        "skipped": gate.skipped_fraction,
+        "missed": missed,
+        "busy": sum(x is not None for x in schedule) / frames,
+        "delay_mean": float(np.mean(delays)) if delays else 0.0,
+        "delay_max": max(delays) if delays else 0,
+        "gate_us": elapsed / frames * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MotionGate skip rate and wake-up on a simulated lane")
+    parser.add_argument("--vehicles-per-1k", type=float, nargs="+", default=[0, 2, 10, 30])
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{WIDTH}x{HEIGHT} frames, {args.frames} per run")
+    print(f"{'veh/1k':>6} | {'in view':>7} | {'skipped':>7} | {'missed':>6} | {'wake delay':>10} | {'gate us':>7}")
+
+    for rate in args.vehicles_per_1k:
+        r = run(args.frames, rate, args.seed)
+        print(
+            f"{rate:>6g} | {r['busy']:>7.1%} | {r['skipped']:>7.1%} | {r['missed']:>6} | "
+            f"{r['delay_mean']:>4.1f} / {r['delay_max']:<3} | {r['gate_us']:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+OCR throughput on CPU: PlateOCR.read one crop at a time vs
+PlateOCR.read_batch over batches of plate crops. "same as read" is the
+fraction of crops where read_batch returns the same text as read().
+
+Synthetic crops by default; pass --crops-dir with real labelled crops
+(file name = plate, see bench_ocr_modes) to check the batch path before
+switching the worker to it.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_batching --crops 64 --batch-sizes 4 8 16
+    python -m benchmarks.bench_ocr_batching --crops-dir data/plate_crops
+"""
+import argparse
+import string
+import time
+
+import cv2
+import numpy as np
+
+from src.plate_ocr import PlateOCR
+
+
+def make_plate(text, rng, width=220, height=60):
+    crop = np.full((height, width, 3), 235, dtype=np.uint8)
+    cv2.rectangle(crop, (2, 2), (width - 3, height - 3), (20, 20, 20), 2)
+    cv2.putText(
+        crop,
+        text,
+        (12, height - 16),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.1,
+        (15, 15, 15),
+        3,
+        cv2.LINE_AA,
+    )
+
+    noise = rng.normal(0, 8, crop.shape)
+    crop = np.clip(crop.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    return cv2.GaussianBlur(crop, (3, 3), 0)
+
+
+def make_crops(count, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = list(string.ascii_uppercase)
+    alnum = list(string.ascii_uppercase + string.digits)
+
+    crops, labels = [], []
+    for _ in range(count):
+        text = "".join(rng.choice(letters, 2)) + "".join(rng.choice(alnum, 5))
+        crops.append(make_plate(text, rng))
+        labels.append(text)
+    return crops, labels
+
+
+def accuracy(results, labels):
+    hits = sum(1 for r, label in zip(results, labels) if r and r["text"] == label)
+    return hits / len(labels)
+
+
+def agreement(results, reference):
+    same = sum(
+        1 for r, ref in zip(results, reference)
+        if (r and r["text"]) == (ref and ref["text"])
+    )
+    return same / len(reference)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batched OCR benchmark")
+    parser.add_argument("--crops", type=int, default=64)
+    parser.add_argument("--crops-dir", default=None, help="labelled real plate crops")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--gpu", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    ocr = PlateOCR(use_gpu=args.gpu)
+    if args.crops_dir:
+        # bench_ocr_modes imports this module, import here to avoid a cycle
+        from benchmarks.bench_ocr_modes import load_crops
+        crops, labels = load_crops(args.crops_dir)
+    else:
+        crops, labels = make_crops(args.crops)
+
+    ocr.read(crops[0])
+
+    t0 = time.perf_counter()
+    sequential = [ocr.read(crop) for crop in crops]
+    seq_time = time.perf_counter() - t0
+
+    print(f"{'mode':>10} | {'crops/s':>8} | {'accuracy':>8} | {'same as read':>12}")
+    print(f"{'single':>10} | {len(crops) / seq_time:>8.1f} | {accuracy(sequential, labels):>8.2f} | {1.0:>12.2f}")
+
+    for batch_size in args.batch_sizes:
+        t0 = time.perf_counter()
+        batched = []
+        for i in range(0, len(crops), batch_size):
+            batched.extend(ocr.read_batch(crops[i:i + batch_size], batch_size=batch_size))
+        batch_time = time.perf_counter() - t0
+
+        name = f"batch={batch_size}"
+        print(
+            f"{name:>10} | {len(crops) / batch_time:>8.1f} | {accuracy(batched, labels):>8.2f} | "
+            f"{agreement(batched, sequential):>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Accuracy / throughput of PlateOCR modes ("both" vs "lazy") on a folder of
+labelled plate crops. The label is taken from the file name:
+    GD1234A.jpg, GD1234A_02.png -> "GD1234A"
+Without --crops-dir synthetic crops are used.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_modes --crops-dir data/plate_crops
+"""
+import argparse
+import os
+import time
+
+import cv2
+
+from src.plate_ocr import PlateOCR
+from benchmarks.bench_ocr_batching import make_crops
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_crops(crops_dir):
+    crops, labels = [], []
+
+    for name in sorted(os.listdir(crops_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in IMAGE_EXTENSIONS:
+            continue
+
+        img = cv2.imread(os.path.join(crops_dir, name))
+        if img is None:
+            continue
+
+        crops.append(img)
+        labels.append(stem.split("_")[0].replace(" ", "").upper())
+
+    return crops, labels
+
+
+def run_mode(mode, crops, labels, gpu):
+    ocr = PlateOCR(use_gpu=gpu, mode=mode)
+    ocr.read(crops[0])
+    ocr.counters.clear()
+
+    t0 = time.perf_counter()
+    results = [ocr.read(crop) for crop in crops]
+    elapsed = time.perf_counter() - t0
+
+    correct = sum(1 for r, label in zip(results, labels) if r and r["text"] == label)
+    wrong = sum(1 for r, label in zip(results, labels) if r and r["text"] != label)
+
+    return {
+        "mode": mode,
+        "crops_per_sec": len(crops) / elapsed,
+        "accuracy": correct / len(crops),
+        "wrong_reads": wrong,
+        **ocr.stats(),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PlateOCR mode comparison")
+    parser.add_argument("--crops-dir", default=None)
+    parser.add_argument("--synthetic", type=int, default=64)
+    parser.add_argument("--gpu", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.crops_dir:
+        crops, labels = load_crops(args.crops_dir)
+    else:
+        crops, labels = make_crops(args.synthetic)
+
+    if not crops:
+        raise RuntimeError("No crops found")
+
+    print(f"crops: {len(crops)}")
+    print(
+        f"{'mode':>5} | {'crops/s':>8} | {'accuracy':>8} | {'wrong':>5} | "
+        f"{'raw hit':>7} | {'proc hit':>8} | {'miss':>5} | {'2nd pass':>8}"
+    )
+
+    for mode in ("both", "lazy"):
+        r = run_mode(mode, crops, labels, args.gpu)
+        print(
+            f"{r['mode']:>5} | {r['crops_per_sec']:>8.1f} | {r['accuracy']:>8.2f} | "
+            f"{r['wrong_reads']:>5} | {r['raw_hit_rate']:>7.2f} | "
+            f"{r['preprocessed_hit_rate']:>8.2f} | {r['miss_rate']:>5.2f} | "
+            f"{r['preprocessed_read_rate']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Per-frame plate detection latency: one forward pass per vehicle ROI vs one
+batched forward pass per frame.
+
+Run from the project root:
+    python -m benchmarks.bench_plate_batching --model models/plate_detector/best.pt
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.plate_detector import PlateDetector
+from src.pipeline.frame_processor import FrameProcessor
+
+
+def make_frame(num_vehicles, width=1920, height=1080, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+
+    vehicles = []
+    for _ in range(num_vehicles):
+        w = int(rng.integers(200, 420))
+        h = int(rng.integers(150, 320))
+        x1 = int(rng.integers(0, width - w))
+        y1 = int(rng.integers(0, height - h))
+        vehicles.append({"bbox": (x1, y1, x1 + w, y1 + h), "label": "car"})
+
+    return frame, vehicles
+
+
+def time_path(fn, frame, vehicles, repeats, warmup=3):
+    for _ in range(warmup):
+        fn(frame, vehicles)
+
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn(frame, vehicles)
+    return (time.perf_counter() - t0) / repeats * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batched plate detection benchmark")
+    parser.add_argument("--model", default="models/plate_detector/best.pt")
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--imgsz", type=int, default=640)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    detector = PlateDetector(model_path=args.model, conf_threshold=0.2, batch_imgsz=args.imgsz)
+    processor = FrameProcessor(None, detector, None, None, None, None)
+
+    print(f"{'vehicles':>8} | {'per-ROI ms':>10} | {'batched ms':>10} | {'speedup':>7}")
+
+    for n in args.vehicles:
+        frame, vehicles = make_frame(n)
+
+        per_roi = time_path(processor.detect_plates_per_roi, frame, vehicles, args.repeats)
+        batched = time_path(processor.detect_plates_batched, frame, vehicles, args.repeats)
+
+        print(f"{n:>8} | {per_roi:>10.1f} | {batched:>10.1f} | {per_roi / batched:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
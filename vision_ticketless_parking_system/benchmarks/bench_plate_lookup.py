@@ -0,0 +1,115 @@
+"""
+Fuzzy plate lookup: full scan over all active plates (the previous
+SessionManager._find_matching_plate, without the db round-trip) vs
+PlateIndex. Also checks that both return the same match for every query.
+
+Run from the project root:
+    python -m benchmarks.bench_plate_lookup --sessions 1000 10000 50000
+"""
+import argparse
+import string
+import time
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from src.parking_session.plate_index import PlateIndex
+from src.parking_session.session_manager import SessionManager
+
+normalize = SessionManager()._normalize
+
+LETTERS = list(string.ascii_uppercase)
+ALNUM = list(string.ascii_uppercase + string.digits)
+
+
+def make_plates(count, rng):
+    plates = set()
+    while len(plates) < count:
+        length = rng.integers(4, 7)
+        plates.add("".join(rng.choice(LETTERS, 2)) + "".join(rng.choice(ALNUM, length)))
+    return sorted(plates)
+
+
+def perturb(plate, rng):
+    op = rng.integers(0, 5)
+    i = int(rng.integers(0, len(plate)))
+
+    if op == 0:
+        return plate
+    if op == 1:
+        return plate[:i] + str(rng.choice(ALNUM)) + plate[i + 1:]
+    if op == 2:
+        return plate[:i] + plate[i + 1:]
+    if op == 3:
+        return plate[:i] + str(rng.choice(ALNUM)) + plate[i:]
+    # OCR reading only part of the plate
+    return plate[1:] if i % 2 else plate[:-1]
+
+
+def scan(plates, plate, threshold=0.9):
+    best_match = None
+    best_score = 0.0
+
+    for existing in plates:
+        norm_input = normalize(plate)
+        norm_existing = normalize(existing)
+
+        score = SequenceMatcher(None, norm_input, norm_existing).ratio()
+
+        if norm_input in norm_existing or norm_existing in norm_input:
+            score = max(score, 0.95)
+
+        if score > best_score:
+            best_score = score
+            best_match = existing
+
+    if best_score >= threshold:
+        return best_match
+    return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fuzzy plate lookup benchmark")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-queries", type=int, default=20)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'sessions':>8} | {'scan ms':>8} | {'index ms':>8} | {'speedup':>8} | {'build s':>7} | {'mismatch':>8}")
+
+    for count in args.sessions:
+        plates = make_plates(count, rng)
+        queries = [perturb(str(rng.choice(plates)), rng) for _ in range(args.queries // 2)]
+        queries += [perturb(p, rng) for p in make_plates(args.queries - len(queries), rng)]
+
+        t0 = time.perf_counter()
+        index = PlateIndex(normalize)
+        for i, plate in enumerate(plates):
+            index.add(i, plate)
+        build_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        indexed = [index.find(q) for q in queries]
+        index_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+
+        checked = queries[:args.scan_queries]
+        t0 = time.perf_counter()
+        scanned = [scan(plates, q) for q in checked]
+        scan_ms = (time.perf_counter() - t0) * 1000 / len(checked)
+
+        mismatches = sum(1 for a, b in zip(scanned, indexed) if a != b)
+
+        print(
+            f"{count:>8} | {scan_ms:>8.2f} | {index_ms:>8.3f} | "
+            f"{scan_ms / index_ms:>7.0f}x | {build_time:>7.2f} | "
+            f"{mismatches:>3}/{len(checked):<4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
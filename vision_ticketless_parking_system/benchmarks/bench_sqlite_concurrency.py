@@ -0,0 +1,194 @@
+"""
+Concurrent readers / writers on the sessions table: default SQLite
+settings (rollback journal, plate-only index) vs the storage profile in
+src/db/database.py (WAL, tuned pragmas, composite (status, plate) index).
+
+Readers run the hot active-session lookup by plate while writers insert
+and end sessions in multi-row transactions. Reports read latency and the
+throughput of both sides.
+
+Run from the project root:
+    python -m benchmarks.bench_sqlite_concurrency --readers 2 --writers 1 --seconds 5
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import create_engine, event, text
+
+from src.db.database import Base, SQLITE_PRAGMAS, apply_sqlite_pragmas
+from src.db.migrations import migrate
+
+PROFILES = ["default", "tuned"]
+
+
+def random_plate(rng):
+    return "".join(rng.choice(string.ascii_uppercase) for _ in range(2)) + \
+        "".join(rng.choice(string.digits) for _ in range(5))
+
+
+def make_engine(path, profile):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 5.0},
+        pool_size=16,
+    )
+
+    if profile == "tuned":
+        event.listen(engine, "connect", lambda conn, _: apply_sqlite_pragmas(conn, SQLITE_PRAGMAS))
+
+    return engine
+
+
+def populate(engine, profile, sessions, active_ratio, rng):
+    with engine.begin() as conn:
+        if profile == "tuned":
+            migrate(conn)
+        else:
+            Base.metadata.create_all(conn)
+            conn.execute(text("DROP INDEX IF EXISTS ix_sessions_status_plate"))
+
+        plates = []
+        rows = []
+        for _ in range(sessions):
+            plate = random_plate(rng)
+            active = rng.random() < active_ratio
+            if active:
+                plates.append(plate)
+            rows.append({
+                "session_id": str(uuid.uuid4()),
+                "plate": plate,
+                "status": "ACTIVE" if active else "ENDED",
+            })
+
+        conn.execute(
+            text(
+                "INSERT INTO sessions (session_id, plate, entry_time, payment_status, amount_due, status) "
+                "VALUES (:session_id, :plate, 0, 'unpaid', 0, :status)"
+            ),
+            rows,
+        )
+
+    return plates
+
+
+def run(profile, args):
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "parking.db"), profile)
+        plates = populate(engine, profile, args.sessions, args.active_ratio, rng)
+
+        stop = threading.Event()
+        read_ms = []
+        writes = [0]
+        errors = [0]
+        lock = threading.Lock()
+
+        def reader(seed):
+            local_rng = random.Random(seed)
+            latencies = []
+
+            with engine.connect() as conn:
+                while not stop.is_set():
+                    plate = local_rng.choice(plates)
+                    t0 = time.perf_counter()
+                    try:
+                        conn.execute(
+                            text("SELECT session_id FROM sessions WHERE plate = :plate AND status = 'ACTIVE'"),
+                            {"plate": plate},
+                        ).fetchall()
+                        conn.commit()
+                    except Exception:
+                        with lock:
+                            errors[0] += 1
+                        conn.rollback()
+                        continue
+                    latencies.append((time.perf_counter() - t0) * 1000)
+
+            with lock:
+                read_ms.extend(latencies)
+
+        def writer(seed):
+            local_rng = random.Random(seed)
+
+            while not stop.is_set():
+                try:
+                    with engine.begin() as conn:
+                        for _ in range(args.rows_per_write):
+                            conn.execute(
+                                text(
+                                    "INSERT INTO sessions (session_id, plate, entry_time, payment_status, amount_due, status) "
+                                    "VALUES (:session_id, :plate, 0, 'unpaid', 0, 'ACTIVE')"
+                                ),
+                                {"session_id": str(uuid.uuid4()), "plate": random_plate(local_rng)},
+                            )
+                            conn.execute(
+                                text("UPDATE sessions SET status = 'ENDED' WHERE plate = :plate AND status = 'ACTIVE'"),
+                                {"plate": random_plate(local_rng)},
+                            )
+                    with lock:
+                        writes[0] += 1
+                except Exception:
+                    with lock:
+                        errors[0] += 1
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(100 + i,)) for i in range(args.writers)]
+
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        engine.dispose()
+
+    read_ms = np.array(read_ms) if read_ms else np.zeros(1)
+    return {
+        "reads_per_sec": len(read_ms) / args.seconds,
+        "read_p50": float(np.percentile(read_ms, 50)),
+        "read_p99": float(np.percentile(read_ms, 99)),
+        "read_max": float(read_ms.max()),
+        "writes_per_sec": writes[0] / args.seconds,
+        "errors": errors[0],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="SQLite concurrent reader/writer benchmark")
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--active-ratio", type=float, default=0.1)
+    parser.add_argument("--rows-per-write", type=int, default=200)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print(
+        f"{'profile':>8} | {'reads/s':>8} | {'read p50':>8} | {'read p99':>8} | "
+        f"{'read max':>8} | {'writes/s':>8} | {'errors':>6}"
+    )
+
+    for profile in PROFILES:
+        s = run(profile, args)
+        print(
+            f"{profile:>8} | {s['reads_per_sec']:>8.0f} | {s['read_p50']:>6.2f}ms | "
+            f"{s['read_p99']:>6.2f}ms | {s['read_max']:>6.1f}ms | "
+            f"{s['writes_per_sec']:>8.1f} | {s['errors']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
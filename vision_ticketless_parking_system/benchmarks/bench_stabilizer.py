@@ -0,0 +1,198 @@
+"""
+PlateTextStabilizer: previous list-based vote (window rebuilt on every
+update) vs the incremental tallies in src/plate_text_stabilizer.py.
+
+First replays the same noisy OCR streams through both and reports any
+difference in the returned text or the per-track score, then times
+update() for several window sizes.
+
+Run from the project root:
+    python -m benchmarks.bench_stabilizer --windows 10 20 50 100
+"""
+import argparse
+import random
+import string
+import time
+from collections import defaultdict, Counter
+
+import numpy as np
+
+from src.plate_text_stabilizer import PlateTextStabilizer
+
+
+class ListStabilizer:
+    """
+    The implementation before the incremental tallies, kept verbatim as
+    the reference.
+    """
+    def __init__(self, window_size=10, min_votes=3, min_confidence=0.6, stable_threshold=0.7):
+        self.window_size = window_size
+        self.min_votes = min_votes
+        self.min_confidence = min_confidence
+        self.stable_threshold = stable_threshold
+        self.history = defaultdict(list)
+        self.scores = {}
+
+    def update(self, track_id, text, confidence=None):
+        if track_id is None:
+            return None
+
+        if text is None or text == "":
+            return None
+
+        text = text.replace(" ", "").upper()
+
+        if confidence is None:
+            confidence = 0.5
+
+        if confidence < self.min_confidence:
+            return None
+
+        self.history[track_id].append((text, confidence))
+
+        if len(self.history[track_id]) > self.window_size:
+            self.history[track_id].pop(0)
+
+        if len(self.history[track_id]) < self.min_votes:
+            return None
+
+        stable_text, score = self._vote(self.history[track_id])
+        self.scores[track_id] = score
+
+        if score >= self.stable_threshold:
+            return stable_text
+        return None
+
+    def confidence(self, track_id):
+        return self.scores.get(track_id, 0.0)
+
+    def _vote(self, items):
+        texts = [t for t, _ in items]
+
+        length_counter = Counter(len(t) for t in texts)
+        target_len, _ = length_counter.most_common(1)[0]
+
+        filtered = [(t, c) for t, c in items if len(t) == target_len]
+
+        if len(filtered) == 0:
+            return None, 0
+
+        result = []
+        scores = []
+
+        for i in range(target_len):
+            char_votes = {}
+            for t, c in filtered:
+                ch = t[i]
+                char_votes[ch] = char_votes.get(ch, 0) + c
+
+            best_char = max(char_votes.items(), key=lambda x: x[1])
+            result.append(best_char[0])
+
+            total = sum(char_votes.values())
+            scores.append(best_char[1] / total if total > 0 else 0)
+
+        return "".join(result), np.mean(scores)
+
+
+ALPHABET = string.ascii_uppercase + string.digits
+
+
+def noisy_reading(rng, plate):
+    """
+    One OCR reading of plate: substituted, dropped or extra characters,
+    and confidences either continuous, repeated or missing.
+    """
+    chars = list(plate)
+    roll = rng.random()
+
+    if roll < 0.25:
+        chars[rng.randrange(len(chars))] = rng.choice(ALPHABET)
+    elif roll < 0.32:
+        del chars[rng.randrange(len(chars))]
+    elif roll < 0.37:
+        chars.insert(rng.randrange(len(chars) + 1), rng.choice(ALPHABET))
+
+    text = "".join(chars)
+    if rng.random() < 0.1:
+        text = text[:3] + " " + text[3:]
+
+    roll = rng.random()
+    if roll < 0.1:
+        confidence = None
+    elif roll < 0.3:
+        confidence = rng.choice([0.6, 0.7, 0.8, 0.9, 1.0])
+    else:
+        confidence = rng.uniform(0.3, 1.0)
+
+    return text, confidence
+
+
+def make_stream(rng, updates, tracks):
+    plates = {
+        track_id: "".join(rng.choice(ALPHABET) for _ in range(rng.choice([7, 7, 8])))
+        for track_id in range(tracks)
+    }
+    stream = []
+    for _ in range(updates):
+        track_id = rng.randrange(tracks)
+        stream.append((track_id, *noisy_reading(rng, plates[track_id])))
+    return stream
+
+
+def check_equivalence(stream, window):
+    reference = ListStabilizer(window_size=window, min_votes=3, min_confidence=0.6, stable_threshold=0.65)
+    incremental = PlateTextStabilizer(window_size=window, min_votes=3, min_confidence=0.6, stable_threshold=0.65)
+
+    text_mismatches = 0
+    max_score_diff = 0.0
+
+    for track_id, text, confidence in stream:
+        expected = reference.update(track_id, text, confidence)
+        actual = incremental.update(track_id, text, confidence)
+
+        if expected != actual:
+            text_mismatches += 1
+        max_score_diff = max(
+            max_score_diff,
+            abs(reference.confidence(track_id) - incremental.confidence(track_id)),
+        )
+
+    return text_mismatches, max_score_diff
+
+
+def time_updates(cls, stream, window):
+    stabilizer = cls(window_size=window, min_votes=3, min_confidence=0.6, stable_threshold=0.65)
+
+    started = time.perf_counter()
+    for track_id, text, confidence in stream:
+        stabilizer.update(track_id, text, confidence)
+    return (time.perf_counter() - started) / len(stream) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PlateTextStabilizer list vote vs incremental tallies")
+    parser.add_argument("--windows", type=int, nargs="+", default=[10, 20, 50, 100])
+    parser.add_argument("--updates", type=int, default=50_000)
+    parser.add_argument("--tracks", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    stream = make_stream(rng, args.updates, args.tracks)
+
+    print(f"{'window':>6} | {'text mismatches':>15} | {'max score diff':>14} | "
+          f"{'list us':>8} | {'incr us':>8} | {'speedup':>7}")
+
+    for window in args.windows:
+        mismatches, score_diff = check_equivalence(stream, window)
+        list_us = time_updates(ListStabilizer, stream, window)
+        incremental_us = time_updates(PlateTextStabilizer, stream, window)
+
+        print(
+            f"{window:>6} | {mismatches:>15} | {score_diff:>14.1e} | "
+            f"{list_us:>8.1f} | {incremental_us:>8.1f} | {list_us / incremental_us:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+ByteTrack adapters of PlateTracker with hundreds of plates per frame:
+
+- previous dict adapter (per-plate loops, ids zipped positionally)
+- PlateTracker.update (dict API, ids mapped back by source index)
+- PlateTracker.track (columnar sv.Detections in and out)
+
+ByteTrack itself runs once per plate count and its outputs are replayed
+to every adapter, so the timings are the adapter overhead alone; the
+ByteTrack time is printed for scale.
+
+Also counts plates that the positional zip gave another plate's id:
+ByteTrack drops low-confidence detections, so the tracked subset does
+not line up with the input list.
+
+Run from the project root:
+    python -m benchmarks.bench_tracker_adapters --detections 100 300 600
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import supervision as sv
+
+from src.plate_tracker import PlateTracker
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+
+class ZipPlateTracker(PlateTracker):
+    """
+    PlateTracker.update before the columnar path.
+    """
+    def update(self, plates):
+        if plates is None or len(plates) == 0:
+            return self.last_tracks
+
+        xyxy = []
+        confidences = []
+
+        for plate in plates:
+            bbox = plate.get("bbox")
+            conf = plate.get("confidence")
+
+            if bbox is None or len(bbox) != 4:
+                continue
+
+            xyxy.append(bbox)
+            confidences.append(conf)
+
+        if len(xyxy) == 0:
+            return self.last_tracks
+
+        xyxy = np.array(xyxy, dtype=np.float32)
+        confidences = np.array(confidences, dtype=np.float32)
+
+        detections = sv.Detections(
+            xyxy=xyxy,
+            confidence=confidences,
+            class_id=np.zeros(len(xyxy))
+        )
+
+        tracked = self.tracker.update_with_detections(detections)
+        tracked_plates = []
+
+        for plate, track_id in zip(plates, tracked.tracker_id):
+            plate["track_id"] = int(track_id)
+            tracked_plates.append(plate)
+        self.last_tracks = tracked_plates
+
+        return tracked_plates
+
+
+class ReplayByteTrack:
+    """
+    Returns recorded ByteTrack outputs in order.
+    """
+    def __init__(self, outputs):
+        self.outputs = iter(outputs)
+
+    def update_with_detections(self, detections):
+        return next(self.outputs)
+
+
+def record_tracks(frames):
+    tracker = PlateTracker()
+    outputs = []
+
+    started = time.perf_counter()
+    for xyxy, confidence in frames:
+        outputs.append(tracker.track(sv.Detections(xyxy=xyxy, confidence=confidence)))
+    elapsed = time.perf_counter() - started
+
+    return outputs, elapsed / len(frames) * 1000
+
+
+def make_frames(count, frames, seed=0):
+    """
+    Plates drifting across a 4K frame with jittered confidences.
+    Returns per frame (xyxy, confidence) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    origin = rng.uniform(0, 3600, (count, 2))
+    velocity = rng.uniform(-4, 4, (count, 2))
+    size = np.array([60, 18])
+
+    result = []
+    for f in range(frames):
+        top_left = origin + velocity * f + rng.normal(0, 0.5, (count, 2))
+        xyxy = np.hstack([top_left, top_left + size]).astype(np.float32)
+        confidence = rng.uniform(0.2, 0.95, count).astype(np.float32)
+        result.append((xyxy, confidence))
+    return result
+
+
+def as_dicts(xyxy, confidence):
+    return [
+        {"bbox": tuple(box), "confidence": conf}
+        for box, conf in zip(xyxy.astype(int).tolist(), confidence.tolist())
+    ]
+
+
+def run_dicts(tracker_cls, frames, outputs):
+    tracker = tracker_cls()
+    tracker.tracker = ReplayByteTrack(outputs)
+    elapsed = 0.0
+    assigned = []
+
+    for xyxy, confidence in frames:
+        plates = as_dicts(xyxy, confidence)
+
+        started = time.perf_counter()
+        tracker.update(plates)
+        elapsed += time.perf_counter() - started
+
+        assigned.append([plate.get("track_id") for plate in plates])
+
+    return elapsed / len(frames) * 1e6, assigned
+
+
+def run_columnar(frames, outputs):
+    tracker = PlateTracker()
+    tracker.tracker = ReplayByteTrack(outputs)
+    elapsed = 0.0
+
+    for xyxy, confidence in frames:
+        started = time.perf_counter()
+        detections = sv.Detections(xyxy=xyxy, confidence=confidence)
+        tracked = tracker.track(detections)
+        track_ids = np.full(len(xyxy), -1)
+        track_ids[tracked.data["source_index"]] = tracked.tracker_id
+        elapsed += time.perf_counter() - started
+
+    return elapsed / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PlateTracker dict vs columnar ByteTrack adapters")
+    parser.add_argument("--detections", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    print("adapter overhead per frame (ByteTrack excluded)")
+    print(f"{'plates':>6} | {'zip us':>7} | {'update us':>9} | {'track us':>8} | {'ByteTrack ms':>12} | "
+          f"{'zip misassigned':>15}")
+
+    for count in args.detections:
+        frames = make_frames(count, args.frames)
+        outputs, bytetrack_ms = record_tracks(frames)
+
+        zip_us, zip_ids = run_dicts(ZipPlateTracker, frames, outputs)
+        update_us, update_ids = run_dicts(PlateTracker, frames, outputs)
+        track_us = run_columnar(frames, outputs)
+
+        # same inputs -> same ByteTrack output; update maps ids by index
+        misassigned = sum(
+            1
+            for old, new in zip(zip_ids, update_ids)
+            for a, b in zip(old, new)
+            if a is not None and a != b
+        )
+
+        print(
+            f"{count:>6} | {zip_us:>7.0f} | {update_us:>9.0f} | {track_us:>8.0f} | {bytetrack_ms:>12.1f} | "
+            f"{misassigned:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Load test for the Parking API: starts the app under uvicorn on a fresh
+database and fires a concurrent mix of event / payment / exit / session
+lookup requests. Reports p50 / p99 latency and requests per second.
+
+Run from the project root:
+    python -m benchmarks.load_test_api --concurrency 8 32 --requests 2000
+
+Pass --project-dir to load-test another checkout (e.g. a git worktree of
+an older revision) with the same workload.
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_schema(project_dir, db_dir):
+    sys.path.insert(0, project_dir)
+    from src.db import models
+
+    engine = create_engine(f"sqlite:///{os.path.join(db_dir, 'parking.db')}")
+    models.Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def start_server(project_dir, db_dir, port):
+    env = dict(os.environ, PYTHONPATH=project_dir)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=db_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/sessions/active").status_code == 200:
+                return server, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    server.kill()
+    raise RuntimeError("API did not start")
+
+
+def random_plate(rng):
+    return "".join(rng.choice(string.ascii_uppercase) for _ in range(2)) + \
+        "".join(rng.choice(string.digits + string.ascii_uppercase) for _ in range(5))
+
+
+def make_request(rng, plates):
+    """
+    Returns (method, path, json) for one request of the workload mix.
+    """
+    roll = rng.random()
+    now = time.time()
+
+    if roll < 0.3 or not plates:
+        plate = random_plate(rng)
+        plates.append(plate)
+        return "POST", "/event", {"type": "vehicle_entered", "plate": plate, "time": now - 3600}
+
+    plate = rng.choice(plates)
+
+    if roll < 0.55:
+        return "GET", f"/sessions/{plate}", None
+    if roll < 0.7:
+        return "GET", "/sessions/active", None
+    if roll < 0.85:
+        return "POST", "/payment", {"plate": plate}
+    return "POST", "/event", {"type": "vehicle_exit_detected", "plate": plate, "time": now}
+
+
+async def run_load(url, total, concurrency, seed=0):
+    rng = random.Random(seed)
+    plates = []
+    latencies = []
+    errors = 0
+    issued = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+
+        async def worker():
+            nonlocal issued, errors
+
+            while issued < total:
+                issued += 1
+                method, path, payload = make_request(rng, plates)
+
+                t0 = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=payload)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies = np.array(latencies)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+        "errors": errors,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parking API load test")
+    parser.add_argument("--project-dir", default=PROJECT_DIR)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    project_dir = os.path.abspath(args.project_dir)
+
+    print(f"{'concurrency':>11} | {'rps':>7} | {'p50 ms':>7} | {'p99 ms':>8} | {'errors':>6}")
+
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory() as db_dir:
+            create_schema(project_dir, db_dir)
+            server, url = start_server(project_dir, db_dir, args.port)
+
+            try:
+                s = asyncio.run(run_load(url, args.requests, concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+
+        print(
+            f"{concurrency:>11} | {s['rps']:>7.1f} | {s['p50']:>7.1f} | "
+            f"{s['p99']:>8.1f} | {s['errors']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
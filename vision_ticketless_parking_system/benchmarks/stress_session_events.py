@@ -0,0 +1,162 @@
+"""
+Concurrency stress test for SessionManager on a fresh database.
+
+Every simulated car goes through entry -> payment -> exit, and each event
+is fired twice at the same time (two lanes / a kiosk double-submit).
+Cars run concurrently, so thousands of events interleave. Afterwards the
+invariants are checked:
+
+- exactly one session started, one payment confirmed and one session
+  ended per car visit
+- no ACTIVE sessions left, every ENDED session is paid and has an exit time
+- the in-memory active-session cache matches the db
+- no event raised: a lost race ends in StaleSession, which SessionManager
+  settles itself; any other exception (e.g. a database error) fails the
+  run and its traceback is printed
+
+With --managers 2 the second copy of every event goes to another
+SessionManager with its own cache (like a second API worker), so the
+conflicts are settled by the guarded SQL statements instead of the
+in-process cache. Its cache is not expected to match the db.
+
+Run from the project root:
+    python -m benchmarks.stress_session_events --cars 500 --visits 2 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import traceback
+from collections import Counter
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.database import AsyncSessionLocal, get_async_db, setup_async_engine
+from src.db.migrations import migrate
+from src.db.models import ParkingSessionDB
+from src.parking_session.session_manager import SessionManager, StaleSession
+
+
+async def visit(managers, plate, counters, errors):
+    async def fire(manager, payload):
+        try:
+            return await manager.handle_event(payload)
+        except StaleSession:
+            # expected outcome of a lost race, not reached while
+            # _apply_event settles it
+            counters["stale"] += 1
+            return None
+        except Exception as e:
+            errors.append((payload, e))
+            return None
+
+    async def fire_twice(payload):
+        return await asyncio.gather(
+            fire(managers[0], payload),
+            fire(managers[-1], dict(payload)),
+        )
+
+    def count(results):
+        for result in results:
+            if result:
+                counters[result["type"]] += 1
+
+    count(await fire_twice({"type": "vehicle_entered", "plate": plate, "time": time.time()}))
+    count(await fire_twice({"type": "payment_confirmed", "plate": plate, "time": time.time()}))
+    count(await fire_twice({"type": "vehicle_exit_detected", "plate": plate, "time": time.time()}))
+
+
+async def run(args, db_path):
+    # point the app's session factory at a throwaway database
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    setup_async_engine(engine)
+    AsyncSessionLocal.configure(bind=engine)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(migrate)
+
+    managers = [SessionManager() for _ in range(args.managers)]
+    for manager in managers:
+        await manager.load()
+
+    counters = Counter()
+    errors = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def car(i):
+        plate = f"ST{i:05d}"
+        for _ in range(args.visits):
+            async with semaphore:
+                await visit(managers, plate, counters, errors)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(car(i) for i in range(args.cars)))
+    elapsed = time.perf_counter() - started
+
+    async with get_async_db() as db:
+        total = (await db.execute(select(func.count()).select_from(ParkingSessionDB))).scalar()
+        active = (await db.execute(
+            select(func.count()).select_from(ParkingSessionDB).filter_by(status="ACTIVE")
+        )).scalar()
+        unpaid_ended = (await db.execute(
+            select(func.count()).select_from(ParkingSessionDB).where(
+                ParkingSessionDB.status == "ENDED",
+                (ParkingSessionDB.payment_status != "paid") | ParkingSessionDB.exit_time.is_(None),
+            )
+        )).scalar()
+        active_ids = set((await db.execute(
+            select(ParkingSessionDB.session_id).filter_by(status="ACTIVE")
+        )).scalars())
+
+    await engine.dispose()
+
+    visits = args.cars * args.visits
+    events = visits * 6
+
+    checks = {
+        "one session per visit": total == visits and counters["session_started"] == visits,
+        "one payment per visit": counters["payment_confirmed"] == visits,
+        "one exit per visit": counters["session_ended"] == visits,
+        "no active sessions left": active == 0,
+        "ended sessions paid": unpaid_ended == 0,
+        "no unexpected exceptions": not errors,
+    }
+    if args.managers == 1:
+        checks["cache matches db"] = set(managers[0].active._sessions) == active_ids
+
+    print(f"events={events} time={elapsed:.2f}s throughput={events / elapsed:.0f} events/s")
+    print(f"results={dict(counters)} errors={dict(Counter(type(e).__name__ for _, e in errors))}")
+    print(f"rows={total} active={active} ended_unpaid={unpaid_ended}")
+
+    for payload, e in errors[:3]:
+        print(f"[ERROR] {payload}")
+        traceback.print_exception(e)
+
+    for name, ok in checks.items():
+        print(f"  [{'OK' if ok else 'FAIL'}] {name}")
+
+    return all(checks.values())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="SessionManager concurrency stress test")
+    parser.add_argument("--cars", type=int, default=500)
+    parser.add_argument("--visits", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--managers", type=int, choices=[1, 2], default=1)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ok = asyncio.run(run(args, os.path.join(tmp, "parking.db")))
+
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import cv2
 import time
-import requests
 
 from src.video_stream import VideoStream
 from src.vehicle_detector import VehicleDetector
@@ -11,11 +10,15 @@ from src.plate_text_stabilizer import PlateTextStabilizer
 from src.plate_tracker import PlateTracker
 from src.plate_registry import PlateRegistry
 from src.pipeline.frame_processor import FrameProcessor
+from src.pipeline.camera_supervisor import CameraLane, CameraSupervisor
+from src.pipeline.ocr_scheduler import OCRBudget, OCRScheduler
+from src.pipeline.motion_gate import MotionGate
+from src.pipeline.inference_server import InferenceServer, BatchedVehicleDetector, BatchedPlateDetector
+from src.pipeline.event_dispatcher import EventDispatcher
 from src.logging.event_logger import EventLogger
 from src.utils.fps_counter import FPSCounter
 from src.pipeline.event_enricher import enrich_event
-from src.db.database import Base, engine
-from src.db import models
+from src.db.migrations import init_db
 
 def resize_for_display(frame, width=1200):
 
@@ -28,100 +31,211 @@ def resize_for_display(frame, width=1200):
 
     return cv2.resize(frame, (new_w, new_h))
 
-def main():
-    CONF_THRESHOLD = 0.4
-    mode = "entry"
+# one camera switched between entry and exit with the 1 / 2 keys
+# ("switch_modes"); a site with a camera per lane lists each with its
+# fixed mode:
+#   {"name": "entry_cam_1", "mode": "entry", "source": 0, "target_fps": 15, "threaded": True},
+#   {"name": "exit_cam_1", "mode": "exit", "source": 1, "target_fps": 15, "threaded": True},
+CAMERAS = [
+    {"name": "cam_1", "mode": "entry", "source": 0, "target_fps": 15, "threaded": True, "switch_modes": True},
+]
+
+STATS_INTERVAL_SEC = 10.0
+
+# run lanes on their own threads and batch detector calls across cameras;
+# a single lane has nothing to batch with
+BATCH_INFERENCE = len(CAMERAS) > 1
+MAX_BATCH_SIZE = 8
+MAX_BATCH_WAIT_MS = 5.0
+
+# detector runtime: "torch" (ultralytics .pt), "onnx" (ONNX Runtime) or
+# "openvino"; .pt weights are exported with a fixed input size on first use
+INFERENCE_BACKEND = "torch"
+INFERENCE_THREADS = None        # intra-op threads, None = runtime default
+
+# plate detection runs per vehicle; the INT8 build of quantize_plate_detector.py
+# is models/plate_detector/best_int8_openvino_model with PLATE_BACKEND = "openvino"
+PLATE_MODEL_PATH = "models/plate_detector/best.pt"
+PLATE_BACKEND = INFERENCE_BACKEND
+
+# skip vehicle / plate detection on lanes without motion (per camera:
+# "motion_gate": False to disable)
+MOTION_GATE = True
+
+# global OCR job budget shared by all lanes
+MAX_OCR_PER_SEC = 20.0
+
+# events are delivered to the API from a background thread; undelivered
+# events are kept in EVENT_SPILL_PATH while the API is down, events the API
+# keeps failing on (5xx) end up in EVENT_DEAD_LETTER_PATH
+API_EVENT_URL = "http://127.0.0.1:8000/event"
+API_EVENTS_BATCH_URL = "http://127.0.0.1:8000/events/batch"
+EVENT_SPILL_PATH = "logs/event_spill.jsonl"
+EVENT_DEAD_LETTER_PATH = "logs/event_dead_letter.jsonl"
+
+def build_processor(camera, name, vehicle_detector, plate_detector, plate_ocr, conf_threshold, ocr_budget):
+    tracker = PlateTracker(conf_threshold=conf_threshold, max_age=30)
+    stabilizer = PlateTextStabilizer(window_size=20, min_votes=3, min_confidence=0.6, stable_threshold=0.65,)
+    registry = PlateRegistry(exit_timeout=10, min_stable_frames=5)
+
+    return FrameProcessor(
+        vehicle_detector,
+        plate_detector,
+        tracker,
+        plate_ocr,
+        stabilizer,
+        registry,
+        camera=name,
+        ocr_scheduler=OCRScheduler(budget=ocr_budget),
+        motion_gate=MotionGate() if camera.get("motion_gate", MOTION_GATE) else None,
+    )
 
-    cv2.namedWindow("Vision Parking System", cv2.WINDOW_NORMAL)
+def build_lane(camera, vehicle_detector, plate_detector, plate_ocr, conf_threshold, ocr_budget):
+    stream = VideoStream(
+        source=camera["source"],
+        threaded=camera.get("threaded", False),
+        policy=camera.get("policy", "latest"),
+    )
 
-    stream = VideoStream(source=0)
+    if camera.get("switch_modes", False):
+        # entry and exit keep separate tracks / registries (and OCR inboxes)
+        modes = ("entry", "exit")
+        names = {mode: f"{camera['name']}_{mode}" for mode in modes}
+    else:
+        modes = (camera["mode"],)
+        names = {camera["mode"]: camera["name"]}
+
+    processors = {
+        mode: build_processor(camera, names[mode], vehicle_detector, plate_detector, plate_ocr, conf_threshold, ocr_budget)
+        for mode in modes
+    }
+
+    return CameraLane(
+        camera["name"],
+        camera["mode"],
+        stream,
+        processors[camera["mode"]],
+        target_fps=camera.get("target_fps", 15),
+        processors=processors,
+    )
 
-    vehicle_detector = VehicleDetector(conf_threshold=CONF_THRESHOLD)
-    plate_detector = PlateDetector(conf_threshold=0.2)
-    entry_tracker = PlateTracker(conf_threshold=CONF_THRESHOLD, max_age=30)
-    exit_tracker = PlateTracker(conf_threshold=CONF_THRESHOLD, max_age=30)
+def main():
+    CONF_THRESHOLD = 0.4
+
+    vehicle_detector = VehicleDetector(
+        conf_threshold=CONF_THRESHOLD,
+        backend=INFERENCE_BACKEND,
+        threads=INFERENCE_THREADS,
+    )
+    plate_detector = PlateDetector(
+        model_path=PLATE_MODEL_PATH,
+        conf_threshold=0.2,
+        backend=PLATE_BACKEND,
+        threads=INFERENCE_THREADS,
+    )
     plate_ocr = PlateOCR(use_gpu=True)
-    entry_stabilizer = PlateTextStabilizer(window_size=20, min_votes=3, min_confidence=0.6, stable_threshold=0.65,)
-    exit_stabilizer = PlateTextStabilizer(window_size=20, min_votes=3, min_confidence=0.6, stable_threshold=0.65,)
-    entry_registry = PlateRegistry(exit_timeout=10, min_stable_frames=5)
-    exit_registry = PlateRegistry(exit_timeout=10, min_stable_frames=5)
     event_logger = EventLogger("logs")
-    fps_counter = FPSCounter(window_size=30)
-
-    entry_processor = FrameProcessor(
-        vehicle_detector,
-        plate_detector,
-        entry_tracker,
-        plate_ocr,
-        entry_stabilizer,
-        entry_registry,
+    event_dispatcher = EventDispatcher(
+        API_EVENT_URL,
+        batch_url=API_EVENTS_BATCH_URL,
+        spill_path=EVENT_SPILL_PATH,
+        dead_letter_path=EVENT_DEAD_LETTER_PATH,
     )
 
-    exit_processor = FrameProcessor(
-        vehicle_detector,
-        plate_detector,
-        exit_tracker,
-        plate_ocr,
-        exit_stabilizer,
-        exit_registry,
-    )
+    inference_servers = []
+
+    if BATCH_INFERENCE:
+        vehicle_server = InferenceServer(
+            vehicle_detector.detect_batch,
+            max_batch_size=MAX_BATCH_SIZE,
+            max_wait_ms=MAX_BATCH_WAIT_MS,
+            name="vehicle",
+        )
+        plate_server = InferenceServer(
+            plate_detector.detect_rois_batch,
+            max_batch_size=MAX_BATCH_SIZE,
+            max_wait_ms=MAX_BATCH_WAIT_MS,
+            name="plate",
+        )
+        inference_servers = [vehicle_server, plate_server]
+
+        vehicle_detector = BatchedVehicleDetector(vehicle_server)
+        plate_detector = BatchedPlateDetector(plate_server)
 
-    Base.metadata.create_all(bind=engine)
+    ocr_budget = OCRBudget(max_per_sec=MAX_OCR_PER_SEC)
+    supervisor = CameraSupervisor(threaded=BATCH_INFERENCE)
+    fps_counters = {}
+
+    for camera in CAMERAS:
+        lane = build_lane(camera, vehicle_detector, plate_detector, plate_ocr, CONF_THRESHOLD, ocr_budget)
+        supervisor.add_lane(lane)
+        fps_counters[lane.name] = FPSCounter(window_size=30)
+        cv2.namedWindow(f"{lane.name.upper()} STREAM", cv2.WINDOW_NORMAL)
+
+    init_db()
+
+    last_stats_time = time.time()
 
     while True:
 
-        ret, frame = stream.read()
+        result = supervisor.step()
 
-        if not ret:
+        if result is None:
             break
 
-        processor = entry_processor if mode == "entry" else exit_processor
-        vehicles, plates, events = processor.process(frame)
+        lane, frame, vehicles, plates, events = result
 
-        fps = fps_counter.update()
+        fps = fps_counters[lane.name].update()
 
         for event in events:
-            event = enrich_event(event, mode)
+            event = enrich_event(event, lane.mode, lane.name)
 
             print(f"[EVENT] {event['type']} -> {event['plate']}")
 
             event_logger.log_event(event)
 
-            try:
-                response = requests.post(
-                    "http://127.0.0.1:8000/event",
-                    json=event,
-                    timeout=1.0,
-                )
-                print(f"[API STATUS] {response.status_code}")
-                if response.headers.get("content-type", "").startswith("application/json"):
-                    print(f"[API RESPONSE] {response.json()}")
-                else:
-                    print(f"[API RAW] {response.text}")
-            except Exception as e:
-                print(f"[API ERROR] {e}")
-
+            event_dispatcher.submit(event)
 
         draw_detections(frame, vehicles)
         draw_plates_with_text(frame, plates)
         draw_fps(frame, fps)
 
-        cv2.imshow(f"{mode.upper()} STREAM", frame)
+        cv2.imshow(f"{lane.name.upper()} STREAM", frame)
+
+        if time.time() - last_stats_time >= STATS_INTERVAL_SEC:
+            supervisor.print_stats()
+            for lane in supervisor.lanes:
+                lane.processor.ocr_scheduler.print_stats(lane.name)
+            for server in inference_servers:
+                server.print_stats()
+            event_dispatcher.print_stats()
+            last_stats_time = time.time()
 
         key = cv2.waitKey(1) & 0xFF
 
         if key == ord("q"):
             break
 
-        if key == ord("1"):
-            mode = "entry"
-            print(">>> SWITCHED TO ENTRY CAMERA")
+        for switch_key, mode in ((ord("1"), "entry"), (ord("2"), "exit")):
+            if key != switch_key:
+                continue
+            for lane in supervisor.lanes:
+                if lane.switchable and lane.mode != mode:
+                    lane.set_mode(mode)
+                    print(f">>> SWITCHED {lane.name.upper()} TO {mode.upper()}")
+
+    supervisor.print_stats()
+    for lane in supervisor.lanes:
+        lane.processor.ocr_scheduler.print_stats(lane.name)
+    supervisor.release()
+
+    for server in inference_servers:
+        server.print_stats()
+        server.stop()
 
-        if key == ord("2"):
-            mode = "exit"
-            print(">>> SWITCHED TO EXIT CAMERA")
+    event_dispatcher.stop()
+    event_dispatcher.print_stats()
 
-    stream.release()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""
+INT8 post-training quantization of the plate detector.
+
+Takes the trained models/plate_detector/best.pt, quantizes it to an INT8
+OpenVINO model (NNCF, calibrated on a subset of the dataset/ train split)
+and reports mAP and CPU latency of the FP32 and INT8 models:
+
+    python quantize_plate_detector.py --calib-images 300
+
+The INT8 model is written to models/plate_detector/best_int8_openvino_model
+and loaded with PlateDetector(model_path=..., backend="openvino")
+(PLATE_MODEL_PATH / PLATE_BACKEND in main.py).
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+from ultralytics.data.utils import IMG_FORMATS, check_det_dataset
+
+from src.inference_backend import export_model, load_backend
+
+MODEL_PATH = "models/plate_detector/best.pt"
+DATA = "dataset/data.yaml"
+IMGSZ = 640
+
+
+def list_images(source):
+    """
+    Image files of a dataset split: a directory, a .txt list or a list of either.
+    """
+    if isinstance(source, (list, tuple)):
+        return [image for item in source for image in list_images(item)]
+
+    source = Path(source)
+    if source.suffix == ".txt":
+        return [Path(line.strip()) for line in source.read_text().splitlines() if line.strip()]
+
+    return sorted(p for p in source.rglob("*") if p.suffix.lower().lstrip(".") in IMG_FORMATS)
+
+
+def quantize(model_path, data, imgsz, calib_images):
+    """
+    NNCF INT8 export through ultralytics. The calibration set is the first
+    calib_images of the train split, so the val split stays unseen for
+    the mAP comparison.
+    """
+    train_images = list_images(check_det_dataset(data)["train"])
+    fraction = min(1.0, calib_images / max(1, len(train_images)))
+
+    exported = YOLO(model_path, task="detect").export(
+        format="openvino",
+        int8=True,
+        data=data,
+        split="train",
+        fraction=fraction,
+        imgsz=imgsz,
+        batch=1,
+        dynamic=False,
+        verbose=False,
+    )
+
+    target = Path(model_path).with_name(f"{Path(model_path).stem}_int8_openvino_model")
+    if Path(exported) != target:
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(exported, target)
+
+    return target, min(calib_images, len(train_images))
+
+
+def evaluate(model_path, data, imgsz):
+    metrics = YOLO(str(model_path), task="detect").val(
+        data=data,
+        split="val",
+        imgsz=imgsz,
+        batch=1,
+        device="cpu",
+        plots=False,
+        verbose=False,
+    )
+    return metrics.box.map50, metrics.box.map
+
+
+def latency(model_path, backend, images, imgsz, threads):
+    model = load_backend(model_path, backend=backend, imgsz=imgsz, threads=threads)
+
+    timings = []
+    for image in images:
+        started = time.perf_counter()
+        model(image, imgsz=imgsz)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 90))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="INT8 post-training quantization of the plate detector")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--data", default=DATA)
+    parser.add_argument("--imgsz", type=int, default=IMGSZ)
+    parser.add_argument("--calib-images", type=int, default=300)
+    parser.add_argument("--latency-images", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=None)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    int8_path, calibrated = quantize(args.model, args.data, args.imgsz, args.calib_images)
+    fp32_path = export_model(args.model, "openvino", args.imgsz)
+    print(f"INT8 model: {int8_path} (calibrated on {calibrated} train images)")
+
+    val_images = list_images(check_det_dataset(args.data)["val"])[:args.latency_images]
+    images = [cv2.imread(str(path)) for path in val_images]
+
+    rows = [
+        ("FP32 torch", args.model, "torch"),
+        ("FP32 openvino", fp32_path, "openvino"),
+        ("INT8 openvino", int8_path, "openvino"),
+    ]
+    report = {}
+
+    print(f"{'model':>13} | {'mAP50':>6} | {'mAP50-95':>8} | {'p50 ms':>7} | {'p90 ms':>7}")
+    for name, path, backend in rows:
+        map50, map50_95 = evaluate(path, args.data, args.imgsz)
+        p50, p90 = latency(path, backend, images, args.imgsz, args.threads)
+        report[name] = {"map50": map50, "map50_95": map50_95, "p50_ms": p50, "p90_ms": p90}
+
+        print(f"{name:>13} | {map50:>6.3f} | {map50_95:>8.3f} | {p50:>7.1f} | {p90:>7.1f}")
+
+    fp32, int8 = report["FP32 torch"], report["INT8 openvino"]
+    print(
+        f"INT8 vs FP32: mAP50 {int8['map50'] - fp32['map50']:+.3f}, "
+        f"mAP50-95 {int8['map50_95'] - fp32['map50_95']:+.3f}, "
+        f"p50 latency x{fp32['p50_ms'] / int8['p50_ms']:.2f}"
+    )
+
+    with open(int8_path / "quantization_report.json", "w") as f:
+        json.dump({"calibration_images": calibrated, "imgsz": args.imgsz, "models": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,80 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 
 DATABASE_URL = "sqlite:///./parking.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./parking.db"
+
+# connections kept open per engine / extra connections allowed under bursts
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_TIMEOUT_SEC = 30
+
+# storage profile applied to every new connection: WAL lets readers run
+# while a writer commits, NORMAL sync is durable across app crashes in WAL
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -32000,
+    "temp_store": "MEMORY",
+    "mmap_size": 128 * 1024 * 1024,
+    "busy_timeout": 5000,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas=SQLITE_PRAGMAS):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT_SEC,
 )
 
+event.listen(engine, "connect", lambda conn, _: apply_sqlite_pragmas(conn))
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def setup_async_engine(db_engine):
+    """
+    Pragmas plus explicit transactions for an aiosqlite engine.
+
+    The sqlite driver begins transactions lazily on the first write, so a
+    SAVEPOINT (begin_nested) would open the outer transaction itself and
+    its RELEASE would commit; SQLAlchemy emits BEGIN instead.
+    """
+    @event.listens_for(db_engine.sync_engine, "connect")
+    def _connect(dbapi_connection, _):
+        apply_sqlite_pragmas(dbapi_connection)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(db_engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+# used by the API: handlers await the db instead of holding a threadpool worker
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT_SEC,
+)
+
+setup_async_engine(async_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 @contextmanager
@@ -21,3 +85,10 @@ def get_db():
     finally:
         db.close()
 
+@asynccontextmanager
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
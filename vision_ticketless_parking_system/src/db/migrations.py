@@ -0,0 +1,39 @@
+from sqlalchemy import text
+
+from src.db.database import engine
+from src.db import models
+
+# (schema version, statements), applied in order to databases created by
+# older versions; the current version is kept in PRAGMA user_version
+MIGRATIONS = [
+    (1, [
+        "CREATE INDEX IF NOT EXISTS ix_sessions_status_plate ON sessions (status, plate)",
+    ]),
+]
+
+
+def migrate(conn):
+    """
+    Creates missing tables and applies pending migrations.
+    conn: sync Connection (use AsyncConnection.run_sync from async code)
+    """
+    models.Base.metadata.create_all(conn)
+
+    version = conn.execute(text("PRAGMA user_version")).scalar()
+
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+
+        for statement in statements:
+            conn.execute(text(statement))
+        conn.execute(text(f"PRAGMA user_version = {target}"))
+
+        print(f"[DB] migrated schema to version {target}")
+
+    conn.execute(text("PRAGMA optimize"))
+
+
+def init_db():
+    with engine.begin() as conn:
+        migrate(conn)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float
+from sqlalchemy import Column, String, Float, Index
 from src.db.database import Base
 
 class ParkingSessionDB(Base):
@@ -11,4 +11,9 @@ class ParkingSessionDB(Base):
     payment_time = Column(Float, nullable=True)
     payment_status = Column(String)
     amount_due = Column(Float)
-    status = Column(String, default="ACTIVE")
\ No newline at end of file
+    status = Column(String, default="ACTIVE")
+
+    __table_args__ = (
+        # every hot query filters on status (and plate)
+        Index("ix_sessions_status_plate", "status", "plate"),
+    )
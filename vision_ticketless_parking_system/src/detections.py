@@ -0,0 +1,67 @@
+import numpy as np
+import supervision as sv
+
+
+def result_arrays(boxes):
+    """
+    (xyxy, confidence, class_id) arrays of one image's (N, 6) box array as
+    returned by the inference backends.
+    """
+    # columns: x1 y1 x2 y2 [track id] conf cls
+    return boxes[:, :4], boxes[:, -2], boxes[:, -1].astype(int)
+
+
+def class_name_table(names):
+    """
+    Model class names as an array indexed by class id.
+    """
+    return np.array([names[i] for i in range(len(names))])
+
+
+def class_ids(names, wanted):
+    """
+    Ids of the model classes whose name is in wanted, resolved once so
+    filtering is a single np.isin per frame.
+    """
+    return np.array(sorted(i for i, name in names.items() if name in wanted), dtype=int)
+
+
+def to_detections(boxes, conf_threshold, keep_class_ids=None, class_names=None):
+    xyxy, confidence, class_id = result_arrays(boxes)
+
+    keep = confidence >= conf_threshold
+    if keep_class_ids is not None:
+        keep &= np.isin(class_id, keep_class_ids)
+
+    detections = sv.Detections(
+        xyxy=xyxy[keep].astype(np.float32),
+        confidence=confidence[keep].astype(np.float32),
+        class_id=class_id[keep],
+    )
+    if class_names is not None:
+        detections.data["class_name"] = class_names[detections.class_id]
+
+    return detections
+
+
+def to_dicts(detections, label=None):
+    """
+    The {"bbox", "label", "confidence"} dicts used across the pipeline,
+    built from whole columns. label overrides data["class_name"].
+    """
+    if len(detections) == 0:
+        return []
+
+    if label is None:
+        labels = detections.data["class_name"].tolist()
+    else:
+        labels = [label] * len(detections)
+
+    return [
+        {"bbox": tuple(bbox), "label": name, "confidence": conf}
+        for bbox, name, conf in zip(
+            detections.xyxy.astype(int).tolist(),
+            labels,
+            detections.confidence.tolist(),
+        )
+    ]
@@ -1,26 +1,188 @@
 import math
 import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+DAY_MIN = 24 * 60
+
+
+@dataclass
+class TariffBand:
+    """
+    Price for periods starting between start and end ("HH:MM", local time).
+    An end at or before start wraps past midnight, e.g. "22:00" - "06:00".
+    """
+    start: str
+    end: str
+    price_per_period: float
+
+
+@dataclass
+class Tariff:
+    price_per_period: float = 5.0
+    period_minutes: int = 30
+    bands: list = field(default_factory=list)   # TariffBand, later bands win
+    daily_cap: float = None                     # max charge per 24 h of parking
+    first_period_free: bool = False
+    utc_offset_sec: int = None                  # fixed offset for bands
+    timezone: str = None                        # IANA zone for bands, e.g. "Europe/Berlin"
+                                                # (both None = system local time)
+
+
+def _minute_of_day(hhmm):
+    hours, minutes = hhmm.split(":")
+    return (int(hours) * 60 + int(minutes)) % DAY_MIN
 
 
 class BillingEngine:
-    def __init__(self, price_per_period=5.0, period_minutes=30):
-        self.price_per_period = price_per_period
-        self.period_sec = period_minutes * 60
+    """
+    Fees are charged per started period, at the price of the time-of-day
+    band the period starts in. Each 24 h block from entry is capped at
+    daily_cap.
 
-    def calculate_fee(self, entry_time, current_time):
-        duration_sec = current_time - entry_time
+    The tariff is compiled to lookup tables on construction: for every
+    minute-of-day phase, the prices of one day of periods and their
+    running sums. A fee is then a handful of table reads regardless of
+    the stay length, which calculate_fees() does for whole arrays.
 
-        periods = duration_sec / self.period_sec
+    Bands are matched in local time at the start of the charged stay: the
+    UTC offset is looked up per fee, so a DST change is picked up without
+    a restart. A stay running across the change keeps its starting offset.
+    """
+    def __init__(self, price_per_period=5.0, period_minutes=30, tariff=None):
+        if tariff is None:
+            tariff = Tariff(price_per_period=price_per_period, period_minutes=period_minutes)
 
-        billed_periods = max(1, math.ceil(periods))
+        if DAY_MIN % tariff.period_minutes:
+            raise ValueError(f"period_minutes must divide a day, got {tariff.period_minutes}")
 
-        return billed_periods * self.price_per_period
-    
-    def calculate_additional_fee(self, payment_time, current_time):
-        duration_sec = current_time - payment_time
+        self.tariff = tariff
+        self.price_per_period = tariff.price_per_period
+        self.period_sec = tariff.period_minutes * 60
+
+        self.utc_offset_sec = tariff.utc_offset_sec
+        self.timezone = ZoneInfo(tariff.timezone) if tariff.timezone else None
+
+        self.daily_cap = math.inf if tariff.daily_cap is None else tariff.daily_cap
+
+        self._compile()
+
+    def _compile(self):
+        period_min = self.tariff.period_minutes
+        periods_per_day = DAY_MIN // period_min
+
+        by_minute = np.full(DAY_MIN, self.tariff.price_per_period, dtype=np.float64)
+        for band in self.tariff.bands:
+            start = _minute_of_day(band.start)
+            end = _minute_of_day(band.end)
+            if start < end:
+                by_minute[start:end] = band.price_per_period
+            else:
+                by_minute[start:] = band.price_per_period
+                by_minute[:end] = band.price_per_period
+
+        # prices[phase, j]: period j of the day for stays entering at a
+        # minute with minute % period_min == phase
+        prices = by_minute.reshape(periods_per_day, period_min).T.copy()
+
+        # running sums over two days so a partial day never wraps
+        cum = np.zeros((period_min, 2 * periods_per_day + 1), dtype=np.float64)
+        np.cumsum(np.tile(prices, 2), axis=1, out=cum[:, 1:])
+
+        self.periods_per_day = periods_per_day
+        self._prices = prices
+        self._cum = cum
+        self._day_total = cum[:, periods_per_day].copy()
+
+        # plain lists for the scalar path, numpy indexing one value is slow
+        self._prices_list = prices.tolist()
+        self._cum_list = cum.tolist()
+        self._day_total_list = self._day_total.tolist()
 
-        periods = duration_sec / self.period_sec
+    def _utc_offset(self, timestamp):
+        if self.utc_offset_sec is not None:
+            return self.utc_offset_sec
+        if self.timezone is not None:
+            return int(datetime.fromtimestamp(timestamp, self.timezone).utcoffset().total_seconds())
+        return time.localtime(timestamp).tm_gmtoff
 
-        billed_periods = max(1, math.ceil(periods))
+    def _utc_offsets(self, timestamps):
+        if self.utc_offset_sec is not None:
+            return self.utc_offset_sec
+
+        # zone transitions fall on quarter hours (UTC), so one lookup per
+        # distinct quarter hour covers every timestamp in it
+        quarters, inverse = np.unique(np.floor(timestamps / 900), return_inverse=True)
+        offsets = np.array([self._utc_offset(q * 900) for q in quarters], dtype=np.float64)
+        return offsets[inverse].reshape(timestamps.shape)
+
+    def _fee(self, start_time, current_time, first_period_free):
+        periods = max(1, math.ceil((current_time - start_time) / self.period_sec))
+
+        minute = math.floor((start_time + self._utc_offset(start_time)) / 60) % DAY_MIN
+        first, phase = divmod(minute, self.tariff.period_minutes)
+
+        cum = self._cum_list[phase]
+        day_total = self._day_total_list[phase]
+        cap = self.daily_cap
+
+        days, rest = divmod(periods, self.periods_per_day)
+        partial = cum[first + rest] - cum[first]
+
+        if not first_period_free:
+            fee = days * min(cap, day_total) + min(cap, partial)
+        elif days == 0:
+            fee = min(cap, partial - self._prices_list[phase][first])
+        else:
+            fee = (
+                min(cap, day_total - self._prices_list[phase][first])
+                + (days - 1) * min(cap, day_total)
+                + min(cap, partial)
+            )
+
+        return float(np.round(fee, 2))
+
+    def _fees(self, start_times, current_time, first_period_free):
+        start_times = np.asarray(start_times, dtype=np.float64)
+        current_time = np.asarray(current_time, dtype=np.float64)
+
+        periods = np.maximum(1, np.ceil((current_time - start_times) / self.period_sec)).astype(np.int64)
+
+        minute = np.floor((start_times + self._utc_offsets(start_times)) / 60).astype(np.int64) % DAY_MIN
+        first, phase = np.divmod(minute, self.tariff.period_minutes)
+
+        day_total = self._day_total[phase]
+        cap = self.daily_cap
+
+        days, rest = np.divmod(periods, self.periods_per_day)
+        partial = self._cum[phase, first + rest] - self._cum[phase, first]
+        capped_day = np.minimum(cap, day_total)
+
+        if not first_period_free:
+            fees = days * capped_day + np.minimum(cap, partial)
+        else:
+            free = self._prices[phase, first]
+            fees = np.where(
+                days == 0,
+                np.minimum(cap, partial - free),
+                np.minimum(cap, day_total - free) + (days - 1) * capped_day + np.minimum(cap, partial),
+            )
+
+        return np.round(fees, 2)
+
+    def calculate_fee(self, entry_time, current_time):
+        return self._fee(entry_time, current_time, self.tariff.first_period_free)
+
+    def calculate_additional_fee(self, payment_time, current_time):
+        # charged again from the payment, the free period was already used
+        return self._fee(payment_time, current_time, False)
 
-        return billed_periods * self.price_per_period
+    def calculate_fees(self, entry_times, now):
+        """
+        Vectorized calculate_fee: entry_times is an array, now a timestamp
+        or an array of the same shape. Returns a float64 array.
+        """
+        return self._fees(entry_times, now, self.tariff.first_period_free)
@@ -0,0 +1,206 @@
+import math
+import threading
+from difflib import SequenceMatcher
+from itertools import combinations
+
+
+def _deletion_variants(text, max_deletions):
+    variants = {text}
+    n = len(text)
+
+    for d in range(1, min(max_deletions, n) + 1):
+        for removed in combinations(range(n), d):
+            removed = set(removed)
+            variants.add("".join(ch for i, ch in enumerate(text) if i not in removed))
+
+    return variants
+
+
+def _grams(text, q):
+    return {text[i:i + q] for i in range(len(text) - q + 1)}
+
+
+# posting lists hold a bare string while only one plate maps to a key
+# (the common case for deletion variants) and a set once it is shared
+
+def _posting_add(index, key, norm):
+    posting = index.get(key)
+    if posting is None:
+        index[key] = norm
+    elif isinstance(posting, set):
+        posting.add(norm)
+    elif posting != norm:
+        index[key] = {posting, norm}
+
+
+def _posting_discard(index, key, norm):
+    posting = index.get(key)
+    if posting is None:
+        return
+    if isinstance(posting, set):
+        posting.discard(norm)
+        if len(posting) == 1:
+            index[key] = posting.pop()
+    elif posting == norm:
+        del index[key]
+
+
+def _posting_get(index, key):
+    posting = index.get(key)
+    if posting is None:
+        return ()
+    if isinstance(posting, set):
+        return posting
+    return (posting,)
+
+
+class PlateIndex:
+    """
+    In-memory fuzzy index over normalized active plates.
+
+    Returns the same match as scanning every active plate with
+    SequenceMatcher ratio (boosted to 0.95 on substring containment):
+
+    - ratio >= t implies LCS >= t * (la + lb) / 2, i.e. an indel distance
+      of at most (1 - t) * (la + lb). Every such plate shares a deletion
+      variant with the query, so a deletion-neighbourhood index yields all
+      fuzzy candidates (queries needing more deletions than indexed fall
+      back to scoring every indexed plate).
+    - plates containing the query are found through a 3-gram index,
+      plates contained in the query by looking up the query's substrings.
+
+    Only the candidates are scored exactly. Ties keep the scan order
+    (earliest indexed session first).
+    """
+    GRAM = 3
+
+    def __init__(self, normalize, max_deletions=2):
+        self.normalize = normalize
+        self.max_deletions = max_deletions
+
+        self._lock = threading.Lock()
+        self._seq = 0
+
+        self._sessions = {}
+        self._by_norm = {}
+        self._variants = {}
+        self._grams = {}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._by_norm.clear()
+            self._variants.clear()
+            self._grams.clear()
+
+    def add(self, session_id, plate):
+        norm = self.normalize(plate)
+
+        with self._lock:
+            if session_id in self._sessions:
+                return
+
+            self._seq += 1
+            self._sessions[session_id] = norm
+
+            entries = self._by_norm.get(norm)
+            if entries is None:
+                entries = self._by_norm[norm] = {}
+
+                for variant in _deletion_variants(norm, self.max_deletions):
+                    _posting_add(self._variants, variant, norm)
+                for gram in _grams(norm, self.GRAM):
+                    _posting_add(self._grams, gram, norm)
+
+            entries[session_id] = (self._seq, plate)
+
+    def remove(self, session_id):
+        with self._lock:
+            norm = self._sessions.pop(session_id, None)
+            if norm is None:
+                return
+
+            entries = self._by_norm[norm]
+            del entries[session_id]
+
+            if entries:
+                return
+
+            del self._by_norm[norm]
+
+            for variant in _deletion_variants(norm, self.max_deletions):
+                _posting_discard(self._variants, variant, norm)
+            for gram in _grams(norm, self.GRAM):
+                _posting_discard(self._grams, gram, norm)
+
+    def _max_distance(self, length, threshold):
+        if threshold <= 0:
+            return None
+        longest = math.floor(length * (2 - threshold) / threshold + 1e-9)
+        return math.floor((1 - threshold) * (length + longest) + 1e-9)
+
+    def _candidates(self, norm_input, threshold):
+        if not norm_input:
+            return set(self._by_norm)
+
+        k = self._max_distance(len(norm_input), threshold)
+        if k is None or k > self.max_deletions:
+            return set(self._by_norm)
+
+        candidates = set()
+        la = len(norm_input)
+
+        for variant in _deletion_variants(norm_input, k):
+            lv = len(variant)
+            for norm in _posting_get(self._variants, variant):
+                if (la - lv) + (len(norm) - lv) <= k:
+                    candidates.add(norm)
+
+        if la >= self.GRAM:
+            postings = sorted(
+                (_posting_get(self._grams, gram) for gram in _grams(norm_input, self.GRAM)),
+                key=len,
+            )
+            containing = set(postings[0])
+            for posting in postings[1:]:
+                containing.intersection_update(posting)
+            candidates |= {norm for norm in containing if norm_input in norm}
+        else:
+            candidates |= {norm for norm in self._by_norm if norm_input in norm}
+
+        for i in range(la):
+            for j in range(i + 1, la + 1):
+                sub = norm_input[i:j]
+                if sub in self._by_norm:
+                    candidates.add(sub)
+
+        return candidates
+
+    def find(self, plate, threshold=0.9):
+        norm_input = self.normalize(plate)
+
+        with self._lock:
+            best_key = None
+            best_plate = None
+            best_score = 0.0
+
+            for norm in self._candidates(norm_input, threshold):
+                score = SequenceMatcher(None, norm_input, norm).ratio()
+
+                if norm_input in norm or norm in norm_input:
+                    score = max(score, 0.95)
+
+                seq, existing_plate = min(self._by_norm[norm].values())
+                key = (-score, seq)
+
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_score = score
+                    best_plate = existing_plate
+
+        if best_score >= threshold:
+            return best_plate
+        return None
@@ -0,0 +1,69 @@
+from src.parking_session.plate_index import PlateIndex
+
+
+class ActiveSessionCache:
+    """
+    In-process copy of the ACTIVE sessions, keyed by normalized plate.
+
+    SessionManager serves every lookup from here and writes changes through
+    to the db, so the event hot path does not read the sessions table. The
+    fuzzy PlateIndex is kept in sync with the cached records.
+
+    Assumes the API process is the only writer of the sessions table.
+    """
+    def __init__(self, normalize):
+        self.normalize = normalize
+        self.index = PlateIndex(normalize)
+
+        self._sessions = {}
+        self._by_norm = {}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def clear(self):
+        self._sessions.clear()
+        self._by_norm.clear()
+        self.index.clear()
+
+    def add(self, session):
+        if session.session_id in self._sessions:
+            return
+
+        self._sessions[session.session_id] = session
+        self._by_norm.setdefault(self.normalize(session.plate), []).append(session)
+        self.index.add(session.session_id, session.plate)
+
+    def remove(self, session_id):
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+
+        norm = self.normalize(session.plate)
+        entries = self._by_norm[norm]
+        entries.remove(session)
+        if not entries:
+            del self._by_norm[norm]
+
+        self.index.remove(session_id)
+
+    def get(self, plate):
+        """
+        Earliest active session with exactly this plate text.
+        """
+        for session in self._by_norm.get(self.normalize(plate), ()):
+            if session.plate == plate:
+                return session
+        return None
+
+    def match(self, plate, threshold=0.9):
+        matched = self.index.find(plate, threshold)
+        if matched is None:
+            return None
+        return self.get(matched)
+
+    def sessions(self):
+        return list(self._sessions.values())
+
+    def plates(self):
+        return [session.plate for session in self._sessions.values()]
@@ -1,13 +1,18 @@
+import asyncio
 import uuid
 import time
 from dataclasses import dataclass
 from difflib import SequenceMatcher
+import numpy as np
+from sqlalchemy import select, insert, update, exists, literal, or_
+from sqlalchemy.exc import OperationalError
 from src.parking_session.billing_engine import BillingEngine
-from src.db.database import SessionLocal, get_db
+from src.parking_session.session_cache import ActiveSessionCache
+from src.db.database import get_async_db
 from src.db.models import ParkingSessionDB
 
 
-@dataclass
+@dataclass(slots=True)
 class ParkingSession:
     session_id: str
     plate: str
@@ -16,14 +21,32 @@ class ParkingSession:
     payment_status: str = "unpaid"
     exit_time: float = None
     amount_due: float = 0.0
+    payment_time: float = None
+
+
+class StaleSession(Exception):
+    """
+    A guarded write matched no ACTIVE row, i.e. the cached session was
+    changed or ended by a concurrent writer.
+    """
+    def __init__(self, session_id=None, plate=None):
+        super().__init__(session_id or plate)
+        self.session_id = session_id
+        self.plate = plate
 
 
 class SessionManager:
-    def __init__(self):
-        self.billing = BillingEngine()
+    def __init__(self, tariff=None):
+        self.billing = BillingEngine(tariff=tariff)
         self.grace_period_sec = 60
         self.entry_cooldown_sec = 10
 
+        # ACTIVE sessions held in memory (with their fuzzy plate index):
+        # loaded from the db on startup, changes are written through
+        self.active = ActiveSessionCache(self._normalize)
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
     def _normalize(self, plate):
         if not plate:
             return plate
@@ -36,31 +59,180 @@ class SessionManager:
     def _similarity(self, a, b):
         return SequenceMatcher(None, a, b).ratio()
     
-    def _find_matching_plate(self, plate, threshold=0.9):
-        best_match = None
-        best_score = 0.0
+    @staticmethod
+    def _record(row):
+        return ParkingSession(
+            session_id=row.session_id,
+            plate=row.plate,
+            entry_time=row.entry_time,
+            state=row.status,
+            payment_status=row.payment_status,
+            exit_time=row.exit_time,
+            amount_due=row.amount_due,
+            payment_time=row.payment_time,
+        )
 
-        with get_db() as db:
-            sessions = db.query(ParkingSessionDB).filter_by(status="ACTIVE").all()
+    async def load(self):
+        async with self._load_lock:
+            async with get_async_db() as db:
+                result = await db.execute(select(ParkingSessionDB).filter_by(status="ACTIVE"))
 
-            for s in sessions:
-                norm_input = self._normalize(plate)
-                norm_existing = self._normalize(s.plate)
+                self.active.clear()
+                for s in result.scalars():
+                    self.active.add(self._record(s))
 
-                score = self._similarity(norm_input, norm_existing)
+            self._loaded = True
 
-                if norm_input in norm_existing or norm_existing in norm_input:
-                    score = max(score, 0.95)
-            
-                if score > best_score:
-                    best_score = score
-                    best_match = s.plate
+    async def _refresh(self, db, stale):
+        """
+        Replaces the cached records involved in a conflict with the db rows.
+        """
+        if stale.session_id is not None:
+            query = select(ParkingSessionDB).filter_by(session_id=stale.session_id)
+            self.active.remove(stale.session_id)
+        else:
+            query = select(ParkingSessionDB).filter_by(plate=stale.plate, status="ACTIVE")
+
+        for row in (await db.execute(query)).scalars():
+            self.active.remove(row.session_id)
+            if row.status == "ACTIVE":
+                self.active.add(self._record(row))
+
+    async def _find_matching_session(self, plate, threshold=0.9):
+        if not self._loaded:
+            await self.load()
+
+        return self.active.match(plate, threshold)
+
+    async def get_active_session(self, plate):
+        if not self._loaded:
+            await self.load()
+
+        return self.active.get(plate)
+
+    async def active_plates(self):
+        if not self._loaded:
+            await self.load()
+
+        return self.active.plates()
+
+    def quote_fees(self, sessions, now):
+        """
+        Amount due for each session at `now`: the amount set by a blocked
+        exit if any, otherwise the fee so far. One vectorized billing call.
+        """
+        entry_times = np.fromiter((s.entry_time for s in sessions), np.float64, len(sessions))
+        amounts = np.fromiter((s.amount_due for s in sessions), np.float64, len(sessions))
+
+        fees = self.billing.calculate_fees(entry_times, now)
+        return np.where(amounts > 0, amounts, fees).tolist()
+
+    async def active_fees(self, now):
+        if not self._loaded:
+            await self.load()
+
+        sessions = self.active.sessions()
+        fees = self.quote_fees(sessions, now)
+
+        return [
+            {"plate": session.plate, "amount_due": fee}
+            for session, fee in zip(sessions, fees)
+        ]
 
-        if best_score >= threshold:
-            return best_match
-        return None
+    async def _guarded_update(self, db, session, *conditions, **values):
+        """
+        UPDATE ... WHERE session_id = ? AND status = 'ACTIVE' AND <conditions>
+        RETURNING session_id. Raises StaleSession when no row matched.
+        """
+        result = await db.execute(
+            update(ParkingSessionDB)
+            .where(
+                ParkingSessionDB.session_id == session.session_id,
+                ParkingSessionDB.status == "ACTIVE",
+                *conditions,
+            )
+            .values(**values)
+            .returning(ParkingSessionDB.session_id)
+        )
+
+        if result.first() is None:
+            raise StaleSession(session_id=session.session_id)
+
+    async def handle_event(self, event, db=None):
+        """
+        Applies one event. With db given the caller owns the transaction,
+        otherwise the event is committed on its own.
+        """
+        if db is not None:
+            return await self._apply_event(event, db)
+
+        return (await self.handle_events([event]))[0]
+
+    async def handle_events(self, events, isolate_errors=False):
+        """
+        Applies an ordered list of events in one db transaction.
+
+        Each plate is fuzzy-matched once against the in-memory sessions,
+        which already reflect sessions started / ended by earlier events of
+        the same list, so the results equal posting the events one by one.
+
+        With isolate_errors every event runs in its own savepoint: an event
+        that fails is rolled back alone and gets {"error": ...} as result,
+        the others still commit. Database errors such as a locked database
+        still fail the whole list, so the caller can retry it.
+        """
+        results = []
+        failed = False
+
+        async with get_async_db() as db:
+            try:
+                for event in events:
+                    if not isolate_errors:
+                        results.append(await self._apply_event(event, db))
+                        continue
 
-    def handle_event(self, event):
+                    try:
+                        async with db.begin_nested():
+                            results.append(await self._apply_event(event, db))
+                    except OperationalError:
+                        raise
+                    except Exception as e:
+                        print(f"[EVENT ERROR] {event} {e}")
+                        results.append({"error": str(e)})
+                        failed = True
+
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                # drop cache changes of the rolled back events
+                await self.load()
+                raise
+
+        if failed:
+            # a failed event may have changed cached sessions before its
+            # savepoint was rolled back
+            await self.load()
+
+        return results
+
+    async def _apply_event(self, event, db):
+        """
+        Cache state is claimed before each write, so concurrent events
+        inside this process see it at once. A write that loses against
+        another writer refreshes the cache and the event is evaluated again.
+        """
+        try:
+            return await self._dispatch(event, db)
+        except StaleSession as stale:
+            await self._refresh(db, stale)
+
+        try:
+            return await self._dispatch(event, db)
+        except StaleSession as stale:
+            await self._refresh(db, stale)
+            return None
+
+    async def _dispatch(self, event, db):
         plate = event["plate"]
 
         if not plate or len(plate) < 5:
@@ -69,119 +241,164 @@ class SessionManager:
         event_type = event["type"]
 
         if event_type == "vehicle_entered":
-            return self._handle_entry(plate, event["time"])
+            return await self._handle_entry(db, plate, event["time"])
         
         elif event_type == "vehicle_exit_detected":
-            return self._handle_exit(plate, event["time"])
+            return await self._handle_exit(db, plate, event["time"])
         
         elif event_type == "payment_confirmed":
-            return self._handle_payment(plate)
+            return await self._handle_payment(db, plate)
         
-    def _handle_entry(self, plate, timestamp):
-        matched = self._find_matching_plate(plate)
-        if matched:
-            with get_db() as db:
-                session = db.query(ParkingSessionDB).filter_by(plate=matched, status="ACTIVE").first()
-
-                if session:
-                    if timestamp - session.entry_time < self.entry_cooldown_sec:
-                        return None
+    async def _handle_entry(self, db, plate, timestamp):
+        session = await self._find_matching_session(plate)
+
+        if session:
+            if timestamp - session.entry_time < self.entry_cooldown_sec:
+                return None
                     
-        session_id = str(uuid.uuid4())
+        session = ParkingSession(
+            session_id=str(uuid.uuid4()),
+            plate=plate,
+            entry_time=timestamp,
+            state="ACTIVE",
+        )
+        self.active.add(session)
 
-        with get_db() as db:
+        sessions = ParkingSessionDB.__table__
+        recent_entry = exists().where(
+            sessions.c.plate == plate,
+            sessions.c.status == "ACTIVE",
+            sessions.c.entry_time > timestamp - self.entry_cooldown_sec,
+        )
 
-            db_session = ParkingSessionDB(
-                session_id = session_id,
-                plate = plate,
-                entry_time = timestamp,
-                payment_status = "unpaid",
-                amount_due = 0.0,
-                status = "ACTIVE",
+        result = await db.execute(
+            insert(sessions)
+            .from_select(
+                ["session_id", "plate", "entry_time", "payment_status", "amount_due", "status"],
+                select(
+                    literal(session.session_id),
+                    literal(plate),
+                    literal(timestamp),
+                    literal("unpaid"),
+                    literal(0.0),
+                    literal("ACTIVE"),
+                ).where(~recent_entry),
             )
-            db.add(db_session)
-            db.commit()
+            .returning(sessions.c.session_id)
+        )
+
+        if result.first() is None:
+            self.active.remove(session.session_id)
+            raise StaleSession(plate=plate)
 
         return {
             "type": "session_started",
             "plate": plate,
-            "session_id": session_id,
+            "session_id": session.session_id,
         }
     
-    def _handle_payment(self, plate):
-        matched_plate = self._find_matching_plate(plate) or plate
+    async def _handle_payment(self, db, plate):
+        session = await self._find_matching_session(plate)
 
-        if matched_plate:
-            plate = matched_plate
-
-        with get_db() as db:
-            session = (db.query(ParkingSessionDB).filter_by(plate=plate, status="ACTIVE").first())
+        if not session:
+            return None
 
-            if not session:
-                return None
-            
-            if session.payment_status == "paid":
-                if time.time() - session.payment_time <= self.grace_period_sec:
-                    return {
-                        "type": "payment_ignored",
-                        "plate": plate,
-                        "reason": "already_paid",
-                    }
+        plate = session.plate
             
-            session.payment_status = "paid"
-            session.payment_time = time.time()
-            session.amount_due = 0.0
+        if session.payment_status == "paid":
+            if time.time() - session.payment_time <= self.grace_period_sec:
+                return {
+                    "type": "payment_ignored",
+                    "plate": plate,
+                    "reason": "already_paid",
+                }
+
+        payment_time = time.time()
 
-            db.commit()
+        session.payment_status = "paid"
+        session.payment_time = payment_time
+        session.amount_due = 0.0
+
+        await self._guarded_update(
+            db,
+            session,
+            or_(
+                ParkingSessionDB.payment_status != "paid",
+                ParkingSessionDB.payment_time < payment_time - self.grace_period_sec,
+            ),
+            payment_status="paid",
+            payment_time=payment_time,
+            amount_due=0.0,
+        )
 
         return {
             "type": "payment_confirmed",
             "plate": plate,
         }
     
-    def _handle_exit(self, plate, timestamp):
-        plate = self._find_matching_plate(plate) or plate
-        
-        with get_db() as db:
-            session = (db.query(ParkingSessionDB).filter_by(plate=plate, status="ACTIVE").first())
+    async def _handle_exit(self, db, plate, timestamp):
+        session = await self._find_matching_session(plate)
 
-            if not session:
-                return None
+        if not session:
+            return None
+
+        plate = session.plate
             
-            if session.payment_status != "paid":
-                fee = self.billing.calculate_fee(session.entry_time, timestamp)
-                session.amount_due = fee
-                db.commit()
+        if session.payment_status != "paid":
+            fee = self.billing.calculate_fee(session.entry_time, timestamp)
+            session.amount_due = fee
 
-                return {
-                    "type": "exit_blocked",
-                    "plate": plate,
-                    "amount_due": fee,
-                }
+            await self._guarded_update(
+                db,
+                session,
+                ParkingSessionDB.payment_status != "paid",
+                amount_due=fee,
+            )
+
+            return {
+                "type": "exit_blocked",
+                "plate": plate,
+                "amount_due": fee,
+            }
         
-            if session.payment_time and timestamp - session.payment_time > self.grace_period_sec:
-                additional_fee = self.billing.calculate_additional_fee(
-                    session.payment_time,
-                    timestamp,
-                )
-                session.payment_status = "unpaid"
-                session.amount_due = additional_fee
-                db.commit()
+        if session.payment_time and timestamp - session.payment_time > self.grace_period_sec:
+            additional_fee = self.billing.calculate_additional_fee(
+                session.payment_time,
+                timestamp,
+            )
+            payment_time = session.payment_time
 
-                return {
-                    "type": "exit_blocked",
-                    "plate": plate,
-                    "reason": "grace_expired",
-                    "amount_due": additional_fee,
-                }
-            session_id = session.session_id,
-            session.exit_time = timestamp
-            session.status = "ENDED"
-            db.commit()
+            session.payment_status = "unpaid"
+            session.amount_due = additional_fee
+
+            await self._guarded_update(
+                db,
+                session,
+                ParkingSessionDB.payment_status == "paid",
+                ParkingSessionDB.payment_time == payment_time,
+                payment_status="unpaid",
+                amount_due=additional_fee,
+            )
+
+            return {
+                "type": "exit_blocked",
+                "plate": plate,
+                "reason": "grace_expired",
+                "amount_due": additional_fee,
+            }
+
+        self.active.remove(session.session_id)
+
+        await self._guarded_update(
+            db,
+            session,
+            ParkingSessionDB.payment_status == "paid",
+            exit_time=timestamp,
+            status="ENDED",
+        )
 
         return {
             "type": "session_ended",
             "plate": plate,
-            "session_id": session_id,
+            "session_id": session.session_id,
         }
-            
\ No newline at end of file
@@ -0,0 +1,256 @@
+import heapq
+import queue
+import threading
+import time
+
+
+class CameraLane:
+    """
+    One camera and the FrameProcessor serving it.
+
+    processors maps modes to processors for a camera that is switched
+    between entry and exit (set_mode); by default the lane has one mode.
+    """
+    def __init__(self, name, mode, stream, processor, target_fps=15, processors=None, max_live_grabs=4):
+        self.name = name
+        self.mode = mode
+        self.stream = stream
+        self.processor = processor
+        self.processors = processors or {mode: processor}
+        self.target_fps = target_fps
+        self.frame_interval = 1.0 / target_fps
+        # a live unthreaded source blocks in grab() once its driver buffer
+        # is empty, so only that many frames are flushed when behind
+        self.max_live_grabs = max_live_grabs
+
+        self.next_due = time.time()
+        self.active = True
+
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.processing_time = 0.0
+        self.started_at = None
+
+    @property
+    def switchable(self):
+        return len(self.processors) > 1
+
+    def set_mode(self, mode):
+        if mode not in self.processors:
+            raise ValueError(f"Unknown lane mode: {mode}")
+
+        self.processor = self.processors[mode]
+        self.mode = mode
+
+    def _skip(self, missed):
+        if not (getattr(self.stream, "threaded", False) or getattr(self.stream, "is_file", False)):
+            missed = min(missed, self.max_live_grabs)
+
+        for _ in range(missed):
+            if not self.stream.grab():
+                break
+
+    def run_once(self):
+        """
+        Waits for the lane's next frame slot and processes it.
+
+        Returns (frame, vehicles, plates, events) or None when the source
+        is exhausted.
+        """
+        due = self.next_due
+
+        now = time.time()
+        if due > now:
+            time.sleep(due - now)
+            now = time.time()
+
+        missed = int((now - due) / self.frame_interval)
+        if missed > 0:
+            self._skip(missed)
+            self.frames_dropped += missed
+
+        ret, frame = self.stream.read()
+
+        if not ret:
+            self.active = False
+            print(f"[SUPERVISOR] {self.name} source finished")
+            return None
+
+        if self.started_at is None:
+            self.started_at = now
+
+        t0 = time.time()
+        vehicles, plates, events = self.processor.process(frame)
+        self.processing_time += time.time() - t0
+        self.frames_processed += 1
+
+        self.next_due = due + (missed + 1) * self.frame_interval
+
+        return frame, vehicles, plates, events
+
+    def stats(self):
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        fps = self.frames_processed / elapsed if elapsed > 0 else 0.0
+        avg_ms = (
+            self.processing_time / self.frames_processed * 1000
+            if self.frames_processed > 0 else 0.0
+        )
+
+        stats = {
+            "camera": self.name,
+            "mode": self.mode,
+            "target_fps": self.target_fps,
+            "fps": fps,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+            "avg_process_ms": avg_ms,
+            "active": self.active,
+        }
+
+        round_trips = getattr(self.processor, "redis_round_trips", None)
+        if round_trips is not None:
+            stats["redis_round_trips_per_frame"] = (
+                round_trips / self.frames_processed if self.frames_processed else 0.0
+            )
+
+        motion_gate = getattr(self.processor, "motion_gate", None)
+        if motion_gate is not None:
+            stats["skipped_fraction"] = motion_gate.skipped_fraction
+
+        if getattr(self.stream, "threaded", False):
+            stream_stats = self.stream.stats()
+            stats["stream_dropped"] = stream_stats["dropped"]
+            stats["stream_stale"] = stream_stats["stale"]
+
+        return stats
+
+
+class CameraSupervisor:
+    """
+    Runs several camera lanes in one process.
+
+    Every lane owns its VideoStream and FrameProcessor (with its own
+    tracker, stabilizer and registry), while the detectors passed to the
+    processors are shared. Lanes are served earliest-deadline-first so each
+    one is polled at its target FPS; when a lane falls behind, the missed
+    frame slots are skipped and counted as dropped instead of queueing up.
+
+    threaded=True runs every lane on its own thread instead, so requests
+    from several lanes can meet in a shared InferenceServer and be batched.
+    step() keeps the same contract and is meant to be called from the main
+    thread (display, event delivery).
+    """
+    def __init__(self, lanes=None, threaded=False, result_queue_size=8):
+        self.lanes = []
+        self.threaded = threaded
+        self._schedule = []
+        self._counter = 0
+
+        self._results = queue.Queue(maxsize=result_queue_size)
+        self._threads = []
+        self._lanes_running = 0
+        self._stopping = False
+
+        for lane in lanes or []:
+            self.add_lane(lane)
+
+    def add_lane(self, lane):
+        lane.next_due = time.time()
+        self.lanes.append(lane)
+
+        if self.threaded:
+            thread = threading.Thread(target=self._lane_loop, args=(lane,), daemon=True)
+            self._threads.append(thread)
+            self._lanes_running += 1
+            thread.start()
+        else:
+            self._push(lane)
+
+    def _push(self, lane):
+        heapq.heappush(self._schedule, (lane.next_due, self._counter, lane))
+        self._counter += 1
+
+    def _put(self, item):
+        while not self._stopping:
+            try:
+                self._results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _lane_loop(self, lane):
+        try:
+            while not self._stopping:
+                result = lane.run_once()
+                if result is None:
+                    break
+
+                frame, vehicles, plates, events = result
+                if getattr(lane.stream, "threaded", False):
+                    # ring slots are recycled on the lane's next read
+                    frame = frame.copy()
+
+                self._put((lane, frame, vehicles, plates, events))
+        finally:
+            self._put(None)
+
+    def step(self):
+        """
+        Processes the next due frame.
+
+        Returns (lane, frame, vehicles, plates, events) or None when every
+        lane's source is exhausted.
+        """
+        if self.threaded:
+            while self._lanes_running > 0:
+                result = self._results.get()
+                if result is None:
+                    self._lanes_running -= 1
+                    continue
+                return result
+            return None
+
+        while self._schedule:
+            _, _, lane = heapq.heappop(self._schedule)
+
+            result = lane.run_once()
+            if result is None:
+                continue
+
+            self._push(lane)
+
+            return (lane,) + result
+
+        return None
+
+    def stats(self):
+        return [lane.stats() for lane in self.lanes]
+
+    def print_stats(self):
+        for s in self.stats():
+            line = (
+                f"[CAMERA] {s['camera']} ({s['mode']}) "
+                f"fps={s['fps']:.1f}/{s['target_fps']} "
+                f"processed={s['frames_processed']} "
+                f"dropped={s['frames_dropped']} "
+                f"avg={s['avg_process_ms']:.1f}ms"
+            )
+
+            if "redis_round_trips_per_frame" in s:
+                line += f" redis_rt/frame={s['redis_round_trips_per_frame']:.2f}"
+
+            if "skipped_fraction" in s:
+                line += f" detection_skipped={s['skipped_fraction']:.0%}"
+
+            if "stream_dropped" in s:
+                line += f" stream_dropped={s['stream_dropped']} stream_stale={s['stream_stale']}"
+
+            print(line)
+
+    def release(self):
+        self._stopping = True
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+        for lane in self.lanes:
+            lane.stream.release()
@@ -0,0 +1,440 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class EventDispatcher:
+    """
+    Delivers parking events to the API from a background thread so the
+    frame loop never waits on HTTP.
+
+    - submit() only puts the event on a bounded in-memory outbox; it never
+      touches the disk, an event that finds the outbox full is dropped
+    - the sender collects events arriving within linger_ms into one batch
+      and posts them over a pooled keep-alive session (one request per
+      event, or a single request per batch when batch_url is set)
+    - 5xx responses are retried with exponential backoff up to max_attempts,
+      4xx responses are dropped; a batch still failing with 5xx is spilled
+      and replayed later like an unreachable API
+    - events at the front of the spill that get a 5xx on max_replays
+      consecutive replays are moved to a dead-letter file (JSON lines), so
+      one event the API always fails on does not hold back the rest; a
+      failing batch is first replayed event by event, so only the failing
+      events are moved
+    - while the API is unreachable (or the outbox fills past
+      spill_watermark) the sender moves events to an on-disk spill file
+      (JSON lines) and replays them in order once the API answers again; a
+      spill left behind by a previous run is replayed on start
+    - the spill file is only read and written by the sender thread; events
+      in the outbox are always newer than the spill file, so the sender
+      appends them before replaying
+
+    Delivery is at-least-once: a crash during replay can resend events.
+    """
+    def __init__(self,
+                 url,
+                 batch_url=None,
+                 spill_path="logs/event_spill.jsonl",
+                 dead_letter_path="logs/event_dead_letter.jsonl",
+                 max_outbox=1000,
+                 max_batch_size=32,
+                 linger_ms=20.0,
+                 timeout=2.0,
+                 max_attempts=5,
+                 max_replays=8,
+                 backoff_base_sec=0.5,
+                 backoff_max_sec=30.0,
+                 pool_size=4,
+                 verbose=True):
+        self.url = url
+        self.batch_url = batch_url
+        self.spill_path = spill_path
+        self.dead_letter_path = dead_letter_path
+        self.max_batch_size = max_batch_size
+        self.linger_sec = linger_ms / 1000.0
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.max_replays = max_replays
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.verbose = verbose
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._outbox = queue.Queue(maxsize=max_outbox)
+        # outbox size at which the sender starts spilling, so a slow API
+        # does not make submit() drop events
+        self.spill_watermark = max(1, max_outbox // 2)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+        for path in (spill_path, dead_letter_path):
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._spill_offset = 0
+        self._spill_pending = self._count_spilled()
+        self._spilling = self._spill_pending > 0
+        # spill offset whose front chunk keeps failing with 5xx, and how often
+        self._stuck_offset = None
+        self._stuck_replays = 0
+        # spill events before this offset are replayed one per request
+        self._single_until = 0
+
+        self.counters = Counter()
+        self.latency_ms = deque(maxlen=1000)
+        self.api_up = True
+        self._backoff = 0.0
+
+        self._running = True
+        self._stop_deadline = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # -- frame loop side --
+
+    def submit(self, event):
+        item = {"event": event, "queued_at": time.time()}
+
+        with self._lock:
+            self.counters["submitted"] += 1
+
+        try:
+            self._outbox.put_nowait(item)
+        except queue.Full:
+            # the sender is stuck in a long retry; no disk I/O on this thread
+            with self._lock:
+                self.counters["overflow"] += 1
+
+    # -- spill file (sender thread) --
+
+    def _count_spilled(self):
+        if not os.path.exists(self.spill_path):
+            return 0
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _write_spill(self, items, path=None):
+        with open(path or self.spill_path, "a", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item) + "\n")
+
+    def _spill(self, items=()):
+        """
+        Appends undelivered items and everything in the outbox to the spill
+        file. Only called when the items are older than the outbox (live
+        batches are only sent while nothing is spilled), so replay keeps
+        the original event order.
+        """
+        items = list(items)
+        while True:
+            try:
+                items.append(self._outbox.get_nowait())
+            except queue.Empty:
+                break
+
+        if not items:
+            return
+
+        self._write_spill(items)
+
+        with self._lock:
+            self._spill_pending += len(items)
+            self.counters["spilled"] += len(items)
+            self._spilling = True
+
+    def _read_spill(self):
+        items, offsets = [], []
+
+        if not os.path.exists(self.spill_path):
+            return items, offsets
+
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            f.seek(self._spill_offset)
+
+            while len(items) < self.max_batch_size:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    items.append(json.loads(line))
+                    offsets.append(f.tell())
+
+            if not items:
+                offsets.append(f.tell())
+
+        return items, offsets
+
+    def _commit_spill(self, offset, count):
+        done = not os.path.exists(self.spill_path) or offset >= os.path.getsize(self.spill_path)
+        if done and os.path.exists(self.spill_path):
+            # fully replayed; new events go back to live batches
+            os.remove(self.spill_path)
+
+        with self._lock:
+            self._spill_offset = offset
+            self._spill_pending = max(0, self._spill_pending - count)
+
+            if done:
+                self._single_until = 0
+                self._spill_offset = 0
+                self._spill_pending = 0
+                self._spilling = False
+
+    # -- sender thread --
+
+    def _collect(self):
+        try:
+            first = self._outbox.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.time() + self.linger_sec
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            try:
+                if remaining > 0:
+                    item = self._outbox.get(timeout=remaining)
+                else:
+                    item = self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+
+        return batch
+
+    def _post(self, url, payload):
+        """
+        Returns the response, retrying 5xx with backoff.
+        Raises requests.RequestException when the API is unreachable.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+
+            if response.status_code < 500 or attempt == self.max_attempts:
+                return response
+
+            self.counters["retries"] += 1
+            time.sleep(min(self.backoff_max_sec, self.backoff_base_sec * 2 ** (attempt - 1)))
+
+        return response
+
+    def _report(self, items, response):
+        now = time.time()
+
+        if response.status_code < 300:
+            self.counters["delivered"] += len(items)
+            for item in items:
+                self.latency_ms.append((now - item["queued_at"]) * 1000)
+        elif response.status_code < 500:
+            self.counters["rejected"] += len(items)
+        else:
+            self.counters["failed"] += len(items)
+
+        if not self.verbose:
+            return
+
+        print(f"[API STATUS] {response.status_code}")
+        if response.headers.get("content-type", "").startswith("application/json"):
+            print(f"[API RESPONSE] {response.json()}")
+        else:
+            print(f"[API RAW] {response.text}")
+
+    def _chunks(self, items, single=False):
+        if self.batch_url is not None and not single:
+            return [items]
+        return [[item] for item in items]
+
+    def _deliver(self, items, single=False):
+        """
+        Returns (number of leading items consumed, failure): failure is None,
+        "unreachable" or "5xx". A chunk that still gets a 5xx after
+        max_attempts is not consumed, so it is spilled and replayed instead
+        of dropped.
+        """
+        consumed = 0
+
+        for chunk in self._chunks(items, single):
+            if self.batch_url is not None and not single:
+                url, payload = self.batch_url, [item["event"] for item in chunk]
+            else:
+                url, payload = self.url, chunk[0]["event"]
+
+            try:
+                response = self._post(url, payload)
+            except requests.RequestException as e:
+                print(f"[API ERROR] {e}")
+                return consumed, "unreachable"
+
+            self._report(chunk, response)
+            if response.status_code >= 500:
+                return consumed, "5xx"
+
+            consumed += len(chunk)
+
+        return consumed, None
+
+    def _dead_letter_front(self, items, offsets, single):
+        """
+        Counts consecutive 5xx replays of the chunk at the spill front
+        (items[0]); after max_replays a batch is split into single events,
+        a single event is moved to the dead-letter file. Returns True when
+        the front was split or moved.
+        """
+        if self._stuck_offset != self._spill_offset:
+            self._stuck_offset = self._spill_offset
+            self._stuck_replays = 0
+
+        self._stuck_replays += 1
+        if self._stuck_replays < self.max_replays:
+            return False
+
+        chunk = self._chunks(items, single)[0]
+        self._stuck_offset = None
+
+        if len(chunk) > 1:
+            self._single_until = offsets[len(chunk) - 1]
+            print(f"[EVENT DISPATCH] batch failed {self.max_replays} replays, replaying it event by event")
+            return True
+
+        self._write_spill(chunk, self.dead_letter_path)
+        self._commit_spill(offsets[0], 1)
+
+        with self._lock:
+            self.counters["dead_lettered"] += 1
+
+        print(f"[EVENT DISPATCH] event failed {self.max_replays} replays, moved to {self.dead_letter_path}")
+        return True
+
+    def _next_batch(self):
+        if self._spilling or self._outbox.qsize() >= self.spill_watermark:
+            self._spill()
+
+        if not self._spilling:
+            return self._collect(), None
+
+        items, offsets = self._read_spill()
+        if not items:
+            self._commit_spill(offsets[-1] if offsets else 0, 0)
+        return items, offsets
+
+    def _should_run(self):
+        if self._running:
+            return True
+        # on stop, keep flushing while the API answers
+        return (
+            not self._outbox.empty()
+            and self._backoff == 0
+            and time.time() < self._stop_deadline
+        )
+
+    def _run(self):
+        while self._should_run():
+            items, offsets = self._next_batch()
+            if not items:
+                continue
+
+            self.counters["batches"] += 1
+            single = offsets is not None and self._spill_offset < self._single_until
+            consumed, failure = self._deliver(items, single)
+
+            if offsets is not None and consumed:
+                self._commit_spill(offsets[consumed - 1], consumed)
+
+            if failure is None:
+                self.api_up = True
+                self._backoff = 0.0
+                continue
+
+            if (failure == "5xx" and offsets is not None
+                    and self._dead_letter_front(items[consumed:], offsets[consumed:], single)):
+                continue
+
+            self.api_up = False
+            if offsets is None:
+                self._spill(items[consumed:])
+
+            self._backoff = min(
+                self.backoff_max_sec,
+                max(self.backoff_base_sec, self._backoff * 2),
+            )
+            self._wait_backoff()
+
+        # whatever is left is kept on disk for the next run
+        self._spill()
+
+    def _wait_backoff(self):
+        # keeps moving new events to disk, so the outbox does not fill up
+        # while the API is down
+        deadline = time.time() + self._backoff
+        while self._running:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            self._wake.wait(min(remaining, 0.5))
+            self._spill()
+
+    # -- metrics / lifecycle --
+
+    def backlog(self):
+        return self._outbox.qsize() + self._spill_pending
+
+    def stats(self):
+        latencies = np.array(self.latency_ms) if self.latency_ms else np.zeros(1)
+
+        return {
+            "api_up": self.api_up,
+            "submitted": self.counters["submitted"],
+            "delivered": self.counters["delivered"],
+            "rejected": self.counters["rejected"],
+            "failed": self.counters["failed"],
+            "retries": self.counters["retries"],
+            "spilled": self.counters["spilled"],
+            "dead_lettered": self.counters["dead_lettered"],
+            "overflow": self.counters["overflow"],
+            "batches": self.counters["batches"],
+            "outbox": self._outbox.qsize(),
+            "spill_pending": self._spill_pending,
+            "backlog": self.backlog(),
+            "latency_ms_p50": float(np.percentile(latencies, 50)),
+            "latency_ms_p99": float(np.percentile(latencies, 99)),
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(
+            f"[EVENT DISPATCH] api_up={s['api_up']} "
+            f"delivered={s['delivered']}/{s['submitted']} "
+            f"rejected={s['rejected']} failed={s['failed']} "
+            f"retries={s['retries']} spilled={s['spilled']} dead_lettered={s['dead_lettered']} "
+            f"backlog={s['backlog']} (outbox={s['outbox']}, disk={s['spill_pending']}) "
+            f"latency_p50={s['latency_ms_p50']:.1f}ms "
+            f"latency_p99={s['latency_ms_p99']:.1f}ms"
+        )
+
+    def stop(self, flush_timeout_sec=5.0):
+        self._stop_deadline = time.time() + flush_timeout_sec
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=flush_timeout_sec + self.timeout)
+
+        # the sender spills what is left when it exits; while it is still
+        # in a request the spill file is not touched from here
+        if self._thread.is_alive():
+            print(f"[EVENT DISPATCH] sender still busy, {self._outbox.qsize()} queued events not spilled")
+            return
+
+        self.session.close()
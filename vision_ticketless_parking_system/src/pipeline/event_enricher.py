@@ -1,12 +1,12 @@
-def enrich_event(event, mode):
+def enrich_event(event, mode, camera=None):
     if mode == "entry":
         return {
             **event,
-            "camera": "entry_cam_1",
+            "camera": camera or "entry_cam_1",
         }
     else:
         return {
             **event,
             "type": "vehicle_exit_detected",
-            "camera": "exit_cam_1",
-        }
\ No newline at end of file
+            "camera": camera or "exit_cam_1",
+        }
@@ -1,7 +1,9 @@
 from src.utils.plate_format import is_valid_plate
 from src.queue.redis_client import redis_client
-from src.queue.ocr_queue import enqueue_ocr
+from src.queue.ocr_queue import enqueue_ocr, parse_ocr_result, OCR_RESULTS_KEY
 from src.pipeline.plate_identity_manager import PlateIdentityManager
+from src.pipeline.ocr_scheduler import OCRScheduler
+from collections import OrderedDict
 import time
 
 class FrameProcessor:
@@ -11,46 +13,103 @@ class FrameProcessor:
                  plate_tracker,
                  plate_ocr,
                  stabilizer,
-                 registry):
+                 registry,
+                 camera=None,
+                 batch_plate_detection=True,
+                 ocr_scheduler=None,
+                 motion_gate=None):
         self.vehicle_detector = vehicle_detector
         self.plate_detector = plate_detector
         self.plate_tracker = plate_tracker
         self.plate_ocr = plate_ocr
         self.stabilizer = stabilizer
         self.registry = registry
-        self.track_memory = {}
+        self.camera = camera
+        self.batch_plate_detection = batch_plate_detection
+        # optional MotionGate: skips detection while the lane is idle
+        self.motion_gate = motion_gate
+        # track_id -> memory, least recently seen first, so expiry only
+        # looks at the tracks that actually expire
+        self.track_memory = OrderedDict()
+        self.live_ocr_ids = set()
 
         self.frame_count = 0
         self.OCR_EVERY_N = 5
         self.MAX_MISSING_FRAMES = 30
         self.identity_manager = PlateIdentityManager()
+        self.ocr_scheduler = ocr_scheduler or OCRScheduler(base_interval=self.OCR_EVERY_N)
+
+        self.ocr_inbox_key = OCR_RESULTS_KEY if camera is None else f"{OCR_RESULTS_KEY}:{camera}"
+        self.ocr_inbox = {}
+        self.redis_round_trips = 0
+
+    def _ocr_id(self, track_id):
+        # track ids are only unique per tracker, so lanes sharing one
+        # Redis instance namespace their OCR streams by camera
+        if self.camera is None:
+            return track_id
+        return f"{self.camera}:{track_id}"
+
+    def fetch_ocr_results(self):
+        """
+        Drains this camera's OCR inbox in one pipelined round-trip and
+        files the results by OCR track id.
+        """
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.lrange(self.ocr_inbox_key, 0, -1)
+        pipe.delete(self.ocr_inbox_key)
+        payloads, _ = pipe.execute()
+        self.redis_round_trips += 1
+
+        for payload in payloads:
+            try:
+                ocr_id, result = parse_ocr_result(payload)
+                self.ocr_inbox.setdefault(ocr_id, []).append(result)
+            except Exception as ex:
+                print(f"[PARSE ERROR] {payload} {ex}")
+
+    def touch_track(self, track_id):
+        """
+        Returns the memory of track_id (created on first sight) and marks
+        it as seen in the current frame.
+        """
+        memory = self.track_memory.get(track_id)
+        if memory is None:
+            memory = {
+                "stable_text": None,
+                "last_ocr_frame": 0,
+                "last_seen_frame": self.frame_count,
+            }
+            OCRScheduler.init_memory(memory)
+            self.track_memory[track_id] = memory
+            self.live_ocr_ids.add(str(self._ocr_id(track_id)))
+        else:
+            self.track_memory.move_to_end(track_id)
 
-    def get_ocr_events(self, track_id):
-        key = f"ocr_stream:{track_id}"
-
-        events = redis_client.lrange(key, 0, -1)
+        memory["last_seen_frame"] = self.frame_count
+        return memory
 
-        if events:
-            redis_client.delete(key)
+    def expire_tracks(self):
+        while self.track_memory:
+            tid, memory = next(iter(self.track_memory.items()))
 
-        parsed = []
+            if self.frame_count - memory["last_seen_frame"] <= self.MAX_MISSING_FRAMES:
+                break
 
-        for e in events:
-            try:
-                text, conf = e.split("|")
-                parsed.append({
-                    "text": text,
-                    "confidence": float(conf)
-                })
-            except Exception as ex:
-                print(f"[PARSE ERROR] {e} {ex}")
+            del self.track_memory[tid]
+            self.live_ocr_ids.discard(str(self._ocr_id(tid)))
+            self.stabilizer.forget(tid)
 
-        return parsed
+        if self.ocr_inbox:
+            # results that arrived after their track expired
+            for ocr_id in list(self.ocr_inbox.keys()):
+                if ocr_id not in self.live_ocr_ids:
+                    del self.ocr_inbox[ocr_id]
 
-    def process(self, frame):
-        self.frame_count += 1
+    def get_ocr_events(self, track_id):
+        return self.ocr_inbox.pop(str(self._ocr_id(track_id)), [])
 
-        vehicles = self.vehicle_detector.detect(frame)
+    def detect_plates_per_roi(self, frame, vehicles):
         detected_plates = []
 
         for vehicle in vehicles:
@@ -69,7 +128,46 @@ class FrameProcessor:
                 plate["bbox"] = (gx1, gy1, gx2, gy2)
                 detected_plates.append(plate)
 
+        return detected_plates
+
+    def detect_plates_batched(self, frame, vehicles):
+        return self.plate_detector.detect_rois(
+            frame,
+            [vehicle["bbox"] for vehicle in vehicles],
+        )
+
+    def process_idle(self):
+        """
+        Frame skipped by the motion gate: no detection, only the per-frame
+        bookkeeping (track / identity expiry, registry timeouts).
+        """
+        self.expire_tracks()
+        self.identity_manager.cleanup(self.frame_count)
+        events = self.registry.update([])
+
+        return [], [], events
+
+    def process(self, frame):
+        self.frame_count += 1
+
+        if self.motion_gate is not None and not self.motion_gate.should_detect(frame):
+            return self.process_idle()
+
+        vehicles = self.vehicle_detector.detect(frame)
+
+        if self.motion_gate is not None:
+            self.motion_gate.on_detections(len(vehicles))
+
+        if self.batch_plate_detection:
+            detected_plates = self.detect_plates_batched(frame, vehicles)
+        else:
+            detected_plates = self.detect_plates_per_roi(frame, vehicles)
+
         detected_plates = self.plate_tracker.update(detected_plates)
+        ocr_candidates = []
+
+        if detected_plates or self.ocr_inbox or self.track_memory:
+            self.fetch_ocr_results()
 
         for plate in detected_plates:
             x1, y1, x2, y2 = plate["bbox"]
@@ -80,19 +178,13 @@ class FrameProcessor:
             if crop is None or crop.size == 0 or track_id is None:
                 continue
 
-            memory = self.track_memory.get(track_id)
-            if memory is None:
-                memory = {
-                    "stable_text": None,
-                    "last_ocr_frame": 0,
-                    "last_seen_frame": self.frame_count,
-                }
-
-            memory["last_seen_frame"] = self.frame_count
+            memory = self.touch_track(track_id)
 
             ocr_events = self.get_ocr_events(track_id)
+            # empty acks (None) only mark the OCR job as done
+            ocr_results = [result for result in ocr_events if result is not None]
 
-            for ocr_result in ocr_events:
+            for ocr_result in ocr_results:
                 print(f"[OCR EVENT] track={track_id} -> {ocr_result}")
                 stable = self.stabilizer.update(
                     track_id,
@@ -102,10 +194,16 @@ class FrameProcessor:
 
                 if stable and is_valid_plate(stable):
                     memory["stable_text"] = stable
-            
-            if self.frame_count - memory["last_ocr_frame"] >= self.OCR_EVERY_N:
-                enqueue_ocr(track_id, crop)
-                memory["last_ocr_frame"] = self.frame_count
+
+            if ocr_events:
+                self.ocr_scheduler.on_results(memory, len(ocr_results))
+
+            ocr_candidates.append((
+                track_id,
+                memory,
+                crop,
+                self.stabilizer.confidence(track_id),
+            ))
                 
             if memory.get("stable_text"):
                 plate["text"] = memory["stable_text"]
@@ -121,14 +219,10 @@ class FrameProcessor:
             else:
                 print(f"[PIPELINE FINAL] track={track_id} text=None")
 
-            self.track_memory[track_id] = memory
-
-        for tid in list(self.track_memory.keys()):
-            last_seen = self.track_memory[tid]["last_seen_frame"]
+        for track_id, _, crop, _ in self.ocr_scheduler.select(ocr_candidates, self.frame_count):
+            enqueue_ocr(self._ocr_id(track_id), crop, inbox=self.ocr_inbox_key)
 
-            if self.frame_count - last_seen > self.MAX_MISSING_FRAMES:
-                del self.track_memory[tid]
-            
+        self.expire_tracks()
         self.identity_manager.cleanup(self.frame_count)
 
         events = self.registry.update(detected_plates)
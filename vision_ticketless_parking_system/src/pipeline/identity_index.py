@@ -0,0 +1,125 @@
+from itertools import combinations
+
+
+def _block_bounds(overlap, parts):
+    return [(i * overlap // parts, (i + 1) * overlap // parts) for i in range(parts)]
+
+
+class IdentityIndex:
+    """
+    Candidate lookup for PlateIdentityManager's positional similarity
+    (1 - mismatched positions / longer length >= threshold).
+
+    For texts of lengths la and lb the score only looks at the first
+    overlap = min(la, lb) positions, and at most k mismatches are allowed
+    there, where k depends only on max(la, lb). Splitting the overlap into
+    k + 2 blocks, at most k of them hold a mismatch, so every match agrees
+    exactly on at least two blocks (pigeonhole). Identities are indexed
+    under every pair of their blocks, which stays selective even when many
+    plates share a region prefix. The candidates are a superset of the
+    matches; the caller still scores them exactly.
+
+    Block layouts depend on (identity length, overlap, k) and are built
+    lazily the first time a query needs them, then kept up to date.
+    """
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+        self._texts = {}          # identity_id -> text
+        self._by_length = {}      # length -> {identity_id}
+        self._layouts = {}        # (length, overlap, k) -> {(blocks, chunks): {identity_id}}
+        self._max_diff = {}       # longer length -> allowed mismatches
+
+    def __len__(self):
+        return len(self._texts)
+
+    def max_diff(self, length):
+        """
+        Largest mismatch count that still scores >= threshold, evaluated
+        with the same float expression as the similarity.
+        """
+        k = self._max_diff.get(length)
+        if k is None:
+            k = -1
+            while k < length and 1 - (k + 1) / length >= self.threshold:
+                k += 1
+            self._max_diff[length] = k
+        return k
+
+    def add(self, identity_id, text):
+        if identity_id in self._texts:
+            self.remove(identity_id)
+        if not text:
+            return
+
+        length = len(text)
+        self._texts[identity_id] = text
+        self._by_length.setdefault(length, set()).add(identity_id)
+
+        for (layout_length, overlap, k), postings in self._layouts.items():
+            if layout_length == length:
+                for key in self._keys(text, overlap, k):
+                    postings.setdefault(key, set()).add(identity_id)
+
+    def remove(self, identity_id):
+        text = self._texts.pop(identity_id, None)
+        if text is None:
+            return
+
+        length = len(text)
+        ids = self._by_length[length]
+        ids.discard(identity_id)
+        if not ids:
+            del self._by_length[length]
+
+        for (layout_length, overlap, k), postings in self._layouts.items():
+            if layout_length == length:
+                for key in self._keys(text, overlap, k):
+                    posting = postings[key]
+                    posting.discard(identity_id)
+                    if not posting:
+                        del postings[key]
+
+    def candidates(self, text):
+        if not text:
+            return set()
+
+        found = set()
+
+        for length, ids in self._by_length.items():
+            overlap = min(len(text), length)
+            k = self.max_diff(max(len(text), length))
+
+            if k < 0:
+                continue
+            if k >= overlap:
+                # any text of this length can reach the threshold
+                found |= ids
+                continue
+
+            postings = self._layout(length, overlap, k)
+            for key in self._keys(text, overlap, k):
+                posting = postings.get(key)
+                if posting:
+                    found |= posting
+
+        return found
+
+    def _keys(self, text, overlap, k):
+        # k < overlap here; short overlaps fall back to fewer, single blocks
+        parts = min(overlap, k + 2)
+        blocks = [text[start:end] for start, end in _block_bounds(overlap, parts)]
+
+        return [
+            (combo, "".join(blocks[i] for i in combo))
+            for combo in combinations(range(parts), parts - k)
+        ]
+
+    def _layout(self, length, overlap, k):
+        postings = self._layouts.get((length, overlap, k))
+        if postings is None:
+            postings = self._layouts[(length, overlap, k)] = {}
+            for identity_id in self._by_length[length]:
+                for key in self._keys(self._texts[identity_id], overlap, k):
+                    postings.setdefault(key, set()).add(identity_id)
+        return postings
@@ -0,0 +1,185 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class InferenceServer:
+    """
+    In-process dynamic micro-batching in front of a shared model.
+
+    Pipelines submit single requests and get a Future back. A worker thread
+    collects requests until max_batch_size is reached or max_wait_ms has
+    passed since the first request of the batch arrived, runs them through
+    batch_fn in one call and resolves the futures in order.
+
+    batch_fn: list of requests -> list of results (same length and order)
+    """
+    def __init__(self, batch_fn, max_batch_size=8, max_wait_ms=5.0, name="inference"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._running = True
+
+        self.batch_sizes = Counter()
+        self.queue_wait_ms = deque(maxlen=1000)
+        self.batch_time_ms = deque(maxlen=1000)
+        self.requests_served = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, request):
+        future = Future()
+        if not self._running:
+            future.set_exception(RuntimeError(f"{self.name} inference server is stopped"))
+            return future
+
+        self._queue.put((request, future, time.time()))
+        return future
+
+    def __call__(self, request):
+        return self.submit(request).result()
+
+    def _collect(self):
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = first[2] + self.max_wait_sec
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is None:
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+
+            started = time.time()
+            requests = [request for request, _, _ in batch]
+
+            try:
+                results = self.batch_fn(requests)
+            except Exception as e:
+                print(f"[INFERENCE ERROR] {self.name}: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            if len(results) != len(batch):
+                error = RuntimeError(
+                    f"{self.name}: batch_fn returned {len(results)} results for {len(batch)} requests"
+                )
+                print(f"[INFERENCE ERROR] {error}")
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                continue
+
+            finished = time.time()
+
+            self.batch_sizes[len(batch)] += 1
+            self.batch_time_ms.append((finished - started) * 1000)
+            self.requests_served += len(batch)
+
+            for (_, future, submitted_at), result in zip(batch, results):
+                self.queue_wait_ms.append((started - submitted_at) * 1000)
+                future.set_result(result)
+
+    def stats(self):
+        batches = sum(self.batch_sizes.values())
+        waits = np.array(self.queue_wait_ms) if self.queue_wait_ms else np.zeros(1)
+        batch_times = np.array(self.batch_time_ms) if self.batch_time_ms else np.zeros(1)
+
+        return {
+            "name": self.name,
+            "batches": batches,
+            "requests": self.requests_served,
+            "avg_batch_size": self.requests_served / batches if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_wait_ms_p50": float(np.percentile(waits, 50)),
+            "queue_wait_ms_p99": float(np.percentile(waits, 99)),
+            "batch_time_ms_avg": float(batch_times.mean()),
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(
+            f"[INFERENCE] {s['name']} batches={s['batches']} "
+            f"avg_batch={s['avg_batch_size']:.2f} "
+            f"hist={s['batch_size_histogram']} "
+            f"wait_p50={s['queue_wait_ms_p50']:.1f}ms "
+            f"wait_p99={s['queue_wait_ms_p99']:.1f}ms "
+            f"batch_avg={s['batch_time_ms_avg']:.1f}ms"
+        )
+
+    def stop(self):
+        self._running = False
+        self._queue.put(None)
+        self._thread.join(timeout=1.0)
+
+        # requests that never made it into a batch: fail them instead of
+        # leaving their callers blocked on result()
+        error = RuntimeError(f"{self.name} inference server is stopped")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is not None:
+                item[1].set_exception(error)
+
+
+class BatchedVehicleDetector:
+    """
+    Drop-in for VehicleDetector inside FrameProcessor that routes
+    detect() through a shared InferenceServer.
+    """
+    def __init__(self, server):
+        self.server = server
+
+    def detect(self, frame):
+        return self.server(frame)
+
+
+class BatchedPlateDetector:
+    """
+    Drop-in for PlateDetector inside FrameProcessor that routes
+    detect_rois() through a shared InferenceServer. detect() (per-ROI
+    plate path) is sent as one ROI covering the whole image.
+    """
+    def __init__(self, server):
+        self.server = server
+
+    def detect(self, image):
+        h, w = image.shape[:2]
+        return self.detect_rois(image, [(0, 0, w, h)])
+
+    def detect_rois(self, frame, rois):
+        return self.server((frame, rois))
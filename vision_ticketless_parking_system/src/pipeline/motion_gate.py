@@ -0,0 +1,89 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Decides per frame whether a lane needs vehicle / plate detection, from
+    a running-average background of a small grayscale copy of the frame.
+
+    - a frame shows motion when more than min_changed_fraction of its
+      pixels differ from the background by more than pixel_threshold
+    - motion wakes detection on that same frame
+    - detection keeps running for hold_frames after the last motion or the
+      last detected vehicle, so a vehicle standing still at the barrier
+      keeps being detected
+    - an idle lane is still checked every max_skip_frames frames
+    - the background follows slow lighting changes (learning_rate)
+    """
+    def __init__(self,
+                 width=160,
+                 pixel_threshold=15,
+                 min_changed_fraction=0.003,
+                 hold_frames=30,
+                 max_skip_frames=75,
+                 learning_rate=0.05):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_fraction = min_changed_fraction
+        self.hold_frames = hold_frames
+        self.max_skip_frames = max_skip_frames
+        self.learning_rate = learning_rate
+
+        self.background = None
+        self.hold = 0
+        self.since_detection = 0
+
+        self.frames = 0
+        self.skipped = 0
+
+    def _small(self, frame):
+        h, w = frame.shape[:2]
+        height = max(1, round(h * self.width / w))
+
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_LINEAR)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        return cv2.GaussianBlur(small, (5, 5), 0).astype(np.float32)
+
+    def motion(self, frame):
+        """
+        True when frame differs from the background; updates the background.
+        """
+        small = self._small(frame)
+
+        if self.background is None or self.background.shape != small.shape:
+            self.background = small
+            return True
+
+        changed = np.count_nonzero(cv2.absdiff(small, self.background) > self.pixel_threshold)
+        cv2.accumulateWeighted(small, self.background, self.learning_rate)
+
+        return changed > self.min_changed_fraction * small.size
+
+    def should_detect(self, frame):
+        self.frames += 1
+
+        if self.motion(frame):
+            self.hold = self.hold_frames
+
+        if self.hold > 0 or self.since_detection >= self.max_skip_frames:
+            self.hold = max(0, self.hold - 1)
+            self.since_detection = 0
+            return True
+
+        self.since_detection += 1
+        self.skipped += 1
+        return False
+
+    def on_detections(self, vehicle_count):
+        """
+        Keeps detection awake while vehicles are in view.
+        """
+        if vehicle_count > 0:
+            self.hold = self.hold_frames
+
+    @property
+    def skipped_fraction(self):
+        return self.skipped / self.frames if self.frames else 0.0
@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import Counter
+
+import cv2
+
+
+class OCRBudget:
+    """
+    Token bucket limiting OCR jobs per second. One instance can be shared
+    by the FrameProcessors of all lanes to enforce a global budget.
+    """
+    def __init__(self, max_per_sec=20.0, burst=None):
+        self.rate = max_per_sec
+        self.capacity = burst if burst is not None else max_per_sec
+        self.tokens = self.capacity
+        self.last_refill = time.time()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            now = time.time()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class OCRScheduler:
+    """
+    Decides which visible tracks get an OCR job this frame.
+
+    - no new job while one is still in flight for the track
+    - new / uncertain tracks are read every base_interval frames
+    - locked tracks (stable text with stabilizer confidence >= lock_confidence)
+      back off exponentially up to max_locked_interval frames
+    - crops that are too small or too blurry are skipped
+    - due tracks are served in priority order (new, then least confident,
+      then locked) while the OCRBudget has tokens
+    """
+    def __init__(self,
+                 budget=None,
+                 base_interval=5,
+                 max_locked_interval=60,
+                 lock_confidence=0.9,
+                 inflight_timeout=15,
+                 min_crop_width=40,
+                 min_crop_height=12,
+                 min_sharpness=30.0):
+        self.budget = budget
+        self.base_interval = base_interval
+        self.max_locked_interval = max_locked_interval
+        self.lock_confidence = lock_confidence
+        self.inflight_timeout = inflight_timeout
+        self.min_crop_width = min_crop_width
+        self.min_crop_height = min_crop_height
+        self.min_sharpness = min_sharpness
+
+        self.counters = Counter()
+
+    @staticmethod
+    def init_memory(memory):
+        memory.setdefault("ocr_in_flight_since", None)
+        memory.setdefault("ocr_requests", 0)
+        memory.setdefault("locked_reads", 0)
+        return memory
+
+    def is_locked(self, memory, confidence):
+        return bool(memory.get("stable_text")) and confidence >= self.lock_confidence
+
+    def on_results(self, memory, count):
+        """
+        A job of the track finished; count is the number of results with
+        text (0 for an empty ack).
+        """
+        memory["ocr_in_flight_since"] = None
+        self.counters["results"] += count
+        if count == 0:
+            self.counters["unreadable"] += 1
+
+    def _sharpness(self, crop):
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        return cv2.Laplacian(gray, cv2.CV_64F).var()
+
+    def _check(self, memory, crop, confidence, frame_count):
+        in_flight = memory["ocr_in_flight_since"]
+        if in_flight is not None and frame_count - in_flight < self.inflight_timeout:
+            return "in_flight"
+
+        locked = self.is_locked(memory, confidence)
+        if not locked:
+            memory["locked_reads"] = 0
+
+        if memory["ocr_requests"] > 0:
+            if locked:
+                interval = min(
+                    self.max_locked_interval,
+                    self.base_interval * 2 ** memory["locked_reads"],
+                )
+            else:
+                interval = self.base_interval
+
+            if frame_count - memory["last_ocr_frame"] < interval:
+                return "backoff" if locked else "interval"
+
+        h, w = crop.shape[:2]
+        if w < self.min_crop_width or h < self.min_crop_height:
+            return "small"
+
+        if self._sharpness(crop) < self.min_sharpness:
+            return "blurry"
+
+        return None
+
+    def _priority(self, memory, confidence):
+        if memory["ocr_requests"] == 0:
+            return 0.0
+        if self.is_locked(memory, confidence):
+            return 3.0
+        return 1.0 + confidence
+
+    def select(self, candidates, frame_count):
+        """
+        candidates: list of (track_id, memory, crop, confidence)
+        returns: candidates that should be enqueued now, with their memory
+        already updated (in flight, last_ocr_frame)
+        """
+        due = []
+
+        for candidate in candidates:
+            _, memory, crop, confidence = candidate
+            self.counters["track_frames"] += 1
+
+            reason = self._check(memory, crop, confidence, frame_count)
+            if reason is not None:
+                self.counters[f"skipped_{reason}"] += 1
+                continue
+
+            due.append(candidate)
+
+        due.sort(key=lambda c: (
+            self._priority(c[1], c[3]),
+            c[1]["last_ocr_frame"],
+        ))
+
+        selected = []
+
+        for candidate in due:
+            _, memory, _, confidence = candidate
+
+            if self.budget is not None and not self.budget.try_acquire():
+                self.counters["skipped_budget"] += 1
+                continue
+
+            if self.is_locked(memory, confidence):
+                memory["locked_reads"] += 1
+                self.counters["enqueued_locked"] += 1
+
+            memory["ocr_in_flight_since"] = frame_count
+            memory["last_ocr_frame"] = frame_count
+            memory["ocr_requests"] += 1
+
+            self.counters["enqueued"] += 1
+            selected.append(candidate)
+
+        return selected
+
+    def stats(self):
+        stats = dict(self.counters)
+        # what the fixed every-N-frames policy would have enqueued
+        baseline = self.counters["track_frames"] / self.base_interval
+        stats["baseline_estimate"] = baseline
+        stats["reduction"] = baseline / self.counters["enqueued"] if self.counters["enqueued"] else 0.0
+        return stats
+
+    def print_stats(self, name=""):
+        s = self.stats()
+        skipped = {k[len("skipped_"):]: v for k, v in s.items() if k.startswith("skipped_")}
+
+        print(
+            f"[OCR SCHEDULER] {name} enqueued={s.get('enqueued', 0)} "
+            f"baseline~{s['baseline_estimate']:.0f} "
+            f"reduction={s['reduction']:.1f}x "
+            f"results={s.get('results', 0)} "
+            f"unreadable={s.get('unreadable', 0)} "
+            f"skipped={skipped}"
+        )
@@ -1,4 +1,5 @@
-from collections import defaultdict
+from collections import OrderedDict
+from src.pipeline.identity_index import IdentityIndex
 
 class PlateIdentityManager:
     def __init__(self, similarity_threshold=0.85, ttl=50):
@@ -6,9 +7,14 @@ class PlateIdentityManager:
         self.ttl = ttl
 
         self.identities = {}
+        # identity ids, least recently seen first
+        self.last_seen_order = OrderedDict()
         self.track_to_identity = {}
         self.next_id = 1
 
+        # plate text -> candidate identities, kept in sync with self.identities
+        self.index = IdentityIndex(similarity_threshold)
+
     def _similarity(self, a, b):
         if not a or not b:
             return 0.0
@@ -25,13 +31,16 @@ class PlateIdentityManager:
         if track_id in self.track_to_identity:
             identity_id = self.track_to_identity[track_id]
             self.identities[identity_id]["last_seen_frame"] = frame_count
+            self.last_seen_order.move_to_end(identity_id)
             return identity_id
         
         best_id = None
         best_score = 0
 
-        for identity_id, data in self.identities.items():
-            score = self._similarity(text, data["text"])
+        # ids only grow and identities keep creation order, so scanning
+        # the candidates by id keeps the first-best-wins tie breaking
+        for identity_id in sorted(self.index.candidates(text)):
+            score = self._similarity(text, self.identities[identity_id]["text"])
 
             if score > best_score and score >= self.similarity_threshold:
                 best_score = score
@@ -51,23 +60,31 @@ class PlateIdentityManager:
             "track_ids": self.identities.get(best_id, {}).get("track_ids", set())
         }
 
+        self.index.add(best_id, text)
+        self.last_seen_order[best_id] = None
+        self.last_seen_order.move_to_end(best_id)
         self.identities[best_id]["track_ids"].add(track_id)
         self.track_to_identity[track_id] = best_id
 
         return best_id
         
     def cleanup(self, frame_count):
-        to_delete = []
+        """
+        Drops identities not seen for more than ttl frames. Walks the ids in
+        last-seen order, so only the expired ones are visited.
+        """
+        while self.last_seen_order:
+            identity_id = next(iter(self.last_seen_order))
+            data = self.identities[identity_id]
 
-        for identity_id, data in self.identities.items():
-            if frame_count - data["last_seen_frame"] > self.ttl:
-                to_delete.append(identity_id)
+            if frame_count - data["last_seen_frame"] <= self.ttl:
+                break
 
-        for identity_id in to_delete:
             print(f"[IDENTITY REMOVED] id={identity_id}")
             del self.identities[identity_id]
+            del self.last_seen_order[identity_id]
+            self.index.remove(identity_id)
 
-        self.track_to_identity = {
-            tid: iid for tid, iid in self.track_to_identity.items()
-            if iid in self.identities
-        }
\ No newline at end of file
+            for tid in data["track_ids"]:
+                if self.track_to_identity.get(tid) == identity_id:
+                    del self.track_to_identity[tid]
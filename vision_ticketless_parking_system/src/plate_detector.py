@@ -1,27 +1,118 @@
-from ultralytics import YOLO
+import numpy as np
+import supervision as sv
+from src.detections import result_arrays, to_detections, to_dicts
+from src.inference_backend import letterbox, load_backend
+
+
+def empty_detections():
+    return sv.Detections(
+        xyxy=np.empty((0, 4), dtype=np.float32),
+        confidence=np.empty(0, dtype=np.float32),
+    )
+
 
 class PlateDetector:
     def __init__(self,
                  model_path="models/plate_detector/best.pt",
-                 conf_threshold=0.4):
-        self.model = YOLO(model_path, task="detect")
+                 conf_threshold=0.4,
+                 batch_imgsz=640,
+                 backend="torch",
+                 threads=None):
+        # exported backends get a fixed batch_imgsz input, the ROI canvas size
+        self.model = load_backend(model_path, backend=backend, imgsz=batch_imgsz, threads=threads)
         self.conf_threshold = conf_threshold
+        self.batch_imgsz = batch_imgsz
+
+    def detect_columnar(self, frame):
+        """
+        Plates of one frame as an sv.Detections batch.
+        """
+        results = self.model(frame)
+        detections = [to_detections(boxes, self.conf_threshold) for boxes in results]
+
+        if len(detections) == 1:
+            return detections[0]
+        return sv.Detections.merge(detections)
 
     def detect(self, frame):
-        results = self.model(frame, verbose=False)
-        plates = []
+        return to_dicts(self.detect_columnar(frame), label="plate")
 
-        for result in results:
-            for box in result.boxes:
-                conf = float(box.conf[0])
-                if conf < self.conf_threshold:
+    def detect_rois(self, frame, rois):
+        """
+        Detects plates inside several regions of one frame with a single
+        forward pass. Every ROI is letterboxed to batch_imgsz, so the batch
+        has one shape, and plate boxes are mapped back to frame coordinates.
+        """
+        return self.detect_rois_batch([(frame, rois)])[0]
+
+    def detect_rois_batch(self, requests):
+        """
+        Same as detect_rois for several (frame, rois) requests at once, e.g.
+        frames of different cameras. All ROIs share one forward pass and the
+        plates are returned per request.
+        """
+        return [
+            to_dicts(detections, label="plate")
+            for detections in self.detect_rois_batch_columnar(requests)
+        ]
+
+    def detect_rois_batch_columnar(self, requests):
+        """
+        detect_rois_batch returning one sv.Detections batch per request. The
+        boxes of all ROIs are mapped back to frame coordinates in one
+        vectorized step.
+        """
+        canvases = []
+        meta = []
+
+        for request_idx, (frame, rois) in enumerate(requests):
+            for x1, y1, x2, y2 in rois:
+                roi = frame[y1:y2, x1:x2]
+                if roi.size == 0:
                     continue
 
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                plates.append({
-                    "bbox": (x1, y1, x2, y2),
-                    "label": "plate",
-                    "confidence": conf,
-                })
-        return plates
-        
\ No newline at end of file
+                canvas, scale, pad_x, pad_y = letterbox(roi, self.batch_imgsz)
+                canvases.append(canvas)
+                meta.append((request_idx, x1, y1, x2 - x1, y2 - y1, scale, pad_x, pad_y))
+
+        if not canvases:
+            return [empty_detections() for _ in requests]
+
+        results = self.model(canvases, imgsz=self.batch_imgsz)
+
+        xyxy = []
+        confidence = []
+        owners = []
+
+        for roi_idx, result in enumerate(results):
+            boxes, conf, _ = result_arrays(result)
+            keep = conf >= self.conf_threshold
+
+            xyxy.append(boxes[keep])
+            confidence.append(conf[keep])
+            owners.append(np.full(int(keep.sum()), roi_idx))
+
+        xyxy = np.concatenate(xyxy).astype(np.float64)
+        confidence = np.concatenate(confidence).astype(np.float32)
+        owners = np.concatenate(owners)
+
+        # per-box letterbox parameters of the ROI the box came from
+        request_idx, ox, oy, w, h, scale, pad_x, pad_y = np.array(meta, dtype=np.float64)[owners].T
+        pad = np.stack([pad_x, pad_y, pad_x, pad_y], axis=1)
+        size = np.stack([w, h, w, h], axis=1)
+        offset = np.stack([ox, oy, ox, oy], axis=1)
+
+        # int() truncation then clamping to the ROI, as per box before
+        boxes = np.trunc((xyxy - pad) / scale[:, None])
+        boxes = np.clip(boxes, 0, size) + offset
+
+        request_idx = request_idx.astype(int)
+        plates_per_request = []
+
+        for idx in range(len(requests)):
+            mine = request_idx == idx
+            plates_per_request.append(sv.Detections(
+                xyxy=boxes[mine].astype(np.float32),
+                confidence=confidence[mine],
+            ))
+        return plates_per_request
@@ -1,13 +1,27 @@
 import cv2
 import easyocr
 import re
+from collections import Counter
 
 class PlateOCR:
-    def __init__(self, use_gpu=True):
+    """
+    mode="both" -> always reads the raw and the preprocessed crop and keeps
+                   the better result
+    mode="lazy" -> reads the raw crop first and runs the preprocessed read
+                   only when the raw result is missing, invalid or below
+                   min_confidence
+    """
+    def __init__(self, use_gpu=True, mode="lazy", min_confidence=0.65):
+        if mode not in ("both", "lazy"):
+            raise ValueError(f"Unknown OCR mode: {mode}")
+
         self.reader = easyocr.Reader(
             ['en'],
             gpu=use_gpu
         )
+        self.mode = mode
+        self.min_confidence = min_confidence
+        self.counters = Counter()
 
     def _is_valid_plate(self, text):
         pattern = r'^[A-Z]{2,3}[A-Z0-9]{4,5}$'
@@ -42,20 +56,9 @@ class PlateOCR:
         return best_text, best_conf
 
     
-    def read(self, plate_image):
-        if plate_image is None or plate_image.size == 0:
-            return None
-        
-        #cv2.imshow("OCR_RAW_PLATE", plate_image)
-        
-        raw_results = self.reader.readtext(plate_image)
-        raw_text, raw_conf = self._pick_best(raw_results)
-
-        processed = self._preprocess(plate_image)
-        #cv2.imshow("OCR_PREPROCESSED", processed)
-
-        proc_results = self.reader.readtext(processed)
-        proc_text, proc_conf = self._pick_best(proc_results)
+    def _select(self, raw_best, proc_best):
+        raw_text, raw_conf = raw_best
+        proc_text, proc_conf = proc_best
 
         if raw_conf >= proc_conf:
             best_text = raw_text
@@ -66,15 +69,124 @@ class PlateOCR:
             best_conf = proc_conf
             source = "PREPROCESSED"
 
-        if not best_text:
-            return None
-        
-        if best_conf < 0.65:
+        if not best_text or best_conf < self.min_confidence:
+            self.counters["miss"] += 1
             return None
 
+        self.counters[f"hit_{source.lower()}"] += 1
+
         print(f"[OCR] {best_text} ({best_conf:.2f}) from {source}")
         
         return {
             "text": best_text,
             "confidence": float(best_conf),
         }
+
+    def _raw_accepted(self, raw_best):
+        raw_text, raw_conf = raw_best
+        return self.mode == "lazy" and raw_text is not None and raw_conf >= self.min_confidence
+
+    def read(self, plate_image):
+        if plate_image is None or plate_image.size == 0:
+            return None
+
+        self.counters["reads"] += 1
+        
+        #cv2.imshow("OCR_RAW_PLATE", plate_image)
+        
+        raw_best = self._pick_best(self.reader.readtext(plate_image))
+
+        if self._raw_accepted(raw_best):
+            return self._select(raw_best, (None, 0.0))
+
+        processed = self._preprocess(plate_image)
+        #cv2.imshow("OCR_PREPROCESSED", processed)
+
+        self.counters["preprocessed_reads"] += 1
+        proc_best = self._pick_best(self.reader.readtext(processed))
+
+        return self._select(raw_best, proc_best)
+
+    def _readtext_padded(self, images, batch_size):
+        """
+        readtext_batched without rescaling: crops are grouped by size and
+        padded (bottom / right, edge pixels) to the largest crop of their
+        group, so the text keeps the scale read() sees. Returns the
+        readtext results in input order.
+        """
+        results = [None] * len(images)
+        order = sorted(range(len(images)), key=lambda i: images[i].shape[:2])
+
+        for start in range(0, len(order), batch_size):
+            group = order[start:start + batch_size]
+            height = max(images[i].shape[0] for i in group)
+            width = max(images[i].shape[1] for i in group)
+
+            padded = [
+                cv2.copyMakeBorder(
+                    images[i],
+                    0, height - images[i].shape[0],
+                    0, width - images[i].shape[1],
+                    cv2.BORDER_REPLICATE,
+                )
+                for i in group
+            ]
+
+            for i, r in zip(group, self.reader.readtext_batched(padded, batch_size=batch_size)):
+                results[i] = r
+
+        return results
+
+    def read_batch(self, plate_images, batch_size=16):
+        """
+        Reads many crops with batched detection + recognition calls.
+        Crops keep their size (padded, not resized, to share a batch).
+        In lazy mode only the crops whose raw read was not accepted go
+        through the second, preprocessed batch. Returns one result (or None)
+        per input.
+        """
+        results = [None] * len(plate_images)
+
+        valid = [
+            i for i, img in enumerate(plate_images)
+            if img is not None and img.size > 0
+        ]
+        if not valid:
+            return results
+
+        self.counters["reads"] += len(valid)
+
+        raw = [plate_images[i] for i in valid]
+        raw_batched = self._readtext_padded(raw, batch_size)
+        raw_best = [self._pick_best(r) for r in raw_batched]
+
+        fallback = [k for k in range(len(raw)) if not self._raw_accepted(raw_best[k])]
+        proc_best = [(None, 0.0)] * len(raw)
+
+        if fallback:
+            processed = [self._preprocess(raw[k]) for k in fallback]
+            self.counters["preprocessed_reads"] += len(fallback)
+
+            proc_batched = self._readtext_padded(processed, batch_size)
+            for k, r in zip(fallback, proc_batched):
+                proc_best[k] = self._pick_best(r)
+
+        for k, i in enumerate(valid):
+            results[i] = self._select(raw_best[k], proc_best[k])
+
+        return results
+
+    def stats(self):
+        reads = self.counters["reads"]
+
+        def rate(key):
+            return self.counters[key] / reads if reads else 0.0
+
+        return {
+            "mode": self.mode,
+            "reads": reads,
+            "raw_hit_rate": rate("hit_raw"),
+            "preprocessed_hit_rate": rate("hit_preprocessed"),
+            "miss_rate": rate("miss"),
+            "preprocessed_read_rate": rate("preprocessed_reads"),
+        }
@@ -1,27 +1,117 @@
-import numpy as np
-from collections import defaultdict, Counter
+import time
+from collections import OrderedDict, deque
+
+# confidences are tallied in fixed point so adding and later subtracting
+# a vote leaves the sums exact, however long a track lives
+WEIGHT_SCALE = 1 << 48
+
+
+class _TrackVotes:
+    """
+    Voting state of one track: the window of readings plus running tallies
+    per text length and per (length, position, char). Every tally keeps
+    the sequence numbers of its votes still in the window, so ties go to
+    the value seen first, as in a vote rebuilt from the window.
+    """
+    __slots__ = ("window", "seq", "lengths", "totals", "chars", "last_update")
+
+    def __init__(self):
+        self.window = deque()
+        self.seq = 0
+        self.lengths = {}   # length -> deque of seqs
+        self.totals = {}    # length -> summed weight
+        self.chars = {}     # length -> [{char: [weight, deque of seqs]} per position]
+        self.last_update = 0.0
+
+    def add(self, text, weight):
+        seq = self.seq
+        self.seq += 1
+        self.window.append((seq, text, weight))
+
+        length = len(text)
+        seqs = self.lengths.get(length)
+        if seqs is None:
+            seqs = self.lengths[length] = deque()
+            self.totals[length] = 0
+            self.chars[length] = [{} for _ in range(length)]
+        seqs.append(seq)
+        self.totals[length] += weight
+
+        for position, ch in zip(self.chars[length], text):
+            tally = position.get(ch)
+            if tally is None:
+                tally = position[ch] = [0, deque()]
+            tally[0] += weight
+            tally[1].append(seq)
+
+    def evict_oldest(self):
+        _, text, weight = self.window.popleft()
+
+        length = len(text)
+        seqs = self.lengths[length]
+        seqs.popleft()
+        if not seqs:
+            del self.lengths[length]
+            del self.totals[length]
+            del self.chars[length]
+            return
+        self.totals[length] -= weight
+
+        for position, ch in zip(self.chars[length], text):
+            tally = position[ch]
+            tally[0] -= weight
+            tally[1].popleft()
+            if not tally[1]:
+                del position[ch]
+
+    def vote(self):
+        target_len = min(self.lengths, key=lambda n: (-len(self.lengths[n]), self.lengths[n][0]))
+        total = self.totals[target_len]
+
+        result = []
+        score_sum = 0.0
+
+        for position in self.chars[target_len]:
+            best_ch = None
+            best = None
+            for ch, tally in position.items():
+                if best is None or tally[0] > best[0] or (tally[0] == best[0] and tally[1][0] < best[1][0]):
+                    best_ch = ch
+                    best = tally
+
+            result.append(best_ch)
+            if total > 0:
+                score_sum += best[0] / total
+
+        return "".join(result), score_sum / target_len
+
 
 class PlateTextStabilizer:
     def __init__(
-            self, 
-            window_size=10, 
+            self,
+            window_size=10,
             min_votes=3,
             min_confidence=0.6,
             stable_threshold=0.7,
+            max_idle_sec=60.0,
             ):
         self.window_size = window_size
         self.min_votes = min_votes
         self.min_confidence = min_confidence
         self.stable_threshold = stable_threshold
-        self.history = defaultdict(list)
+        self.max_idle_sec = max_idle_sec
+
+        # track_id -> _TrackVotes, least recently updated first
+        self.history = OrderedDict()
+        self.scores = {}
 
     def update(self, track_id, text, confidence=None):
         if track_id is None:
             return None
-        
+
         if text is None or text == "":
             return None
-        
+
         text = text.replace(" ", "").upper()
 
         if confidence is None:
@@ -30,48 +120,41 @@ class PlateTextStabilizer:
         if confidence < self.min_confidence:
             return None
 
-        self.history[track_id].append((text, confidence))
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        votes = self.history.get(track_id)
+        if votes is None:
+            votes = self.history[track_id] = _TrackVotes()
+        else:
+            self.history.move_to_end(track_id)
+        votes.last_update = now
 
-        if len(self.history[track_id]) > self.window_size:
-            self.history[track_id].pop(0)
+        votes.add(text, round(confidence * WEIGHT_SCALE))
 
-        if len(self.history[track_id]) < self.min_votes:
+        if len(votes.window) > self.window_size:
+            votes.evict_oldest()
+
+        if len(votes.window) < self.min_votes:
             return None
 
-        stable_text, score = self._vote(self.history[track_id])
+        stable_text, score = votes.vote()
+        self.scores[track_id] = score
 
         if score >= self.stable_threshold:
             return stable_text
         return None
-    
-    def _vote(self, items):
-        texts = [t for t, _ in items]
-        confs = [c for _, c in items]
-        
-        length_counter = Counter(len(t) for t in texts)
-        target_len, _ = length_counter.most_common(1)[0]
-
-        filtered = [(t, c) for t, c in items if len(t) == target_len]
-
-        if len(filtered) == 0:
-            return None, 0
-        
-        result = []
-        scores = []
-
-        for i in range(target_len):
-            char_votes = {}
-            for t, c in filtered:
-                ch = t[i]
-                char_votes[ch] = char_votes.get(ch, 0) + c
 
-            best_char = max(char_votes.items(), key=lambda x: x[1])
-            result.append(best_char[0])
+    def confidence(self, track_id):
+        return self.scores.get(track_id, 0.0)
 
-            total = sum(char_votes.values())
-            scores.append(best_char[1] / total if total > 0 else 0)
+    def forget(self, track_id):
+        self.history.pop(track_id, None)
+        self.scores.pop(track_id, None)
 
-        final_text = "".join(result)
-        final_score = np.mean(scores)
-        
-        return final_text, final_score
\ No newline at end of file
+    def _evict_idle(self, now):
+        while self.history:
+            track_id, votes = next(iter(self.history.items()))
+            if now - votes.last_update <= self.max_idle_sec:
+                break
+            self.forget(track_id)
@@ -1,6 +1,22 @@
+import dataclasses
+from itertools import chain
+
 import supervision as sv
 import numpy as np
 
+
+def boxes_array(boxes):
+    # one flat pass instead of np.array over a list of tuples
+    return np.fromiter(chain.from_iterable(boxes), dtype=np.float32, count=4 * len(boxes)).reshape(-1, 4)
+
+
+def empty_tracks():
+    tracks = sv.Detections.empty()
+    tracks.tracker_id = np.empty(0, dtype=int)
+    tracks.data["source_index"] = np.empty(0, dtype=int)
+    return tracks
+
+
 class PlateTracker:
     def __init__(self,
                  conf_threshold=0.4,
@@ -13,41 +29,53 @@ class PlateTracker:
             frame_rate=30,
         )
         self.last_tracks = []
-    
+
+    def track(self, detections):
+        """
+        Columnar path: detections is an sv.Detections batch (xyxy /
+        confidence arrays). Returns the tracked subset with tracker_id set;
+        data["source_index"] holds each row's index in the input batch,
+        since ByteTrack may drop or reorder detections.
+        """
+        if len(detections) == 0:
+            # nothing indexes into an empty batch; update() keeps the last
+            # tracks for its dict callers
+            return empty_tracks()
+
+        detections = dataclasses.replace(
+            detections,
+            data={**detections.data, "source_index": np.arange(len(detections))},
+        )
+
+        tracked = self.tracker.update_with_detections(detections)
+        if len(tracked) == 0:
+            tracked = empty_tracks()
+
+        return tracked
+
     def update(self, plates):
         if plates is None or len(plates) == 0:
             return self.last_tracks
-        
-        xyxy = []
-        confidences = []
-
-        for plate in plates:
-            bbox = plate.get("bbox")
-            conf = plate.get("confidence")
 
-            if bbox is None or len(bbox) != 4:
-                continue
+        valid = [
+            plate for plate in plates
+            if plate.get("bbox") is not None and len(plate["bbox"]) == 4
+        ]
 
-            xyxy.append(bbox)
-            confidences.append(conf)
-
-        if len(xyxy) == 0:
+        if len(valid) == 0:
             return self.last_tracks
-        
-        xyxy = np.array(xyxy, dtype=np.float32)
-        confidences = np.array(confidences, dtype=np.float32)
 
         detections = sv.Detections(
-            xyxy=xyxy,
-            confidence=confidences,
-            class_id=np.zeros(len(xyxy))
+            xyxy=boxes_array([plate["bbox"] for plate in valid]),
+            confidence=np.array([plate.get("confidence") for plate in valid], dtype=np.float32),
         )
 
-        tracked = self.tracker.update_with_detections(detections)
+        tracked = self.track(detections)
         tracked_plates = []
 
-        for plate, track_id in zip(plates, tracked.tracker_id):
-            plate["track_id"] = int(track_id)
+        for index, track_id in zip(tracked.data["source_index"].tolist(), tracked.tracker_id.tolist()):
+            plate = valid[index]
+            plate["track_id"] = track_id
             tracked_plates.append(plate)
         self.last_tracks = tracked_plates
 
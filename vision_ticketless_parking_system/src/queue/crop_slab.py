@@ -0,0 +1,226 @@
+import secrets
+import threading
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+CROP_SLAB_NAME = "ocr_crops"
+
+SLOT_FREE = 0
+SLOT_BUSY = 1
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, create=False, track=False)
+    except TypeError:
+        # python < 3.13 registers attached blocks with the resource tracker,
+        # which would unlink the producer's pool when a worker exits
+        shm = shared_memory.SharedMemory(name=name, create=False)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class CropSlabPool:
+    """
+    Fixed pool of equally sized crop slots in one shared-memory block.
+
+    The producer copies a crop into a free slot and sends only a small
+    descriptor (slot, generation, shape, dtype) through the queue. The
+    worker maps the slot without copying and acks it when done, which
+    marks the slot free again.
+
+    Slots are claimed under a lock, so lanes on several threads can share
+    one producer pool. With replace_stale, a block left behind by a crashed
+    run is unlinked and recreated; only use it once at process startup.
+
+    Every created block gets a random pool id, which is part of each
+    descriptor. A worker that gets a descriptor of another pool id
+    re-attaches by name, so it follows a restarted producer instead of
+    reading the old block; descriptors of a pool that is gone are stale.
+
+    Layout: [pool id: uint64][generations: uint32 x N][slot states: uint8 x N][slots]
+    """
+    def __init__(self,
+                 name=CROP_SLAB_NAME,
+                 num_slots=64,
+                 slot_bytes=256 * 1024,
+                 create=True,
+                 lease_sec=30.0,
+                 replace_stale=False):
+        self.name = name
+        self.num_slots = num_slots
+        self.slot_bytes = slot_bytes
+        self.lease_sec = lease_sec
+
+        header = 8 + 4 * num_slots + num_slots
+        self.data_offset = (header + 63) // 64 * 64
+        size = self.data_offset + num_slots * slot_bytes
+
+        if create:
+            try:
+                shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                if not replace_stale:
+                    raise
+
+                # leftover from a crashed run
+                stale = shared_memory.SharedMemory(name=name, create=False)
+                stale.close()
+                stale.unlink()
+                shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            shm = _attach(name)
+
+        self.owner = create
+        self._map(shm)
+
+        if create:
+            self.states[:] = SLOT_FREE
+            self.generations[:] = 0
+            self.header[0] = secrets.randbits(63) or 1
+
+        self._retired = None
+        self._cursor = 0
+        self._leased_at = {}
+        self._lock = threading.Lock()
+
+    def _map(self, shm):
+        self.shm = shm
+        buf = shm.buf
+        self.header = np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=0)
+        self.generations = np.ndarray((self.num_slots,), dtype=np.uint32, buffer=buf, offset=8)
+        self.states = np.ndarray((self.num_slots,), dtype=np.uint8, buffer=buf, offset=8 + 4 * self.num_slots)
+
+    @property
+    def pool_id(self):
+        return int(self.header[0])
+
+    def _reattach(self):
+        """
+        Maps the block currently registered under the pool name.
+
+        Views handed out by get() do not keep a mapping alive, and a batch
+        may still hold crops of the old block, so the previous mapping is
+        only closed on the next re-attach.
+        """
+        try:
+            shm = _attach(self.name)
+        except FileNotFoundError:
+            return
+
+        if self._retired is not None:
+            self._retired.close()
+        self._retired = self.shm
+
+        del self.header, self.generations, self.states
+        self._map(shm)
+
+    def _current(self, descriptor):
+        """
+        True when descriptor belongs to the mapped block; a worker
+        re-attaches once when it does not.
+        """
+        pool_id = descriptor.get("pool_id")
+        if pool_id == self.pool_id:
+            return True
+        if self.owner:
+            return False
+
+        with self._lock:
+            if pool_id != self.pool_id:
+                self._reattach()
+            return pool_id == self.pool_id
+
+    def _slot_view(self, slot, shape, dtype):
+        return np.ndarray(
+            shape,
+            dtype=dtype,
+            buffer=self.shm.buf,
+            offset=self.data_offset + slot * self.slot_bytes,
+        )
+
+    def _reclaim_expired(self, now):
+        for slot, leased_at in list(self._leased_at.items()):
+            if self.states[slot] == SLOT_FREE:
+                del self._leased_at[slot]
+            elif now - leased_at > self.lease_sec:
+                print(f"[SLAB] reclaiming slot {slot} (no ack after {self.lease_sec}s)")
+                self.states[slot] = SLOT_FREE
+                del self._leased_at[slot]
+
+    def _find_free(self):
+        for i in range(self.num_slots):
+            slot = (self._cursor + i) % self.num_slots
+            if self.states[slot] == SLOT_FREE:
+                self._cursor = (slot + 1) % self.num_slots
+                return slot
+        return None
+
+    def put(self, crop):
+        """
+        Copies crop into a free slot.
+
+        Returns a descriptor dict or None when the crop does not fit or the
+        pool is exhausted (caller falls back to another transport).
+        """
+        if crop.nbytes > self.slot_bytes:
+            return None
+
+        with self._lock:
+            slot = self._find_free()
+            if slot is None:
+                self._reclaim_expired(time.time())
+                slot = self._find_free()
+                if slot is None:
+                    return None
+
+            generation = int(self.generations[slot]) + 1
+            self.generations[slot] = generation
+            self.states[slot] = SLOT_BUSY
+            self._leased_at[slot] = time.time()
+
+        # the slot is ours until the worker acks it, copy outside the lock
+        np.copyto(self._slot_view(slot, crop.shape, crop.dtype), crop)
+
+        return {
+            "pool_id": self.pool_id,
+            "slot": slot,
+            "generation": generation,
+            "shape": tuple(crop.shape),
+            "dtype": crop.dtype.str,
+        }
+
+    def get(self, descriptor):
+        """
+        Zero-copy view of the crop; valid until ack().
+        Returns None when the slot was reclaimed meanwhile or the descriptor
+        is from a previous producer run.
+        """
+        if not self._current(descriptor):
+            return None
+
+        slot = descriptor["slot"]
+        if int(self.generations[slot]) != descriptor["generation"]:
+            return None
+
+        return self._slot_view(slot, descriptor["shape"], np.dtype(descriptor["dtype"]))
+
+    def ack(self, descriptor):
+        if not self._current(descriptor):
+            return
+
+        slot = descriptor["slot"]
+        if int(self.generations[slot]) == descriptor["generation"]:
+            self.states[slot] = SLOT_FREE
+
+    def in_use(self):
+        return int(np.count_nonzero(self.states))
+
+    def close(self):
+        del self.header, self.generations, self.states
+        if self._retired is not None:
+            self._retired.close()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,15 +1,109 @@
 from rq import Queue
 from src.queue.redis_client import redis_client
+from src.queue.crop_slab import CropSlabPool, CROP_SLAB_NAME
+import json
 import pickle
+import threading
 import base64
+import numpy as np
 
 ocr_queue = Queue("ocr", connection=redis_client)
 
-def enqueue_ocr(track_id, crop):
-    data = base64.b64encode(pickle.dumps(crop)).decode()
+# "shm"    -> crop goes through a shared-memory slab, only a descriptor is queued
+# "pickle" -> crop is pickled + base64 encoded into the job
+OCR_TRANSPORT = "shm"
+
+# "rq"    -> one RQ job per crop (src.workers.ocr_worker)
+# "batch" -> jobs pushed to a plain Redis list drained in batches
+#            by src.workers.batch_ocr_worker
+OCR_DISPATCH = "rq"
+OCR_BATCH_QUEUE = "ocr_batch_jobs"
+
+# workers append "track_id|text|confidence" to one inbox list per camera,
+# FrameProcessor drains it once per frame. Every finished job is reported:
+# a crop without a readable plate gives the empty ack "track_id||0", which
+# only clears the track's in-flight OCR marker
+OCR_RESULTS_KEY = "ocr_results"
+OCR_RESULTS_TTL_SEC = 5
+
+_crop_pool = None
+_crop_pool_lock = threading.Lock()
+
+def get_crop_pool():
+    global _crop_pool
+
+    if _crop_pool is None:
+        # lanes on several threads may get here at once; the pool is
+        # created once per process, so a block that already exists then
+        # is a leftover from a crashed run
+        with _crop_pool_lock:
+            if _crop_pool is None:
+                _crop_pool = CropSlabPool(name=CROP_SLAB_NAME, create=True, replace_stale=True)
+    return _crop_pool
+
+def encode_crop(crop):
+    return base64.b64encode(pickle.dumps(crop)).decode()
+
+def decode_crop(crop_data):
+    crop = pickle.loads(base64.b64decode(crop_data))
+    return np.ascontiguousarray(crop)
+
+def format_ocr_result(track_id, result):
+    if not result:
+        return f"{track_id}||0"
+    return f"{track_id}|{result['text']}|{result['confidence']}"
+
+def parse_ocr_result(payload):
+    """
+    Returns (track_id, result); result is None for an empty ack.
+    """
+    track_id, text, conf = payload.rsplit("|", 2)
+    if not text:
+        return track_id, None
+
+    return track_id, {
+        "text": text,
+        "confidence": float(conf),
+    }
+
+def _enqueue_batch_job(track_id, inbox, descriptor=None, data=None):
+    job = {"track_id": track_id, "inbox": inbox}
+
+    if descriptor is not None:
+        job["descriptor"] = descriptor
+    else:
+        job["data"] = data
+
+    redis_client.rpush(OCR_BATCH_QUEUE, json.dumps(job))
+
+def enqueue_ocr(track_id, crop, transport=None, inbox=OCR_RESULTS_KEY):
+    transport = transport or OCR_TRANSPORT
+
+    if transport == "shm":
+        descriptor = get_crop_pool().put(crop)
+
+        if descriptor is not None:
+            if OCR_DISPATCH == "batch":
+                _enqueue_batch_job(track_id, inbox, descriptor=descriptor)
+                return
+
+            ocr_queue.enqueue(
+                "src.workers.ocr_worker.process_ocr_shm",
+                track_id,
+                descriptor,
+                inbox,
+            )
+            return
+
+    data = encode_crop(crop)
+
+    if OCR_DISPATCH == "batch":
+        _enqueue_batch_job(track_id, inbox, data=data)
+        return
 
     ocr_queue.enqueue(
         "src.workers.ocr_worker.process_ocr",
         track_id,
         data,
-    )
\ No newline at end of file
+        inbox,
+    )
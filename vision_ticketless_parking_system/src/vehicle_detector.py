@@ -1,8 +1,15 @@
-from ultralytics import YOLO
+import supervision as sv
+from src.detections import class_ids, class_name_table, to_detections, to_dicts
+from src.inference_backend import load_backend
 
 class VehicleDetector:
-    def __init__(self, model_path="models/yolov8n.pt", conf_threshold=0.4):
-        self.model = YOLO(model_path, task="detect")
+    def __init__(self,
+                 model_path="models/yolov8n.pt",
+                 conf_threshold=0.4,
+                 backend="torch",
+                 imgsz=640,
+                 threads=None):
+        self.model = load_backend(model_path, backend=backend, imgsz=imgsz, threads=threads)
         self.conf_threshold = conf_threshold
 
         self.vehicle_classes = {
@@ -11,25 +18,38 @@ class VehicleDetector:
             "truck",
             "motorcycle",
         }
+        self.vehicle_class_ids = class_ids(self.model.names, self.vehicle_classes)
+        self.class_names = class_name_table(self.model.names)
+
+    def _parse(self, boxes):
+        return to_detections(
+            boxes,
+            self.conf_threshold,
+            keep_class_ids=self.vehicle_class_ids,
+            class_names=self.class_names,
+        )
+
+    def detect_columnar(self, frame):
+        """
+        Vehicles of one frame as an sv.Detections batch (xyxy / confidence /
+        class_id arrays, data["class_name"]).
+        """
+        results = self.model(frame)
+        detections = [self._parse(boxes) for boxes in results]
+
+        if len(detections) == 1:
+            return detections[0]
+        return sv.Detections.merge(detections)
+
+    def detect_batch_columnar(self, frames):
+        if not frames:
+            return []
+
+        results = self.model(list(frames))
+        return [self._parse(boxes) for boxes in results]
 
     def detect(self, frame):
-        results = self.model(frame, verbose=False)
-        vehicles = []
-        
-        for result in results:
-            for box in result.boxes:
-                conf = float(box.conf[0])
-                if conf < self.conf_threshold:
-                    continue
-
-                cls_id = int(box.cls[0])
-                label = self.model.names[cls_id]
-
-                if label in self.vehicle_classes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    vehicles.append({
-                        "bbox": (x1, y1, x2, y2),
-                        "label": label,
-                        "confidence": conf,
-                    })
-        return vehicles
+        return to_dicts(self.detect_columnar(frame))
+
+    def detect_batch(self, frames):
+        return [to_dicts(detections) for detections in self.detect_batch_columnar(frames)]
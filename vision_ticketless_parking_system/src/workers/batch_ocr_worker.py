@@ -0,0 +1,164 @@
+import argparse
+import json
+import time
+
+from src.queue.redis_client import redis_client
+from src.queue.crop_slab import CropSlabPool, CROP_SLAB_NAME
+from src.queue.ocr_queue import (
+    OCR_BATCH_QUEUE,
+    OCR_RESULTS_KEY,
+    OCR_RESULTS_TTL_SEC,
+    decode_crop,
+    format_ocr_result,
+)
+from src.plate_ocr import PlateOCR
+
+
+class BatchOCRWorker:
+    """
+    Long-running OCR worker for OCR_DISPATCH = "batch".
+
+    Blocks for the first pending job, then drains up to batch_size - 1 more
+    in one LPOP, runs all crops through PlateOCR.read_batch and writes every
+    result back in one pipelined round-trip. Jobs without a result (no
+    readable plate, stale slot) are answered with an empty ack.
+    """
+    def __init__(self, ocr, batch_size=16, block_timeout=1, stats_interval_sec=10.0):
+        self.ocr = ocr
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.stats_interval_sec = stats_interval_sec
+
+        self._crop_pool = None
+
+        self.crops_processed = 0
+        self.batches = 0
+        self.ocr_time = 0.0
+        self.started_at = time.time()
+        self.last_stats_time = self.started_at
+
+    def get_crop_pool(self):
+        if self._crop_pool is None:
+            self._crop_pool = CropSlabPool(name=CROP_SLAB_NAME, create=False)
+        return self._crop_pool
+
+    def fetch_batch(self):
+        first = redis_client.blpop(OCR_BATCH_QUEUE, timeout=self.block_timeout)
+        if first is None:
+            return []
+
+        jobs = [first[1]]
+
+        if self.batch_size > 1:
+            more = redis_client.lpop(OCR_BATCH_QUEUE, self.batch_size - 1)
+            if more:
+                jobs.extend(more)
+
+        return [json.loads(job) for job in jobs]
+
+    def _load_crop(self, job):
+        descriptor = job.get("descriptor")
+
+        if descriptor is None:
+            return decode_crop(job["data"])
+
+        crop = self.get_crop_pool().get(descriptor)
+        if crop is None:
+            print(f"[SLAB] stale descriptor for track={job['track_id']}, slot={descriptor['slot']}")
+        return crop
+
+    def _ack(self, jobs):
+        for job in jobs:
+            descriptor = job.get("descriptor")
+            if descriptor is not None:
+                self.get_crop_pool().ack(descriptor)
+
+    def publish_results(self, jobs, results):
+        pipe = redis_client.pipeline(transaction=False)
+        written = 0
+        inboxes = set()
+
+        for job, result in zip(jobs, results):
+            inbox = job.get("inbox", OCR_RESULTS_KEY)
+            pipe.rpush(inbox, format_ocr_result(job["track_id"], result))
+            inboxes.add(inbox)
+            if result:
+                written += 1
+
+        for inbox in inboxes:
+            pipe.expire(inbox, OCR_RESULTS_TTL_SEC)
+
+        if jobs:
+            pipe.execute()
+            print(f"[REDIS WRITE] {written} OCR results, {len(jobs) - written} empty acks")
+
+    def run_once(self):
+        jobs = self.fetch_batch()
+        if not jobs:
+            return 0
+
+        crops = [self._load_crop(job) for job in jobs]
+
+        t0 = time.time()
+        try:
+            results = self.ocr.read_batch(crops, batch_size=self.batch_size)
+        finally:
+            self._ack(jobs)
+        self.ocr_time += time.time() - t0
+
+        self.publish_results(jobs, results)
+
+        self.crops_processed += len(jobs)
+        self.batches += 1
+
+        return len(jobs)
+
+    def print_stats(self):
+        elapsed = time.time() - self.started_at
+        rate = self.crops_processed / self.ocr_time if self.ocr_time > 0 else 0.0
+        avg_batch = self.crops_processed / self.batches if self.batches else 0.0
+
+        ocr_stats = self.ocr.stats()
+
+        print(
+            f"[OCR WORKER] crops={self.crops_processed} batches={self.batches} "
+            f"avg_batch={avg_batch:.1f} ocr_crops_per_sec={rate:.1f} "
+            f"raw_hit={ocr_stats['raw_hit_rate']:.2f} "
+            f"proc_hit={ocr_stats['preprocessed_hit_rate']:.2f} "
+            f"second_pass={ocr_stats['preprocessed_read_rate']:.2f} "
+            f"uptime={elapsed:.0f}s"
+        )
+
+    def run(self):
+        print(f"[OCR WORKER] listening on {OCR_BATCH_QUEUE} (batch_size={self.batch_size})")
+
+        while True:
+            self.run_once()
+
+            if time.time() - self.last_stats_time >= self.stats_interval_sec:
+                self.print_stats()
+                self.last_stats_time = time.time()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batched OCR worker")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--cpu", action="store_true", help="Run EasyOCR on CPU")
+    parser.add_argument("--ocr-mode", choices=["both", "lazy"], default="lazy")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    ocr = PlateOCR(use_gpu=not args.cpu, mode=args.ocr_mode)
+    worker = BatchOCRWorker(ocr, batch_size=args.batch_size)
+
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,56 @@
-import pickle
-import base64
 from src.queue.redis_client import redis_client
+from src.queue.crop_slab import CropSlabPool, CROP_SLAB_NAME
+from src.queue.ocr_queue import (
+    decode_crop,
+    format_ocr_result,
+    OCR_RESULTS_KEY,
+    OCR_RESULTS_TTL_SEC,
+)
 from src.plate_ocr import PlateOCR
-import numpy as np
 
 
 ocr = PlateOCR(use_gpu=True)
 
-def process_ocr(track_id, crop_data):
-    crop = pickle.loads(base64.b64decode(crop_data))
-    crop = np.ascontiguousarray(crop)
+_crop_pool = None
+
+def get_crop_pool():
+    global _crop_pool
+
+    if _crop_pool is None:
+        _crop_pool = CropSlabPool(name=CROP_SLAB_NAME, create=False)
+    return _crop_pool
+
+def publish_result(track_id, result, inbox=OCR_RESULTS_KEY):
+    # published also without a result (empty ack), so the track's next
+    # OCR request is not held back until the in-flight timeout
+    payload = format_ocr_result(track_id, result)
+
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.rpush(inbox, payload)
+    pipe.expire(inbox, OCR_RESULTS_TTL_SEC)
+    pipe.execute()
+
+    print(f"[REDIS WRITE] {inbox} -> {payload}")
+
+def process_ocr(track_id, crop_data, inbox=OCR_RESULTS_KEY):
+    crop = decode_crop(crop_data)
 
     result = ocr.read(crop)
 
-    if result:
-        payload = f"{result['text']}|{result['confidence']}"
+    publish_result(track_id, result, inbox)
+
+def process_ocr_shm(track_id, descriptor, inbox=OCR_RESULTS_KEY):
+    pool = get_crop_pool()
+    crop = pool.get(descriptor)
 
-        key = f"ocr_stream:{track_id}"
+    if crop is None:
+        print(f"[SLAB] stale descriptor for track={track_id}, slot={descriptor['slot']}")
+        publish_result(track_id, None, inbox)
+        return
 
-        redis_client.rpush(key, payload)
-        redis_client.expire(key, 5)
+    try:
+        result = ocr.read(crop)
+    finally:
+        pool.ack(descriptor)
 
-        print(f"[REDIS WRITE] {key} -> {payload}")
\ No newline at end of file
+    publish_result(track_id, result, inbox)